@@ -1,49 +1,150 @@
 # app.py
+import os
+
 from flask import Flask, jsonify, request, abort
-from storage import (
-    load_all,
-    find_by_category,
-    find_by_name_exact,
-    find_by_id,
-    add_media,
-    delete_media,
-)
+from backend.conditional import conditional
+from backend.pagination import parse_limit
+from backend.response_cache import ResponseCache, cached_response
+from backend.streaming import ndjson_response, wants_ndjson
+from backend.suggest_index import MAX_SUGGESTIONS
+from storage_common import NOT_APPLIED
+
+# Storage engine: "json" (storage.py, media_store.json), "sqlite"
+# (storage_sqlite.py, media_store.db) or "records" (storage_records.py,
+# media_store.records); the modules have the same functions
+STORAGE_ENGINE = os.environ.get("MEDIA_STORAGE_ENGINE", "json")
+if STORAGE_ENGINE == "sqlite":
+    import storage_sqlite as storage
+elif STORAGE_ENGINE == "records":
+    import storage_records as storage
+else:
+    import storage
 
 app = Flask(__name__)
 
 VALID_CATEGORIES = {"Book", "Film", "Magazine"}
+MAX_SEARCH_LIMIT = 100
+MAX_BATCH_SIZE = 10_000
+REQUIRED_FIELDS = {"name", "publication_date", "author", "category"}
+# Encoded list/category responses, reused until the items behind them change
+response_cache = ResponseCache()
+
+
+def _listing_version(category=None):
+    return storage.category_version(category)
+
+
+def _validation_error(data):
+    """Returns an error message if data cannot be used to create an item, else None."""
+    if not isinstance(data, dict) or not REQUIRED_FIELDS.issubset(data.keys()):
+        return "Missing fields, required: name, publication_date, author, category"
+    if not all(isinstance(data[field], str) for field in REQUIRED_FIELDS):
+        return "Fields name, publication_date, author and category must be strings"
+    if data["category"].capitalize() not in VALID_CATEGORIES:
+        return f"Category must be one of {list(VALID_CATEGORIES)}"
+    return None
+
+
+def _wants_page():
+    return "limit" in request.args or "cursor" in request.args
+
+
+def _page(category=None):
+    """Paged listing: ?limit=, ?cursor= and ?sort= (id, name, author, date, category; '-' to reverse)."""
+    try:
+        items, next_cursor = storage.page_media(
+            category,
+            sort=request.args.get("sort", "id"),
+            limit=parse_limit(request.args.get("limit")),
+            cursor=request.args.get("cursor"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"items": items, "next_cursor": next_cursor}), 200
 
 
 @app.route("/media", methods=["GET"])
+@conditional(storage.data_version)
+@cached_response(response_cache, _listing_version)
 def list_media():
-    """1. List all available media items."""
-    return jsonify(load_all()), 200
+    """1. List all available media items (NDJSON stream if Accept: application/x-ndjson)."""
+    if _wants_page():
+        return _page()
+    if wants_ndjson():
+        return ndjson_response(storage.iter_media()), 200
+    return jsonify(storage.load_all()), 200
 
 
 @app.route("/media/category/<category>", methods=["GET"])
+@conditional(storage.data_version)
+@cached_response(response_cache, _listing_version)
 def list_by_category(category):
     """2. List media in a specific category."""
     if category.capitalize() not in VALID_CATEGORIES:
         return jsonify({"error": "Invalid category"}), 400
-    return jsonify(find_by_category(category)), 200
+    if _wants_page():
+        return _page(category)
+    if wants_ndjson():
+        return ndjson_response(storage.iter_media(category)), 200
+    return jsonify(storage.find_by_category(category)), 200
 
 
 @app.route("/media/search", methods=["GET"])
+@conditional(storage.data_version)
 def search_by_name():
     """3. Search for media by exact name (query param ?name=...)."""
     name = request.args.get("name", "")
     if not name:
         return jsonify({"error": "Please provide name query parameter"}), 400
-    found = find_by_name_exact(name)
+    found = storage.find_by_name_exact(name)
     if not found:
         return jsonify({}), 404
     return jsonify(found), 200
 
 
+@app.route("/media/search/text", methods=["GET"])
+@conditional(storage.data_version)
+def search_text_ranked():
+    """3b. Ranked full-text search over name and author (?q=...&limit=...)."""
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Please provide q query parameter"}), 400
+    try:
+        limit = int(request.args.get("limit", 10))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    return jsonify(storage.search_text(query, max(1, min(limit, MAX_SEARCH_LIMIT)))), 200
+
+
+@app.route("/media/suggest", methods=["GET"])
+@conditional(storage.data_version)
+def suggest():
+    """3c. Most frequent names and authors starting with ?prefix= (typeahead), as [{"text", "count"}]."""
+    # Not stripped: a trailing space means the next word has started
+    prefix = request.args.get("prefix", "")
+    if not prefix.strip():
+        return jsonify({"error": "Please provide prefix query parameter"}), 400
+    try:
+        limit = int(request.args.get("limit", 10))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    suggestions = storage.suggest(prefix, max(1, min(limit, MAX_SUGGESTIONS)))
+    return jsonify([{"text": text, "count": count} for text, count in suggestions]), 200
+
+
+@app.after_request
+def _allow_suggest_from_web_page(response):
+    """Lets the web page (index.html/script.js, opened separately from this API) read suggestions."""
+    if request.endpoint == "suggest":
+        response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
 @app.route("/media/<item_id>", methods=["GET"])
+@conditional(storage.data_version)
 def get_metadata(item_id):
     """4. Display metadata of a specific media item by id."""
-    found = find_by_id(item_id)
+    found = storage.find_by_id(item_id)
     if not found:
         return jsonify({"error": "Not found"}), 404
     return jsonify(found), 200
@@ -53,23 +154,55 @@ def get_metadata(item_id):
 def create_media():
     """5. Create a new media item."""
     data = request.get_json() or {}
-    required = {"name", "publication_date", "author", "category"}
-    if not required.issubset(data.keys()):
-        return jsonify({"error": "Missing fields, required: name, publication_date, author, category"}), 400
-    if data["category"].capitalize() not in VALID_CATEGORIES:
-        return jsonify({"error": f"Category must be one of {list(VALID_CATEGORIES)}"}), 400
-    created = add_media(data)
+    error = _validation_error(data)
+    if error:
+        return jsonify({"error": error}), 400
+    created = storage.add_media(data)
     return jsonify(created), 201
 
 
 @app.route("/media/<item_id>", methods=["DELETE"])
 def delete_item(item_id):
     """6. Delete a specific media item."""
-    ok = delete_media(item_id)
+    ok = storage.delete_media(item_id)
     if not ok:
         return jsonify({"error": "Not found"}), 404
     return jsonify({"deleted": item_id}), 200
 
 
+@app.route("/media/batch", methods=["POST"])
+def batch():
+    """7. Apply many create/delete operations at once, all or nothing.
+
+    Body: {"operations": [{"op": "create", "data": {...}}, {"op": "delete", "id": "..."}]}
+    """
+    data = request.get_json(silent=True)
+    operations = data.get("operations") if isinstance(data, dict) else data
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "Please provide a non-empty operations list"}), 400
+    if len(operations) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"A batch may contain at most {MAX_BATCH_SIZE} operations"}), 400
+
+    results = []
+    for index, op in enumerate(operations):
+        kind = op.get("op") if isinstance(op, dict) else None
+        if kind == "create":
+            error = _validation_error(op.get("data"))
+        elif kind == "delete":
+            error = None if "id" in op else "Missing id"
+        else:
+            error = "op must be 'create' or 'delete'"
+        results.append({"index": index, "op": kind, "status": 400, "error": error} if error else None)
+    if any(results):
+        results = [r or {"index": i, "op": operations[i]["op"], "status": 424, "error": NOT_APPLIED}
+                   for i, r in enumerate(results)]
+        return jsonify({"error": "Batch rejected", "results": results}), 400
+
+    applied, results = storage.apply_batch(operations)
+    if not applied:
+        return jsonify({"error": "Batch rejected", "results": results}), 400
+    return jsonify({"results": results}), 200
+
+
 if __name__ == "__main__":
     app.run(debug=True, port=5000)
@@ -1,17 +1,72 @@
 from flask import Flask, jsonify, request
 # Import the data manager instance
-from .data_manager import data_manager, CATEGORIES
+from .change_feed import CursorExpired
+from .data_manager import data_manager, CATEGORIES, MAX_BATCH_SIZE, BatchError
+from .conditional import conditional
+from .pagination import parse_limit
+from .response_cache import ResponseCache, cached_response
+from .streaming import event_stream_response, format_event, ndjson_response, wants_event_stream, wants_ndjson
+from .suggest_index import MAX_SUGGESTIONS
 
 # Initialize the Flask application
 app = Flask(__name__)
+# Whether requests may be held open (long polls, event streams). Servers that
+# handle one request at a time per process, such as serve.py --no-threads,
+# turn it off so a waiting client cannot stall every other request.
+app.config.setdefault("MEDIA_LONG_POLLING", True)
+
+# Upper bound on the number of ranked search results per request
+MAX_SEARCH_LIMIT = 100
+# Encoded list/category responses, reused until the items behind them change
+response_cache = ResponseCache()
+# Longest a GET /media/changes request is held open waiting for a change (seconds)
+MAX_CHANGES_TIMEOUT = 30.0
+# Seconds between keep-alive comments on an idle /media/changes event stream
+EVENT_STREAM_KEEPALIVE = 15.0
+
+def data_version():
+    """(tag, last_modified) of the whole dataset, for conditional requests."""
+    return data_manager.data_version()
+
+def listing_version(category_name=None):
+    """Version of the items behind GET /media (all) or GET /media/category/<name>."""
+    return data_manager.category_version(category_name.capitalize() if category_name else None)
+
+def wants_page():
+    """True when the client asked for a paged listing (?limit= or ?cursor=)."""
+    return 'limit' in request.args or 'cursor' in request.args
+
+def page_response(category=None):
+    """Builds a {"items": [...], "next_cursor": ...} response from the query parameters."""
+    try:
+        items, next_cursor = data_manager.get_media_page(
+            category,
+            sort=request.args.get('sort', 'id'),
+            limit=parse_limit(request.args.get('limit')),
+            cursor=request.args.get('cursor'),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"items": items, "next_cursor": next_cursor}), 200
 
 # --- HTTP Endpoints (API Routes) ---
 
 # 1. List of all available media items (GET /media)
 @app.route('/media', methods=['GET'])
+@conditional(data_version)
+@cached_response(response_cache, listing_version)
 def list_all_media():
-    """Returns a list of all media items."""
+    """Returns a list of all media items, or one page of them if ?limit=/?cursor= is given.
+
+    Clients sending ``Accept: application/x-ndjson`` get a streamed response
+    with one JSON object per line.
+    """
     try:
+        if wants_page():
+            return page_response()
+        if wants_ndjson():
+            # Stream one item per line instead of building the whole array
+            return ndjson_response(data_manager.iter_media()), 200
         media_list = data_manager.get_all_media()
         # Return HTTP 200 OK with the list of media
         return jsonify(media_list), 200
@@ -21,17 +76,24 @@ def list_all_media():
 
 # 2. List of all available media items in a specific category (GET /media/category/<category_name>)
 @app.route('/media/category/<string:category_name>', methods=['GET'])
+@conditional(data_version)
+@cached_response(response_cache, listing_version)
 def list_media_by_category(category_name):
-    """Returns a list of media items filtered by category."""
+    """Returns a list of media items filtered by category (paged if ?limit=/?cursor= is given)."""
     # Ensure the category is valid (case-insensitive check for robustness)
     if category_name.capitalize() not in CATEGORIES:
         return jsonify({"error": "Invalid category provided."}), 400
-    
+    if wants_page():
+        return page_response(category_name.capitalize())
+    if wants_ndjson():
+        return ndjson_response(data_manager.iter_media(category_name.capitalize())), 200
+
     media_list = data_manager.get_media_by_category(category_name.capitalize())
     return jsonify(media_list), 200
 
 # 3. Search for media items with a specific name (GET /media/search?name=...)
 @app.route('/media/search', methods=['GET'])
+@conditional(data_version)
 def search_media_by_name():
     """Searches for media items with an exact name match (case-insensitive)."""
     # Get the 'name' query parameter from the URL
@@ -44,8 +106,49 @@ def search_media_by_name():
     # Return 200 OK even if the list is empty
     return jsonify(results), 200
 
+# 3b. Ranked full-text search across name and author (GET /media/search/text?q=...&limit=...)
+@app.route('/media/search/text', methods=['GET'])
+@conditional(data_version)
+def search_media_text():
+    """Returns the best matches for a free-text query, tolerating typos and partial words."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Missing 'q' query parameter."}), 400
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({"error": "'limit' must be an integer."}), 400
+
+    results = data_manager.search_media(query, max(1, min(limit, MAX_SEARCH_LIMIT)))
+    return jsonify(results), 200
+
+# 3c. Typeahead completions of names and authors (GET /media/suggest?prefix=...&limit=...)
+@app.route('/media/suggest', methods=['GET'])
+@conditional(data_version)
+def suggest_media():
+    """Returns the most frequent names and authors starting with the prefix, as [{"text", "count"}]."""
+    # Not stripped: a trailing space means the next word has started
+    prefix = request.args.get('prefix', '')
+    if not prefix.strip():
+        return jsonify({"error": "Missing 'prefix' query parameter."}), 400
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({"error": "'limit' must be an integer."}), 400
+
+    suggestions = data_manager.suggest_media(prefix, max(1, min(limit, MAX_SUGGESTIONS)))
+    return jsonify([{"text": text, "count": count} for text, count in suggestions]), 200
+
+@app.after_request
+def allow_suggest_from_web_page(response):
+    """Lets the web page (index.html/script.js, opened separately from this API) read suggestions."""
+    if request.endpoint == 'suggest_media':
+        response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
 # 4. Display the metadata of a specific media item (GET /media/<id>)
 @app.route('/media/<string:media_id>', methods=['GET'])
+@conditional(data_version)
 def get_media_details(media_id):
     """Returns the metadata for a single media item by ID."""
     try:
@@ -91,6 +194,87 @@ def delete_media_item(media_id):
     except Exception as e:
         return jsonify({"error": "Failed to delete media item.", "details": str(e)}), 500
 
+# 7. Apply many create/delete operations at once (POST /media/batch)
+@app.route('/media/batch', methods=['POST'])
+def apply_media_batch():
+    """Applies a batch of operations atomically and reports a result per operation.
+
+    Body: {"operations": [{"op": "create", "data": {...}}, {"op": "delete", "id": "..."}]}
+    """
+    data = request.get_json(silent=True)
+    operations = data.get("operations") if isinstance(data, dict) else data
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "Request body must contain a non-empty 'operations' list."}), 400
+    if len(operations) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"A batch may contain at most {MAX_BATCH_SIZE} operations."}), 400
+
+    try:
+        results = data_manager.apply_batch(operations)
+        return jsonify({"results": results}), 200
+    except BatchError as e:
+        # Nothing was applied; the results say which operations were rejected
+        return jsonify({"error": str(e), "results": e.results}), 400
+    except Exception as e:
+        return jsonify({"error": "Failed to apply batch.", "details": str(e)}), 500
+
+# 8. Follow creates and deletes (GET /media/changes?since=...&timeout=...)
+@app.route('/media/changes', methods=['GET'])
+def list_media_changes():
+    """Returns the creates and deletes after the ``since`` cursor as {"changes": [...], "cursor": ...}.
+
+    Without ``since`` there are no changes, only the cursor to start from.
+    With ``timeout`` (seconds) the request is held open until a change
+    arrives (long polling). A cursor that has aged out of the feed gets
+    410 Gone with the cursor to continue from after reloading everything.
+    Clients sending ``Accept: text/event-stream`` get the same bodies as
+    Server-Sent Events for as long as they stay connected. Where
+    MEDIA_LONG_POLLING is off, ``timeout`` is ignored and event streams
+    get 406.
+    """
+    # EventSource sends the id of the last event it saw when it reconnects
+    cursor = request.args.get('since') or request.headers.get('Last-Event-ID') or None
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        timeout = float(request.args.get('timeout', 0))
+    except ValueError:
+        return jsonify({"error": "'timeout' must be a number."}), 400
+    long_polling = app.config["MEDIA_LONG_POLLING"]
+    if wants_event_stream():
+        if not long_polling:
+            return jsonify({"error": "Event streams are not available on this server; poll instead."}), 406
+        return event_stream_response(iter_change_events(cursor, limit))
+
+    timeout = max(0.0, min(timeout, MAX_CHANGES_TIMEOUT)) if long_polling else 0.0
+    try:
+        changes, cursor = data_manager.get_changes(cursor, limit, timeout)
+    except CursorExpired as e:
+        return jsonify({"error": str(e), "cursor": e.cursor}), 410
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"changes": changes, "cursor": cursor}), 200
+
+def iter_change_events(cursor, limit):
+    """Yields the change feed as Server-Sent Events until the client disconnects or the cursor expires."""
+    first = True
+    while True:
+        try:
+            changes, cursor = data_manager.get_changes(cursor, limit, 0.0 if first else EVENT_STREAM_KEEPALIVE)
+        except CursorExpired as e:
+            yield format_event({"error": str(e), "cursor": e.cursor}, event="expired")
+            return
+        except ValueError as e:
+            yield format_event({"error": str(e)}, event="error")
+            return
+        if changes or first:
+            # The first event tells a client without a cursor where the feed starts
+            yield format_event({"changes": changes, "cursor": cursor}, event_id=cursor)
+        else:
+            yield ": keep-alive\n\n"
+        first = False
+
 # --- Running the Server ---
 if __name__ == '__main__':
     # Ensure the Flask app runs on a defined host/port (e.g., 5000)
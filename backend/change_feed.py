@@ -0,0 +1,152 @@
+import threading
+import time
+import uuid
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Changes kept for clients to catch up on; older cursors must resync
+CHANGE_BUFFER_SIZE = 10_000
+# While waiting, how often other processes' writes are looked for (see ChangeFeed.read)
+REFRESH_INTERVAL = 0.5
+
+
+class CursorExpired(Exception):
+    """The changes after a cursor are no longer all in the feed.
+
+    ``cursor`` is where to continue from once the client has reloaded
+    everything it holds.
+    """
+
+    def __init__(self, message: str, cursor: str):
+        super().__init__(message)
+        self.cursor = cursor
+
+
+class ChangeFeed:
+    """In-memory ring buffer of the latest create/delete events, for clients to follow.
+
+    Events are the journal's records ({"op": "create", "item": {...}} or
+    {"op": "delete", "id": "..."}) numbered in the order they were applied.
+    A cursor names the position after an event. By default it is
+    "<feed>.<seq>": the feed token changes with every process start, so a
+    cursor from a restarted (or another) process is reported as expired
+    instead of silently skipping changes. So is one older than the buffer,
+    or one from before reset().
+
+    Owners whose changes come from storage shared by several processes
+    name the positions themselves, from that storage (e.g. a log file and
+    byte offset), through the ``cursor``/``cursors`` arguments. Every
+    process then hands out the same cursor for the same change and accepts
+    the others'. Names must have the form "<token>.<number>".
+    """
+
+    def __init__(self, capacity: int = CHANGE_BUFFER_SIZE, cursor: Optional[str] = None):
+        self._token = uuid.uuid4().hex[:12]
+        # (seq, event), oldest first
+        self._events: deque = deque(maxlen=capacity)
+        # Last sequence number handed out
+        self._seq = 0
+        # Oldest cursor whose following changes are all still in the buffer
+        self._floor = 0
+        # Cursor names of the positions from _floor on: name -> seq, and
+        # seq -> names (the first one is what read() hands out)
+        self._positions: Dict[str, int] = {}
+        self._names: Dict[int, List[str]] = {}
+        self._name(0, cursor)
+        self._changed = threading.Condition()
+
+    @property
+    def cursor(self) -> str:
+        """Cursor of the newest change."""
+        with self._changed:
+            return self._format(self._seq)
+
+    def _format(self, seq: int) -> str:
+        return self._names[seq][0]
+
+    def _name(self, seq: int, cursor: Optional[str]) -> None:
+        """Gives a position a cursor name (the default one if None); needs _changed."""
+        if cursor is None:
+            cursor = f"{self._token}.{seq}"
+        self._positions[cursor] = seq
+        self._names.setdefault(seq, []).append(cursor)
+
+    def _raise_floor(self, floor: int) -> None:
+        """Forgets the cursors of positions before ``floor``; needs _changed."""
+        for seq in range(self._floor, floor):
+            for cursor in self._names.pop(seq, ()):
+                del self._positions[cursor]
+        self._floor = floor
+
+    def publish(self, events: Iterable[Dict[str, Any]], cursors: Optional[Iterable[str]] = None) -> None:
+        """Appends events in order and wakes the readers waiting for them.
+
+        ``cursors`` names the position after each event, as described above.
+        """
+        names = iter(cursors) if cursors is not None else None
+        with self._changed:
+            for event in events:
+                if len(self._events) == self._events.maxlen:
+                    self._raise_floor(self._events[0][0])
+                self._seq += 1
+                self._events.append((self._seq, event))
+                self._name(self._seq, None if names is None else next(names))
+            self._changed.notify_all()
+
+    def alias(self, cursor: str) -> None:
+        """Gives the newest position a second name, e.g. the start of a new log file."""
+        with self._changed:
+            if cursor not in self._positions:
+                self._name(self._seq, cursor)
+
+    def reset(self, cursor: Optional[str] = None) -> None:
+        """Expires every cursor, for when the data changed without events (e.g. a full reload).
+
+        ``cursor`` names the new position.
+        """
+        with self._changed:
+            self._events.clear()
+            self._seq += 1
+            self._raise_floor(self._seq)
+            self._name(self._seq, cursor)
+            self._changed.notify_all()
+
+    def _position(self, cursor: str) -> int:
+        """Sequence number of a cursor; raises CursorExpired if changes after it were dropped."""
+        if not cursor.partition(".")[2].isdigit():
+            raise ValueError("Invalid cursor.")
+        seq = self._positions.get(cursor)
+        if seq is None:
+            raise CursorExpired("Cursor has expired; reload and continue from the returned cursor.",
+                                self._format(self._seq))
+        return seq
+
+    def read(self, cursor: Optional[str], limit: int = 100, timeout: float = 0.0,
+             refresh: Optional[Callable[[], None]] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """Returns (up to ``limit`` events after ``cursor``, cursor of the last one returned).
+
+        With no events yet, waits up to ``timeout`` seconds for one. Without
+        a cursor nothing is returned, only the current cursor to follow the
+        feed from. ``refresh`` is called every REFRESH_INTERVAL while
+        waiting, for feeds that pick up changes made by other processes.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if refresh is not None:
+                refresh()
+            with self._changed:
+                if cursor is None:
+                    return [], self._format(self._seq)
+                seq = self._position(cursor)
+                remaining = deadline - time.monotonic()
+                if seq == self._seq and remaining > 0:
+                    self._changed.wait(remaining if refresh is None else min(remaining, REFRESH_INTERVAL))
+                    seq = self._position(cursor)
+                if seq < self._seq or time.monotonic() >= deadline:
+                    # Sequence numbers in the buffer are consecutive
+                    start = seq - self._events[0][0] + 1 if self._events else 0
+                    picked = list(islice(self._events, start, start + limit))
+                    if not picked:
+                        return [], self._format(seq)
+                    return [event for _, event in picked], self._format(picked[-1][0])
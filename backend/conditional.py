@@ -0,0 +1,43 @@
+import functools
+from datetime import datetime, timezone
+from typing import Callable, Tuple
+
+from flask import Response, make_response, request
+from werkzeug.http import is_resource_modified
+
+from .streaming import wants_ndjson
+
+
+def conditional(get_version: Callable[[], Tuple[str, float]]):
+    """Decorator for GET views whose body depends only on the dataset version.
+
+    ``get_version()`` returns ``(tag, last_modified)``: an opaque token that
+    changes with every mutation and the Unix time of that mutation. When the
+    request's If-None-Match / If-Modified-Since still match, a 304 is sent
+    without calling the view, so nothing is looked up or serialized.
+    Successful responses carry the ETag and Last-Modified to revalidate with.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            # Taken before the view runs: if a write lands in between, the body
+            # is newer than the tag and the next revalidation simply refetches
+            tag, last_modified = get_version()
+            # JSON and NDJSON bodies of one URL must not share a tag
+            etag = f"{tag}-ndjson" if wants_ndjson() else tag
+            modified_at = datetime.fromtimestamp(int(last_modified), timezone.utc)
+
+            if not is_resource_modified(request.environ, etag=etag, last_modified=modified_at):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.last_modified = modified_at
+            # Caches may keep the body but must check back before reusing it
+            response.cache_control.no_cache = True
+            response.vary.add('Accept')
+            return response
+        return wrapper
+    return decorator
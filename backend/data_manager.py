@@ -1,58 +1,595 @@
 import json
+import operator
 import os
-from typing import Dict, Any
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import Callable, Dict, Any, Iterable, Iterator, Optional, Tuple
 
-# Define the file where data will be saved
+from .change_feed import CHANGE_BUFFER_SIZE, ChangeFeed
+from .filelock import FileLock
+from .journal import Journal
+from .pagination import DEFAULT_PAGE_SIZE, PageIndex
+from .records import (AUTHOR, CATEGORY, FIELD_POSITIONS, ID, NAME, MediaRecords, Record,
+                      make_record, record_to_dict)
+from .rwlock import ReadWriteLock
+from .search_index import SearchIndex
+from .snapshot import read_snapshot, write_snapshot
+from .sqlite_store import SQLiteStore
+
+# Define the file where data will be saved (full snapshot)
 DATA_FILE = 'media_data.json'
+# Snapshot format written by compaction: "binary" (backend/snapshot.py, next
+# to DATA_FILE with a .snapshot extension, loads several times faster) or
+# "json" (DATA_FILE itself). A binary snapshot, if present, is always the
+# newest one: writing a JSON snapshot removes it.
+SNAPSHOT_FORMAT = os.environ.get("MEDIA_SNAPSHOT_FORMAT", "binary")
+# Append-only log of changes made since the last snapshot
+LOG_FILE = 'media_data.log'
+# Compact the log into a new snapshot once it grows past this many bytes
+LOG_COMPACT_BYTES = 4 * 1024 * 1024
+# When a write counts as saved: "fsync" (per group commit), "interval"
+# (fsync every SYNC_INTERVAL_MS) or "os" (left to the OS page cache)
+DURABILITY = "fsync"
+SYNC_INTERVAL_MS = 100
+# Set when several worker processes serve the same files (see serve.py).
+# Writes then take an inter-process file lock and every worker picks up the
+# others' changes from the log before reading or writing.
+SHARED_STORAGE = os.environ.get("MEDIA_SHARED_STORAGE") == "1"
+# Storage engine behind the module-level data_manager: "json" (snapshot
+# plus log, above) or "sqlite" (DB_FILE, see SQLiteDataManager)
+STORAGE_ENGINE = os.environ.get("MEDIA_STORAGE_ENGINE", "json")
+DB_FILE = 'media_data.db'
+# Item fields besides the id, in storage order
+MEDIA_FIELDS = ("Name", "Publication date", "Author", "Category")
 # Define the allowed categories
 CATEGORIES = ["Book", "Film", "Magazine"]
+# Largest number of operations accepted in one batch
+MAX_BATCH_SIZE = 10_000
+# Items iter_media reads per hold of the read lock
+ITER_CHUNK_SIZE = 1000
+# Fields covered by full-text search, with their ranking weights
+SEARCH_FIELDS = [("Name", 2.0), ("Author", 1.0)]
+# Sort names accepted by paged listings, mapped to item fields
+SORT_FIELDS = {"name": "Name", "author": "Author", "date": "Publication date", "category": "Category"}
+# The same, as positions in the records DataManager keeps (backend/records.py)
+_SEARCH_POSITIONS = [(FIELD_POSITIONS[field], weight) for field, weight in SEARCH_FIELDS]
+_SORT_POSITIONS = {name: FIELD_POSITIONS[field] for name, field in SORT_FIELDS.items()}
+
+class BatchError(ValueError):
+    """Raised when a batch is rejected; carries the per-operation results."""
+
+    def __init__(self, results: list):
+        super().__init__("Batch rejected; no operations were applied.")
+        self.results = results
+
+
+def validate_media(data: Dict[str, str]):
+    """Raises ValueError if data cannot be used to create a media item."""
+    required_fields = ["Name", "Publication date", "Author", "Category"]
+    if not isinstance(data, dict) or not all(field in data for field in required_fields):
+        raise ValueError("Missing required field(s).")
+    if data["Category"] not in CATEGORIES:
+         raise ValueError(f"Invalid category. Must be one of: {', '.join(CATEGORIES)}")
+
+
+def check_batch(operations: list, exists: Callable[[str], bool]) -> list:
+    """Validates every operation of a batch before any is applied.
+
+    ``exists`` tells whether a media id is currently stored. Returns one
+    result dict per operation; raises BatchError if any operation would fail.
+    """
+    results = []
+    deleted = set()
+    failed = False
+    for index, operation in enumerate(operations):
+        op = operation.get("op") if isinstance(operation, dict) else None
+        result = {"index": index, "op": op}
+        try:
+            if op == "create":
+                validate_media(operation.get("data"))
+            elif op == "delete":
+                media_id = str(operation.get("id"))
+                if media_id in deleted or not exists(media_id):
+                    result.update(status=404, error=f"Media item with ID {media_id} not found.")
+                    failed = True
+                deleted.add(media_id)
+            else:
+                raise ValueError("Operation must be 'create' or 'delete'.")
+        except ValueError as e:
+            result.update(status=400, error=str(e))
+            failed = True
+        results.append(result)
+
+    if failed:
+        for result in results:
+            result.setdefault("status", 424)
+            result.setdefault("error", "Not applied because another operation in the batch failed.")
+        raise BatchError(results)
+    return results
+
+
+def _log_cursor(inode: int, offset: int) -> str:
+    """Change feed cursor for a position in the shared log (see DataManager._restart_feed)."""
+    return f"{inode:x}.{offset}"
+
+
+def _log_cursors(state: Tuple[int, int], records: list) -> list:
+    """Cursors after each of ``records``, which are the last ones in the log at (inode, size) ``state``."""
+    cursors = []
+    end = state[1]
+    for record in reversed(records):
+        cursors.append(_log_cursor(state[0], end))
+        end -= len(Journal.encode(record))
+    cursors.reverse()
+    return cursors
+
 
 class DataManager:
-    """Manages loading, saving, and CRUD operations on media data."""
+    """Manages loading, saving, and CRUD operations on media data.
 
-    def __init__(self):
-        self.media: Dict[str, Dict[str, Any]] = {}
+    Safe to share between threads: reads run concurrently, writes (and id
+    allocation) are exclusive.
+    """
+
+    def __init__(self, data_file: Optional[str] = None, log_file: Optional[str] = None,
+                 compact_bytes: Optional[int] = None, durability: Optional[str] = None,
+                 sync_interval_ms: Optional[int] = None, shared: Optional[bool] = None,
+                 snapshot_format: Optional[str] = None):
+        self.data_file = data_file or DATA_FILE
+        self.snapshot_file = os.path.splitext(self.data_file)[0] + '.snapshot'
+        self.snapshot_format = snapshot_format or SNAPSHOT_FORMAT
+        if self.snapshot_format not in ("binary", "json"):
+            raise ValueError("Invalid snapshot format. Must be one of: binary, json")
+        self.log_file = log_file or LOG_FILE
+        self.compact_bytes = compact_bytes if compact_bytes is not None else LOG_COMPACT_BYTES
+        # Items are held as compact records and turned into dicts when read
+        self.media = MediaRecords()
         self.next_id = 1
-        self._load_data()
-        
+        # Secondary indexes: category -> ids and casefolded name -> ids.
+        # Inner dicts are used as insertion-ordered sets.
+        self._by_category: Dict[str, Dict[str, None]] = {}
+        self._by_name: Dict[str, Dict[str, None]] = {}
+        # Inverted index over SEARCH_FIELDS for ranked/fuzzy search. Building it
+        # is the slowest part of loading, so it waits for the first search.
+        self._search = SearchIndex()
+        self._search_ready = False
+        # Records sorted per (category, sort field) for get_media_page, built on first use
+        self._pages = PageIndex(_SORT_POSITIONS, self._page_source, operator.itemgetter(CATEGORY),
+                                id_key=int, id_field=ID, get=operator.getitem)
+        self._journal = Journal(self.log_file, durability or DURABILITY,
+                                sync_interval_ms if sync_interval_ms is not None else SYNC_INTERVAL_MS)
+        self._compactor: Optional[threading.Thread] = None
+        self._compact_lock = threading.Lock()
+        # Readers share the lock; create/delete/batch hold it exclusively
+        self._lock = ReadWriteLock()
+        # Cross-process coordination, only used in shared mode
+        self.shared = SHARED_STORAGE if shared is None else shared
+        self._file_lock = FileLock(self.data_file + '.lock')
+        # (inode, size) of the log as of the last record this process has applied
+        self._log_state: Optional[Tuple[int, int]] = None
+        # Bumped on every change to self.media, including changes picked up
+        # from other workers; the instance token keeps tags unique across restarts
+        self.version = 0
+        self.modified_at = time.time()
+        self._instance = uuid.uuid4().hex[:12]
+        # Per-category change counters, plus the number of full (re)loads,
+        # which may have changed any category
+        self._category_versions: Dict[str, int] = {}
+        self._loads = 0
+        # Recent creates and deletes, including other workers', for GET /media/changes
+        self.changes = ChangeFeed()
+        # Writes whose records are logged but not yet published, oldest first:
+        # [records, durable, cursors]; durable is None until their log wait
+        # is over, cursors only set in shared mode (see _log_cursors)
+        self._unpublished: deque = deque()
+        self._publish_lock = threading.Lock()
+        with self._shared_lock():
+            self._load_data()
+            self._log_state = self._stat_log()
+
+    @property
+    def _archive_file(self) -> str:
+        """Log segment being folded into the snapshot by the compactor."""
+        return self.log_file + '.1'
+
     def _load_data(self):
-        """Loads media data from the JSON file."""
-        if os.path.exists(DATA_FILE):
+        """Loads the snapshot, then replays the log written since it was taken."""
+        self._loads += 1
+        self.media = MediaRecords()
+        if os.path.exists(self.snapshot_file):
+            try:
+                rows, next_id = read_snapshot(self.snapshot_file)
+                if isinstance(rows, dict):
+                    # Written before records were compact: item dicts by id
+                    self.media = MediaRecords.from_items(rows)
+                else:
+                    self.media = MediaRecords.from_rows(rows)
+                self.next_id = max(self.next_id, next_id)
+            except (ValueError, IOError) as e:
+                print(f"Error loading snapshot file {self.snapshot_file}: {e}. Starting with empty data.")
+                self.media = MediaRecords()
+        elif os.path.exists(self.data_file):
             try:
-                with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                    # Load data. Keys (IDs) must be converted back to integers if using next_id logic.
-                    data = json.load(f)
-                    self.media = {k: v for k, v in data.items()}
-                    
-                    # Determine the next available ID
-                    if self.media:
-                        # Find the max ID used and set next_id one higher
-                        max_id = max([int(k) for k in self.media.keys()])
-                        self.next_id = max_id + 1
-                    
+                with open(self.data_file, 'r', encoding='utf-8') as f:
+                    self.media = MediaRecords.from_items(json.load(f))
             except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading data file {DATA_FILE}: {e}. Starting with empty data.")
-                self.media = {}
-        
-    def _save_data(self):
-        """Saves current media data to the JSON file."""
+                print(f"Error loading data file {self.data_file}: {e}. Starting with empty data.")
+                self.media = MediaRecords()
+            # Determine the next available ID
+            if self.media:
+                # Find the max ID used and set next_id one higher
+                max_id = max([int(k) for k in self.media.keys()])
+                self.next_id = max(self.next_id, max_id + 1)
+
+        # A leftover archive means compaction was interrupted; replaying it is
+        # harmless even if the snapshot already contains its changes.
+        for record in Journal.replay(self._archive_file):
+            self._apply_record(record)
+        if self.shared:
+            # Created up front so every worker names feed positions after the same file
+            open(self.log_file, 'ab').close()
+        logged = list(Journal.entries(self.log_file))
+        for _, record in logged:
+            self._apply_record(record)
+
+        self._rebuild_indexes()
+        if self.shared:
+            self._restart_feed(logged)
+
+    def _restart_feed(self, logged: list):
+        """Refills the change feed from the (offset, record) entries of the log just loaded.
+
+        In shared mode cursors are "<log inode>.<offset after the record>",
+        which every worker derives alike from the shared log: a client may
+        send its cursor to any worker, including one that loaded later.
+        """
+        inode = os.stat(self.log_file).st_ino
+        self.changes.reset(_log_cursor(inode, 0))
+        self.changes.publish([record for _, record in logged], [_log_cursor(inode, end) for end, _ in logged])
+
+    def _rebuild_indexes(self):
+        """Recomputes the secondary indexes from scratch; the search index is dropped until needed."""
+        self._by_category = {}
+        self._by_name = {}
+        self._pages.clear()
+        for record in self.media.records():
+            self._index_add(record, search=False)
+        self._search = SearchIndex()
+        self._search_ready = False
+
+    def _ensure_search_index(self):
+        """Builds the full-text index on first use."""
+        if self._search_ready:
+            return
+        with self._lock.write():
+            if not self._search_ready:
+                self._search.rebuild((record[ID], self._search_fields(record)) for record in self.media.records())
+                self._search_ready = True
+
+    @staticmethod
+    def _search_fields(record: Record) -> list:
+        return [(record[position], weight) for position, weight in _SEARCH_POSITIONS]
+
+    def _index_add(self, record: Record, search: bool = True):
+        self._bump_category(record[CATEGORY])
+        self._by_category.setdefault(record[CATEGORY], {})[record[ID]] = None
+        self._by_name.setdefault(record[NAME].casefold(), {})[record[ID]] = None
+        if search and self._search_ready:
+            self._search.add(record[ID], self._search_fields(record))
+        self._pages.add(record)
+
+    def _index_remove(self, record: Record):
+        self._bump_category(record[CATEGORY])
+        self._search.remove(record[ID])
+        self._pages.remove(record)
+        for index, key in ((self._by_category, record[CATEGORY]), (self._by_name, record[NAME].casefold())):
+            ids = index.get(key)
+            if ids is not None:
+                ids.pop(record[ID], None)
+                if not ids:
+                    del index[key]
+
+    def _bump_category(self, category: str):
+        self._category_versions[category] = self._category_versions.get(category, 0) + 1
+
+    def _apply_record(self, record: Dict[str, Any], index: bool = False):
+        """Applies one log record to the in-memory data (and the indexes if asked)."""
+        if record["op"] == "create":
+            item = make_record(record["item"])
+            if index and item[ID] in self.media:
+                self._index_remove(self.media.record(item[ID]))
+            self.media[item[ID]] = item
+            self.next_id = max(self.next_id, int(item[ID]) + 1)
+            if index:
+                self._index_add(item)
+        elif record["op"] == "delete":
+            item = self.media.pop_record(record["id"])
+            if index and item is not None:
+                self._index_remove(item)
+
+    # --- Multi-process support ---
+
+    def _shared_lock(self):
+        """Inter-process read lock in shared mode, a no-op otherwise."""
+        return self._file_lock.shared() if self.shared else nullcontext()
+
+    def _exclusive_lock(self):
+        """Inter-process write lock in shared mode, a no-op otherwise."""
+        return self._file_lock.exclusive() if self.shared else nullcontext()
+
+    def _stat_log(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.log_file)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size)
+
+    def _catch_up(self):
+        """Applies changes other processes have logged since we last looked.
+
+        Caller holds the write lock and an inter-process lock. A log that was
+        replaced means another process is compacting it: while the archive
+        is the log we were reading, we continue there and then read the new
+        log. Otherwise (the archive is gone, or the log shrank) everything
+        is reloaded from the snapshot.
+        """
+        state = self._stat_log()
+        if state == self._log_state:
+            return
+        known = self._log_state
+        if state is not None and known is not None and state[0] != known[0] and self._archive_inode() == known[0]:
+            self._journal.reopen()
+            self._replay_logged(self._archive_file, known)
+            self.changes.alias(_log_cursor(state[0], 0))
+            self._replay_logged(self.log_file, (state[0], 0))
+        elif state is None or known is None or state[0] != known[0] or state[1] < known[1]:
+            # Our append handle may point at the rotated file; reopen by path
+            self._journal.reopen()
+            self._load_data()
+        else:
+            self._replay_logged(self.log_file, known)
+        self._log_state = self._stat_log()
+        self._touch()
+
+    def _archive_inode(self) -> Optional[int]:
+        try:
+            return os.stat(self._archive_file).st_ino
+        except OSError:
+            return None
+
+    def _replay_logged(self, path: str, state: Tuple[int, int]):
+        """Applies and publishes the records of a log file after (inode, offset) ``state``."""
+        logged = list(Journal.entries(path, state[1]))
+        for _, record in logged:
+            self._apply_record(record, index=True)
+        self.changes.publish([record for _, record in logged],
+                             [_log_cursor(state[0], end) for end, _ in logged])
+
+    def _refresh(self):
+        """In shared mode, catches up with other workers before a read."""
+        if not self.shared or self._stat_log() == self._log_state:
+            return
+        with self._lock.write(), self._file_lock.shared():
+            self._catch_up()
+
+    @contextmanager
+    def _reading(self):
+        """Holds the read lock, after catching up with other workers in shared mode."""
+        self._refresh()
+        with self._lock.read():
+            yield
+
+    @contextmanager
+    def _writing(self):
+        """Holds the locks for a write and yields a function that queues log records.
+
+        In shared mode the records must reach the log before the
+        inter-process lock is released, so other workers can see them;
+        otherwise the wait happens after all locks are dropped, letting
+        concurrent writers share one group commit. Either way the records
+        go to the change feed only once the log has them, in log order.
+
+        If the records could not be logged, the in-memory data is reloaded
+        from disk, dropping the change, and IOError is raised.
+        """
+        groups = []
+        written = [[], None, None]
+        error = None
+
+        def log(records):
+            groups.append(self._append_log(records))
+            written[0].extend(records)
+
+        with ExitStack() as stack:
+            stack.enter_context(self._lock.write())
+            if self.shared:
+                stack.enter_context(self._file_lock.exclusive())
+                self._catch_up()
+            yield log
+            if groups:
+                self._touch()
+                # Queued under the write lock, so in the order of the log
+                with self._publish_lock:
+                    self._unpublished.append(written)
+            if self.shared:
+                error = self._await_log(groups)
+                written[1] = error is None
+                self._log_state = self._stat_log()
+                if groups and written[1]:
+                    written[2] = _log_cursors(self._log_state, written[0])
+                self._publish_written()
+                if error is not None:
+                    self._reload_after_failed_write()
+        if not self.shared:
+            error = self._await_log(groups)
+            written[1] = error is None
+            self._publish_written()
+            if error is not None:
+                with self._lock.write():
+                    self._reload_after_failed_write()
+        if error is not None:
+            raise IOError(f"Error writing log file {self.log_file}: {error}")
+        if groups and self._journal.size() >= self.compact_bytes:
+            self.compact(background=True)
+
+    def _publish_written(self):
+        """Publishes the writes at the front of the queue whose log wait is over.
+
+        A write waits for the ones queued before it; a write whose records
+        could not be logged is left out of the feed.
+        """
+        with self._publish_lock:
+            while self._unpublished and self._unpublished[0][1] is not None:
+                records, durable, cursors = self._unpublished.popleft()
+                if durable:
+                    self.changes.publish(records, cursors)
+
+    def get_changes(self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                    timeout: float = 0.0) -> Tuple[list, str]:
+        """Returns the creates and deletes after ``cursor`` and the cursor to continue from.
+
+        Waits up to ``timeout`` seconds for a change if there is none yet.
+        Raises CursorExpired when the changes after ``cursor`` are no longer
+        all known (see ChangeFeed). In shared mode a cursor from any worker
+        is accepted (see _restart_feed).
+        """
+        return self.changes.read(cursor, limit, timeout, self._refresh if self.shared else None)
+
+    def _touch(self):
+        """Records that self.media changed; the caller holds the write lock."""
+        self.version += 1
+        self.modified_at = time.time()
+
+    def data_version(self) -> Tuple[str, float]:
+        """Returns (tag, last_modified): a token that changes with every write, and its time."""
+        with self._reading():
+            return f"{self._instance}.{self.version}", self.modified_at
+
+    def category_version(self, category: Optional[str] = None) -> str:
+        """Returns a token that changes whenever an item of ``category`` (or, for None, any item) changes."""
+        with self._reading():
+            if category is None:
+                return f"{self._instance}.{self.version}"
+            return f"{self._instance}.{self._loads}.{self._category_versions.get(category, 0)}"
+
+    def _append_log(self, records: list):
+        """Queues log records for changes just made in memory.
+
+        Must be called while holding the write lock (see _writing), so that
+        the log order matches the order of the in-memory changes.
+        """
+        return self._journal.submit(records)
+
+    def _await_log(self, groups: list) -> Optional[IOError]:
+        """Waits until queued records are as durable as the journal's mode requires.
+
+        Returns the error if some of them could not be written, else None.
+        """
+        error = None
+        for group in groups:
+            try:
+                self._journal.wait(group)
+            except IOError as e:
+                error = error or e
+        return error
+
+    def _reload_after_failed_write(self):
+        """Replaces the in-memory data with what is on disk after a failed log write.
+
+        Caller holds the write lock (and in shared mode the inter-process
+        lock), so every record logged so far was submitted before this.
+        """
         try:
-            with open(DATA_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.media, f, indent=4)
+            # Let records queued by other writers reach the log first
+            self._journal.append_many([])
+        except IOError:
+            pass
+        if not self.shared:
+            # A running compactor may replace the snapshot and archive mid-load
+            self.wait_for_compaction()
+        self._load_data()
+        self._log_state = self._stat_log()
+        self._touch()
+
+    def _save_data(self, media: Optional[MediaRecords] = None, next_id: Optional[int] = None):
+        """Atomically writes a full snapshot of the media data in the configured format."""
+        if media is None:
+            media = self.media
+        if self.snapshot_format == "binary":
+            try:
+                write_snapshot(self.snapshot_file, media.rows(), next_id or self.next_id)
+            except IOError as e:
+                print(f"Error saving snapshot file {self.snapshot_file}: {e}")
+                return False
+            return True
+        tmp_file = self.data_file + '.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(media.to_dict(), f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.data_file)
+            # The JSON file is now the newest snapshot
+            if os.path.exists(self.snapshot_file):
+                os.remove(self.snapshot_file)
         except IOError as e:
-            print(f"Error saving data file {DATA_FILE}: {e}")
+            print(f"Error saving data file {self.data_file}: {e}")
+            return False
+        return True
 
-    def create_media(self, data: Dict[str, str]) -> Dict[str, Any]:
-        """Creates a new media item, assigns an ID, and saves data."""
-        
-        # 1. Validation (Best Practice)
-        required_fields = ["Name", "Publication date", "Author", "Category"]
-        if not all(field in data for field in required_fields):
-            raise ValueError("Missing required field(s).")
-        if data["Category"] not in CATEGORIES:
-             raise ValueError(f"Invalid category. Must be one of: {', '.join(CATEGORIES)}")
+    def compact(self, background: bool = False):
+        """Folds the log into a fresh snapshot.
+
+        The live log is rotated aside first, so writers keep appending to a new
+        file while the snapshot is being written.
+        """
+        if not self._compact_lock.acquire(blocking=False):
+            return
+        try:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            # Rotate before copying, so every change missing from the copy is in
+            # the new log (replaying a change the copy already has is harmless)
+            with self._lock.write(), self._exclusive_lock():
+                if self.shared:
+                    self._catch_up()
+                self._journal.rotate(self._archive_file)
+                if self.shared:
+                    # Start the new log now, so feed cursors can name its start
+                    open(self.log_file, 'ab').close()
+                    self.changes.alias(_log_cursor(self._stat_log()[0], 0))
+                self._log_state = self._stat_log()
+                snapshot = self.media.copy()
+                next_id = self.next_id
+            self._start_compactor(snapshot, next_id, background)
+        finally:
+            self._compact_lock.release()
+
+    def _start_compactor(self, snapshot: MediaRecords, next_id: int, background: bool):
+        """Writes the snapshot, then drops the archived log it replaces."""
+        def run():
+            # Other workers must not see the new snapshot and the old archive
+            # disappear separately
+            with self._exclusive_lock():
+                if self._save_data(snapshot, next_id) and os.path.exists(self._archive_file):
+                    os.remove(self._archive_file)
 
-        # 2. Assignment
+        if background:
+            self._compactor = threading.Thread(target=run, name="media-log-compactor", daemon=True)
+            self._compactor.start()
+        else:
+            run()
+
+    def wait_for_compaction(self):
+        """Blocks until a background compaction (if any) has finished."""
+        if self._compactor is not None:
+            self._compactor.join()
+
+    def _insert(self, data: Dict[str, str]) -> Dict[str, Any]:
+        """Assigns an ID and adds a validated item to memory and the indexes."""
         new_id = str(self.next_id)
         new_media = {
             "id": new_id,
@@ -61,23 +598,102 @@ class DataManager:
             "Author": data["Author"],
             "Category": data["Category"],
         }
-        
-        # 3. Persistence
-        self.media[new_id] = new_media
+        record = make_record(new_media)
+        self.media[new_id] = record
         self.next_id += 1
-        self._save_data()
+        self._index_add(record)
+        return new_media
+
+    def create_media(self, data: Dict[str, str]) -> Dict[str, Any]:
+        """Creates a new media item, assigns an ID, and saves data."""
+        
+        # 1. Validation (Best Practice)
+        validate_media(data)
+
+        # 2. Assignment and 3. Persistence (id allocation, indexing and
+        # logging happen under the write lock)
+        with self._writing() as log:
+            new_media = self._insert(data)
+            log([{"op": "create", "item": new_media}])
         
         return new_media
 
+    def seed(self, items: list) -> int:
+        """Creates ``items`` if there are no media yet; returns how many were created.
+
+        The emptiness check and the writes happen under one write lock (in
+        shared mode also the inter-process lock), so workers starting at the
+        same time seed the store only once.
+        """
+        for data in items:
+            validate_media(data)
+        with self._writing() as log:
+            if len(self.media):
+                return 0
+            log([{"op": "create", "item": self._insert(data)} for data in items])
+        return len(items)
+
+    def apply_batch(self, operations: list) -> list:
+        """Applies a list of create/delete operations atomically with one log write.
+
+        Each operation is ``{"op": "create", "data": {...}}`` or
+        ``{"op": "delete", "id": "..."}``. Every operation is validated before
+        any is applied; if one fails, nothing changes and BatchError is raised
+        with the per-operation results.
+        """
+        with self._writing() as log:
+            return self._apply_batch_locked(operations, log)
+
+    def _apply_batch_locked(self, operations: list, log) -> list:
+        """Validates and applies a batch; the caller holds the write lock."""
+        results = check_batch(operations, lambda media_id: media_id in self.media)
+        records = []
+        for operation, result in zip(operations, results):
+            if operation["op"] == "create":
+                new_media = self._insert(operation["data"])
+                records.append({"op": "create", "item": new_media})
+                result.update(status=201, item=new_media)
+            else:
+                media_id = str(operation["id"])
+                self._index_remove(self.media.pop_record(media_id))
+                records.append({"op": "delete", "id": media_id})
+                result.update(status=200, id=media_id)
+        if records:
+            log(records)
+        return results
+
+    def count(self) -> int:
+        """Returns the number of media items."""
+        with self._reading():
+            return len(self.media)
+
     def get_all_media(self) -> list:
         """Returns a list of all media items."""
-        return list(self.media.values())
+        with self._reading():
+            return list(map(record_to_dict, self.media.records()))
+
+    def iter_media(self, category: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yields media items one at a time in id order, for streaming responses.
+
+        Items are read ITER_CHUNK_SIZE at a time, each chunk under the read
+        lock, continuing after the last id returned; nothing is copied up
+        front. Items created or deleted during the iteration show up or not
+        depending on whether it has passed their id yet.
+        """
+        cursor = None
+        while True:
+            with self._reading():
+                records, cursor = self._pages.page(category, "id", ITER_CHUNK_SIZE, cursor)
+            yield from map(record_to_dict, records)
+            if cursor is None:
+                return
 
     def get_media_by_id(self, media_id: str) -> Dict[str, Any]:
         """Returns a single media item by its ID."""
-        if media_id not in self.media:
-            raise KeyError(f"Media item with ID {media_id} not found.")
-        return self.media[media_id]
+        with self._reading():
+            if media_id not in self.media:
+                raise KeyError(f"Media item with ID {media_id} not found.")
+            return self.media[media_id]
 
     def get_media_by_category(self, category: str) -> list:
         """Returns a list of media items in a specific category."""
@@ -85,26 +701,260 @@ class DataManager:
             # For robustness, handle invalid categories gracefully
             return []
             
-        return [item for item in self.media.values() if item["Category"] == category]
+        with self._reading():
+            return [self.media[media_id] for media_id in self._by_category.get(category, ())]
+
+    def get_media_page(self, category: Optional[str] = None, sort: str = "id",
+                       limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+        """Returns one page of media (optionally within a category) and the next-page cursor.
+
+        Raises ValueError for an unknown sort field or a malformed cursor.
+        """
+        with self._reading():
+            page, next_cursor = self._pages.page(category, sort, limit, cursor)
+        return list(map(record_to_dict, page)), next_cursor
+
+    def _page_source(self, category: Optional[str]) -> Iterable[Record]:
+        """Records the page index sorts for a category (None: all of them); needs the lock."""
+        if category is None:
+            return self.media.records()
+        return [self.media.record(media_id) for media_id in self._by_category.get(category, ())]
 
     def search_media_by_name(self, name: str) -> list:
-        """Searches for media items with an exact name match."""
-        return [item for item in self.media.values() if item["Name"].lower() == name.lower()]
+        """Searches for media items with an exact (case-insensitive) name match."""
+        with self._reading():
+            return [self.media[media_id] for media_id in self._by_name.get(name.casefold(), ())]
+
+    def search_media(self, query: str, limit: int = 10) -> list:
+        """Ranked, typo-tolerant search over name and author; best match first."""
+        while True:
+            self._ensure_search_index()
+            with self._reading():
+                # A reload by another worker may have dropped the index again
+                if self._search_ready:
+                    return [self.media[media_id] for media_id, _ in self._search.search(query, limit)]
+
+    def suggest_media(self, prefix: str, limit: int = 10) -> list:
+        """Most frequent names and authors starting with ``prefix``, as (text, count) pairs."""
+        while True:
+            self._ensure_search_index()
+            with self._reading():
+                if self._search_ready:
+                    return self._search.suggest(prefix, limit)
 
     def delete_media(self, media_id: str) -> bool:
         """Deletes a media item by its ID."""
-        if media_id not in self.media:
-            raise KeyError(f"Media item with ID {media_id} not found.")
-        
-        del self.media[media_id]
-        self._save_data()
+        with self._writing() as log:
+            if media_id not in self.media:
+                raise KeyError(f"Media item with ID {media_id} not found.")
+            self._index_remove(self.media.pop_record(media_id))
+            log([{"op": "delete", "id": media_id}])
         return True
 
-# Initialize data manager upon module load (best practice)
-data_manager = DataManager()
+class SQLiteDataManager:
+    """DataManager with the same public methods, backed by a SQLite database.
+
+    Items are read from disk on demand instead of being held in memory, and
+    several worker processes can share the database without shared mode.
+    Ids keep DataManager's numbering; use migrate_to_sqlite.py to carry
+    over existing JSON data.
+    """
+
+    def __init__(self, db_file: Optional[str] = None, durability: Optional[str] = None):
+        self.db_file = db_file or DB_FILE
+        # Only "fsync" needs every commit on disk; SQLite's NORMAL mode can lose
+        # the last commits on power failure but never corrupts the database
+        synchronous = "FULL" if (durability or DURABILITY) == "fsync" else "NORMAL"
+        self._store = SQLiteStore(self.db_file, MEDIA_FIELDS, numeric_ids=True,
+                                  synchronous=synchronous, keep_changes=CHANGE_BUFFER_SIZE)
+        # Recent creates and deletes, copied from the database's changes
+        # table. Cursors are "<database instance>.<changes seq>", so they are
+        # the same in every process using the database.
+        self.changes = ChangeFeed()
+        self._instance = self._store.instance()
+        # Last changes seq copied to the feed; None until the first copy
+        self._changes_seq: Optional[int] = None
+        self._changes_lock = threading.Lock()
+        self._refresh_changes()
+
+    def close(self):
+        self._store.close()
+
+    def import_media(self, items: list) -> int:
+        """Bulk-loads existing items with their ids (see migrate_to_sqlite.py)."""
+        return self._store.import_items(items)
+
+    def count(self) -> int:
+        """Returns the number of media items."""
+        return self._store.count()
+
+    def data_version(self) -> Tuple[str, float]:
+        """Returns (tag, last_modified); the tag changes with every committed write."""
+        return self._store.data_version()
+
+    def category_version(self, category: Optional[str] = None) -> str:
+        """Returns a token that changes whenever an item of ``category`` (or, for None, any item) changes."""
+        return self._store.category_version(category)
+
+    @contextmanager
+    def _writing(self):
+        """Runs the block as one transaction, then publishes the committed changes to the feed."""
+        with self._store.transaction() as tx:
+            yield tx
+        if tx.modified:
+            self._refresh_changes()
+
+    def _refresh_changes(self):
+        """Copies the changes committed since the last copy, by any process, to the feed."""
+        with self._changes_lock:
+            rows = self._store.changes_after(-1 if self._changes_seq is None else self._changes_seq,
+                                             CHANGE_BUFFER_SIZE)
+            if self._changes_seq is None or (rows and rows[0][0] != self._changes_seq + 1):
+                # First copy, or the ones in between were dropped from the table
+                start = rows[0][0] - 1 if rows else self._changes_seq or 0
+                self.changes.reset(f"{self._instance:x}.{start}")
+            if rows:
+                self.changes.publish([{"op": "create", "item": item} if item is not None
+                                      else {"op": "delete", "id": item_id} for _, item_id, item in rows],
+                                     [f"{self._instance:x}.{seq}" for seq, _, _ in rows])
+                self._changes_seq = rows[-1][0]
+            elif self._changes_seq is None:
+                self._changes_seq = 0
+
+    def get_changes(self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                    timeout: float = 0.0) -> Tuple[list, str]:
+        """Same contract as DataManager.get_changes."""
+        return self.changes.read(cursor, limit, timeout, self._refresh_changes)
+
+    def create_media(self, data: Dict[str, str]) -> Dict[str, Any]:
+        """Creates a new media item, assigns an ID, and saves data."""
+        validate_media(data)
+        with self._writing() as tx:
+            return tx.insert({field: data[field] for field in MEDIA_FIELDS})
+
+    def seed(self, items: list) -> int:
+        """Same contract as DataManager.seed; the check and inserts are one transaction."""
+        for data in items:
+            validate_media(data)
+        with self._writing() as tx:
+            if tx.count():
+                return 0
+            for data in items:
+                tx.insert({field: data[field] for field in MEDIA_FIELDS})
+        return len(items)
+
+    def apply_batch(self, operations: list) -> list:
+        """Applies a list of create/delete operations atomically in one transaction.
+
+        Same contract as DataManager.apply_batch.
+        """
+        with self._writing() as tx:
+            results = check_batch(operations, tx.exists)
+            for operation, result in zip(operations, results):
+                if operation["op"] == "create":
+                    data = operation["data"]
+                    new_media = tx.insert({field: data[field] for field in MEDIA_FIELDS})
+                    result.update(status=201, item=new_media)
+                else:
+                    media_id = str(operation["id"])
+                    tx.delete(media_id)
+                    result.update(status=200, id=media_id)
+        return results
+
+    def delete_media(self, media_id: str) -> bool:
+        """Deletes a media item by its ID."""
+        with self._writing() as tx:
+            if not tx.delete(media_id):
+                raise KeyError(f"Media item with ID {media_id} not found.")
+        return True
+
+    def get_all_media(self) -> list:
+        """Returns a list of all media items."""
+        return self._store.list_items()
+
+    def iter_media(self, category: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yields media items one at a time, reading them from the database in chunks."""
+        return self._store.iter_items(category)
+
+    def get_media_by_id(self, media_id: str) -> Dict[str, Any]:
+        """Returns a single media item by its ID."""
+        item = self._store.get(media_id)
+        if item is None:
+            raise KeyError(f"Media item with ID {media_id} not found.")
+        return item
+
+    def get_media_by_category(self, category: str) -> list:
+        """Returns a list of media items in a specific category."""
+        if category not in CATEGORIES:
+            return []
+        return self._store.list_items(category)
+
+    def get_media_page(self, category: Optional[str] = None, sort: str = "id",
+                       limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+        """Returns one page of media and the next-page cursor; sorting and paging run in SQL."""
+        return self._store.page(category, sort, limit, cursor)
+
+    def search_media_by_name(self, name: str) -> list:
+        """Searches for media items with an exact (case-insensitive) name match."""
+        return self._store.find_by_name(name)
+
+    def search_media(self, query: str, limit: int = 10) -> list:
+        """Ranked, typo-tolerant search over name and author; best match first."""
+        return self._store.search(query, limit)
+
+    def suggest_media(self, prefix: str, limit: int = 10) -> list:
+        """Most frequent names and authors starting with ``prefix``, as (text, count) pairs."""
+        return self._store.suggest(prefix, limit)
+
+
+def open_data_manager(engine: Optional[str] = None):
+    """Creates the manager for a storage engine name ("json" or "sqlite")."""
+    engine = engine or STORAGE_ENGINE
+    if engine == "json":
+        return DataManager()
+    if engine == "sqlite":
+        return SQLiteDataManager()
+    raise ValueError(f"Unknown storage engine '{engine}'. Must be one of: json, sqlite")
+
+def _open_default_manager():
+    """Opens the configured engine and seeds it if it is empty."""
+    manager = open_data_manager()
+    # Add initial data if the file was empty
+    manager.seed([
+        {"Name": "The Martian", "Publication date": "2011", "Author": "Andy Weir", "Category": "Book"},
+        {"Name": "Dune", "Publication date": "2021", "Author": "Denis Villeneuve", "Category": "Film"},
+        {"Name": "Time Magazine", "Publication date": "2023", "Author": "Various", "Category": "Magazine"},
+    ])
+    return manager
+
+
+class LazyDataManager:
+    """Stands in for a manager that is only opened when first used.
+
+    Attribute access is forwarded to the real manager, which is created by
+    ``factory`` on the first access (exactly once, even under concurrency).
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._manager = None
+        self._init_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._manager is not None
+
+    def _get(self):
+        if self._manager is None:
+            with self._init_lock:
+                if self._manager is None:
+                    self._manager = self._factory()
+        return self._manager
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
 
-# Add initial data if the file was empty
-if not data_manager.media:
-    data_manager.create_media({"Name": "The Martian", "Publication date": "2011", "Author": "Andy Weir", "Category": "Book"})
-    data_manager.create_media({"Name": "Dune", "Publication date": "2021", "Author": "Denis Villeneuve", "Category": "Film"})
-    data_manager.create_media({"Name": "Time Magazine", "Publication date": "2023", "Author": "Various", "Category": "Magazine"})
\ No newline at end of file
+# Importing this module must stay cheap: the data is read (and seeded) on
+# the first request rather than at import time
+data_manager = LazyDataManager(_open_default_manager)
@@ -0,0 +1,41 @@
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to a lock that only covers this process
+    fcntl = None
+
+
+class FileLock:
+    """Advisory lock shared by every process that opens the same lock file.
+
+    Uses flock(), so it is released automatically if a process dies while
+    holding it. Where fcntl is unavailable it degrades to a process-local
+    lock, which is enough for single-process servers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.Lock()
+
+    @contextmanager
+    def _locked(self, mode):
+        if fcntl is None:
+            with self._local:
+                yield
+            return
+        with open(self.path, 'a') as f:
+            fcntl.flock(f.fileno(), mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def shared(self):
+        """Context manager for reading: excludes writers, not other readers."""
+        return self._locked(fcntl.LOCK_SH if fcntl else None)
+
+    def exclusive(self):
+        """Context manager for writing: excludes everyone else."""
+        return self._locked(fcntl.LOCK_EX if fcntl else None)
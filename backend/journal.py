@@ -0,0 +1,207 @@
+import json
+import os
+import shutil
+import threading
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+# Durability modes:
+#   "fsync"    - a write returns once its group has been fsynced
+#   "interval" - a write returns once handed to the OS; a background thread
+#                fsyncs every sync_interval_ms (that much may be lost on a crash)
+#   "os"       - a write returns once handed to the OS; fsync is left to the OS
+DURABILITY_MODES = ("fsync", "interval", "os")
+
+
+class _Group:
+    """Records queued by concurrent writers that will be committed together."""
+    __slots__ = ('chunks', 'done', 'error')
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[Exception] = None
+
+
+class Journal:
+    """Append-only log of media mutations, stored as one JSON record per line.
+
+    Concurrent appends are group-committed: while one writer is flushing, the
+    others queue their records, and the next writer to run flushes the whole
+    queue with a single write (and a single fsync in "fsync" mode).
+    """
+
+    def __init__(self, path: str, durability: str = "fsync", sync_interval_ms: int = 100):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Invalid durability mode. Must be one of: {', '.join(DURABILITY_MODES)}")
+        self.path = path
+        self.durability = durability
+        self.sync_interval_ms = sync_interval_ms
+        self._file = None
+        # Serializes file I/O (writes, fsync, close and rotation)
+        self._io_lock = threading.Lock()
+        # Guards the open group and the leader flag
+        self._cond = threading.Condition()
+        self._group = _Group()
+        self._flushing = False
+        self._syncer: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        if durability == "interval":
+            self._syncer = threading.Thread(target=self._sync_loop, name="media-log-syncer", daemon=True)
+            self._syncer.start()
+
+    def _open(self):
+        if self._file is None:
+            # Unbuffered O_APPEND: each commit is one write() at the end of the
+            # file, even when several processes append to the same log
+            self._file = open(self.path, 'ab', buffering=0)
+        return self._file
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Appends a single record; returns according to the durability mode."""
+        self.append_many([record])
+
+    def append_many(self, records: List[Dict[str, Any]]) -> None:
+        """Appends several records as one unit; returns according to the durability mode."""
+        self.wait(self.submit(records))
+
+    def submit(self, records: List[Dict[str, Any]]) -> _Group:
+        """Queues records for the next group commit without waiting for it.
+
+        Records are written in submission order, so callers that need the log
+        to follow the order of their in-memory changes can submit while still
+        holding their own lock and wait() after releasing it.
+        """
+        chunk = ''.join(map(self.encode, records))
+        with self._cond:
+            group = self._group
+            group.chunks.append(chunk)
+        return group
+
+    def wait(self, group: _Group) -> None:
+        """Blocks until a submitted group is committed; re-raises its write error."""
+        with self._cond:
+            while not group.done:
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+                # Become the leader and commit everything queued so far. A group
+                # that is neither done nor being flushed is always the open one.
+                self._flushing = True
+                self._group = _Group()
+                self._cond.release()
+                try:
+                    self._commit(group)
+                finally:
+                    self._cond.acquire()
+                    self._flushing = False
+                    group.done = True
+                    self._cond.notify_all()
+        if group.error is not None:
+            raise group.error
+
+    def _commit(self, group: _Group) -> None:
+        try:
+            with self._io_lock:
+                f = self._open()
+                f.write(''.join(group.chunks).encode('utf-8'))
+                if self.durability == "fsync":
+                    os.fsync(f.fileno())
+        except (IOError, OSError) as e:
+            group.error = e
+
+    def _sync_loop(self) -> None:
+        """Background fsync for "interval" mode."""
+        while not self._closed.wait(self.sync_interval_ms / 1000):
+            self.sync()
+
+    def sync(self) -> None:
+        """Forces everything written so far to disk."""
+        with self._io_lock:
+            if self._file is None:
+                return
+            # fsync a duplicate descriptor so writers are not blocked meanwhile
+            fd = os.dup(self._file.fileno())
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def size(self) -> int:
+        """Returns the current size of the log file in bytes."""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            if self.durability != "os":
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def reopen(self) -> None:
+        """Closes the append handle so the next write reopens the log by path."""
+        with self._io_lock:
+            self._close_file()
+
+    def close(self) -> None:
+        """Syncs and closes the log file and stops the background syncer."""
+        self._closed.set()
+        with self._io_lock:
+            self._close_file()
+
+    def rotate(self, archive_path: str) -> None:
+        """Moves the current log to archive_path so new records go to a fresh file.
+
+        If archive_path already exists (an earlier compaction did not finish),
+        the current log is appended to it instead so that no record is lost.
+        """
+        with self._io_lock:
+            self._close_file()
+            if not os.path.exists(self.path):
+                return
+            if not os.path.exists(archive_path):
+                os.replace(self.path, archive_path)
+                return
+            with open(self.path, 'rb') as src, open(archive_path, 'ab') as dst:
+                shutil.copyfileobj(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.remove(self.path)
+
+    @staticmethod
+    def encode(record: Dict[str, Any]) -> str:
+        """Returns a record as the line it is stored as (ASCII, so its length is its size in bytes)."""
+        return json.dumps(record, separators=(',', ':')) + '\n'
+
+    @staticmethod
+    def replay(path: str, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yields the records stored in a log file from ``offset`` on, in write order.
+
+        A torn final line (left by a crash mid-write) is discarded and
+        truncated away so that later appends start on a clean boundary.
+        """
+        for _, record in Journal.entries(path, offset):
+            yield record
+
+    @staticmethod
+    def entries(path: str, offset: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Like replay(), but yields (offset just past the record, record)."""
+        if not os.path.exists(path):
+            return
+        good_offset = offset
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                good_offset += len(raw)
+                yield good_offset, record
+        if good_offset < os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(good_offset)
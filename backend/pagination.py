@@ -0,0 +1,210 @@
+import base64
+import heapq
+import json
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(sort: str, key: Tuple) -> str:
+    """Packs the sort order and the last key of a page into an opaque token."""
+    raw = json.dumps({"sort": sort, "key": list(key)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Reverses encode_cursor; raises ValueError for anything malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(payload["sort"], str) or not isinstance(payload["key"], list):
+            raise ValueError
+        return payload
+    except (ValueError, KeyError, TypeError, UnicodeError):
+        raise ValueError("Invalid cursor.")
+
+
+def parse_limit(raw: Optional[str]) -> int:
+    """Validates a ?limit= value and clamps it to MAX_PAGE_SIZE."""
+    if raw is None or raw == '':
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise ValueError("'limit' must be an integer.")
+    if limit < 1:
+        raise ValueError("'limit' must be at least 1.")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def _get_field(item: Dict[str, Any], field: str) -> Any:
+    return item.get(field, "")
+
+
+def paginate(items: Iterable[Any], fields: Dict[str, Any], sort: str = "id",
+             limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+             id_key: Callable[[str], Any] = str, id_field: Any = "id",
+             get: Callable[[Any, Any], Any] = _get_field) -> Tuple[List[Any], Optional[str]]:
+    """Returns one page of items in a stable order, plus the cursor for the next page.
+
+    ``fields`` maps public sort names to item keys; ``id`` is always
+    accepted and a leading ``-`` reverses the order. Pages are keyset based:
+    the cursor holds the sort key of the last item returned, so items
+    created or deleted between requests never shift later pages.
+
+    Items are dicts by default; other containers (such as record tuples)
+    work by passing their ``id_field`` and a ``get(item, field)`` function.
+    """
+    descending, key = _sort_key(fields, sort, id_key, id_field, get)
+    after = _cursor_key(cursor, sort)
+    candidates = items
+    if after is not None:
+        if descending:
+            candidates = (item for item in items if key(item) < after)
+        else:
+            candidates = (item for item in items if key(item) > after)
+
+    pick = heapq.nlargest if descending else heapq.nsmallest
+    try:
+        page = pick(limit + 1, candidates, key=key)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor.")
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(sort, key(page[-1]))
+    return page, next_cursor
+
+
+def _sort_key(fields: Dict[str, Any], sort: str, id_key: Callable[[str], Any], id_field: Any,
+              get: Callable[[Any, Any], Any]) -> Tuple[bool, Callable[[Any], Tuple]]:
+    """Returns (descending, key function) for a sort name such as "-date"."""
+    descending = sort.startswith('-')
+    name = sort[1:] if descending else sort
+    if name == "id":
+        def key(item):
+            return (id_key(item[id_field]),)
+    elif name in fields:
+        field = fields[name]
+
+        def key(item):
+            return (str(get(item, field)).casefold(), id_key(item[id_field]))
+    else:
+        choices = ', '.join(["id"] + list(fields))
+        raise ValueError(f"Invalid sort field '{name}'. Must be one of: {choices}")
+    return descending, key
+
+
+def _cursor_key(cursor: Optional[str], sort: str) -> Optional[Tuple]:
+    """The sort key a page cursor continues after, or None for the first page."""
+    if not cursor:
+        return None
+    payload = decode_cursor(cursor)
+    if payload["sort"] != sort:
+        raise ValueError("Cursor does not match the requested sort order.")
+    return tuple(payload["key"])
+
+
+def _find(entries: List[Tuple[Tuple, Any]], key: Tuple) -> int:
+    """Position of the entry with ``key``, or where it would go."""
+    # (key,) sorts just before (key, value), and keys are unique per item
+    return bisect_left(entries, (key,))
+
+
+class PageIndex:
+    """Items kept sorted by each sort key, so a page costs O(log N + limit).
+
+    Gives the same pages and cursors as paginate(), without looking at
+    every item per request. A sorted list of (key, value) is built the
+    first time a (category, sort field) pair is asked for, from
+    ``source(category)``, and afterwards kept up to date by add() and
+    remove(), which the owner calls for every change; clear() drops the
+    lists after changes it cannot describe (e.g. another process rewrote
+    the file). ``category_of(item)`` must return the category the way the
+    owner passes it to page(). ``value(item)`` is what page() returns for
+    an item, the item itself by default.
+    """
+
+    def __init__(self, fields: Dict[str, Any], source: Callable[[Optional[str]], Iterable[Any]],
+                 category_of: Callable[[Any], str], id_key: Callable[[str], Any] = str,
+                 id_field: Any = "id", get: Callable[[Any, Any], Any] = _get_field,
+                 value: Optional[Callable[[Any], Any]] = None):
+        self._fields = fields
+        self._source = source
+        self._category_of = category_of
+        self._id_key = id_key
+        self._id_field = id_field
+        self._get = get
+        self._value = value or (lambda item: item)
+        # (category or None, sort name without "-") -> sorted [(key, value)]
+        self._sorted: Dict[Tuple[Optional[str], str], List[Tuple[Tuple, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, name: str) -> Callable[[Any], Tuple]:
+        return _sort_key(self._fields, name, self._id_key, self._id_field, self._get)[1]
+
+    def _entries(self, category: Optional[str], name: str) -> List[Tuple[Tuple, Any]]:
+        """The sorted list for a category and sort name, built on first use; needs _lock."""
+        entries = self._sorted.get((category, name))
+        if entries is None:
+            key = self._key(name)
+            entries = sorted((key(item), self._value(item)) for item in self._source(category))
+            self._sorted[(category, name)] = entries
+        return entries
+
+    def _lists_for(self, item: Any):
+        category = self._category_of(item)
+        for (scope, name), entries in self._sorted.items():
+            if scope is None or scope == category:
+                yield self._key(name)(item), entries
+
+    def add(self, item: Any) -> None:
+        """Adds an item to the lists built so far; adding it twice is harmless."""
+        with self._lock:
+            for key, entries in self._lists_for(item):
+                at = _find(entries, key)
+                if at < len(entries) and entries[at][0] == key:
+                    continue
+                entries.insert(at, (key, self._value(item)))
+
+    def remove(self, item: Any) -> None:
+        """Removes an item from the lists built so far, if it is there."""
+        with self._lock:
+            for key, entries in self._lists_for(item):
+                at = _find(entries, key)
+                if at < len(entries) and entries[at][0] == key:
+                    del entries[at]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sorted.clear()
+
+    def page(self, category: Optional[str] = None, sort: str = "id", limit: int = DEFAULT_PAGE_SIZE,
+             cursor: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+        """Like paginate(): (values of one page of items, cursor for the next page)."""
+        descending, _ = _sort_key(self._fields, sort, self._id_key, self._id_field, self._get)
+        after = _cursor_key(cursor, sort)
+        with self._lock:
+            entries = self._entries(category, sort.lstrip('-'))
+            try:
+                start = 0 if after is None else _find(entries, after)
+            except TypeError:
+                raise ValueError("Invalid cursor.")
+            if descending:
+                # Everything before start sorts before the cursor
+                end = len(entries) if after is None else start
+                picked = entries[max(0, end - limit - 1):end][::-1]
+            else:
+                if start < len(entries) and entries[start][0] == after:
+                    start += 1
+                picked = entries[start:start + limit + 1]
+
+        next_cursor = None
+        if len(picked) > limit:
+            picked = picked[:limit]
+            next_cursor = encode_cursor(sort, picked[-1][0])
+        return [value for _, value in picked], next_cursor
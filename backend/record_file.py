@@ -0,0 +1,538 @@
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .filelock import FileLock
+
+# Record file: a header, then records appended one after another. The header
+# is rewritten in place: "end" is the size of the committed data (anything
+# past it is an interrupted write), "generation" changes with every
+# compaction and "retired" is set on a file that compaction has replaced.
+FILE_MAGIC = b"MEDIAREC"
+FILE_HEADER = struct.Struct(">8sQQQQQQQQQ")
+_Header = namedtuple("_Header", "magic instance generation version modified_ms end live dead checkpoint retired")
+# Each record: state, id length, payload length, then the id (UTF-8) and the
+# item as JSON. Deleting flips the state byte to DELETED (a tombstone); the
+# space is reclaimed by compaction.
+RECORD_HEADER = struct.Struct(">BHI")
+LIVE, DELETED = 1, 0
+# Index file: a header, then one entry per live record, sorted by a hash of
+# the id. It covers the record file up to "covered"; records appended after
+# that are found by scanning the tail and kept in memory until the next
+# checkpoint rewrites the index.
+INDEX_MAGIC = b"MEDIAIDX"
+INDEX_HEADER = struct.Struct(">8sQQQ")
+INDEX_ENTRY = struct.Struct(">16sQ")
+KEY_SIZE = 16
+# Checkpoint once this many records (or an eighth of the indexed ones, if
+# more) are only known from the tail
+CHECKPOINT_RECORDS = 10_000
+# Compact once deleted records take more than half the file and at least this much
+COMPACT_MIN_BYTES = 1024 * 1024
+# New records are written out in chunks of about this size
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _key(item_id: str) -> bytes:
+    return hashlib.blake2b(item_id.encode('utf-8'), digest_size=KEY_SIZE).digest()
+
+
+def _encode(item: Dict[str, Any]) -> bytes:
+    item_id = item["id"].encode('utf-8')
+    payload = _encoder.encode(item).encode('utf-8')
+    return RECORD_HEADER.pack(LIVE, len(item_id), len(payload)) + item_id + payload
+
+
+def _records(mm: mmap.mmap, offset: int, end: int) -> Iterator[Tuple[int, int, int, int]]:
+    """Yields (offset, state, id length, payload length) of each record in [offset, end)."""
+    while offset < end:
+        state, id_size, size = RECORD_HEADER.unpack_from(mm, offset)
+        yield offset, state, id_size, size
+        offset += RECORD_HEADER.size + id_size + size
+
+
+def _map_index(fd: int) -> mmap.mmap:
+    """Maps an index file read-only.
+
+    Its pages are only ever read by binary searches, so read-ahead is turned
+    off where supported: a lookup then brings in just the pages it touches.
+    """
+    index = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, "MADV_RANDOM"):
+        index.madvise(mmap.MADV_RANDOM)
+    return index
+
+
+def _record_id(mm: mmap.mmap, offset: int, id_size: int) -> str:
+    start = offset + RECORD_HEADER.size
+    return mm[start:start + id_size].decode('utf-8')
+
+
+def _write_index_file(path: str, generation: int, covered: int, entries: List[Tuple[bytes, int]]) -> None:
+    """Atomically writes an index of (key, offset) entries for one file generation."""
+    entries.sort()
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, generation, covered, len(entries)))
+        f.write(b"".join(INDEX_ENTRY.pack(key, offset) for key, offset in entries))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+class _Transaction:
+    """Write access handed out by RecordFile.transaction()."""
+
+    def __init__(self, store: 'RecordFile', version: str, end: int):
+        self._store = store
+        # Tag of the file before this transaction and, once committed, after it
+        self.base_version = version
+        self.version = version
+        # (id, item or None) in order, e.g. for a search index
+        self.changes: List[Tuple[str, Optional[Dict[str, Any]]]] = []
+        # Items removed by delete()
+        self.removed: List[Dict[str, Any]] = []
+        self.modified = False
+        # Records added past the committed end: id -> offset, None once deleted again
+        self._appended: Dict[str, Optional[int]] = {}
+        self._end = end
+        # New records not yet written to the file, which holds them up to _written
+        self._buffer = bytearray()
+        self._written = end
+        # Offsets of committed records to turn into tombstones
+        self._tombstones = set()
+
+    def _offset(self, item_id: str) -> Optional[int]:
+        if item_id in self._appended:
+            return self._appended[item_id]
+        offset = self._store._lookup(item_id)
+        return None if offset in self._tombstones else offset
+
+    def exists(self, item_id: str) -> bool:
+        return self._offset(item_id) is not None
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        offset = self._offset(item_id)
+        if offset is None:
+            return None
+        if offset >= self._written:
+            self._flush()
+        if self._written > len(self._store._mm):
+            self._store._remap()
+        return self._store._read(offset)
+
+    def _flush(self) -> None:
+        """Writes the buffered records past the committed end of the file.
+
+        Only the header update at commit makes them part of the data, so a
+        discarded transaction leaves nothing visible behind.
+        """
+        os.pwrite(self._store._fd, self._buffer, self._written)
+        self._written = self._end
+        self._buffer.clear()
+
+    def insert(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Appends an item (replacing one with the same id) and returns it."""
+        self.delete(item["id"])
+        record = _encode(item)
+        self._buffer += record
+        self._appended[item["id"]] = self._end
+        self._end += len(record)
+        if len(self._buffer) >= WRITE_BUFFER_BYTES:
+            self._flush()
+        self.changes.append((item["id"], item))
+        self.modified = True
+        return item
+
+    def delete(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Removes an item and returns it, or None if there was none with that id."""
+        item = self.get(item_id)
+        if item is None:
+            return None
+        if item_id in self._appended:
+            self._appended[item_id] = None
+        else:
+            self._tombstones.add(self._store._lookup(item_id))
+        self.changes.append((item_id, None))
+        self.removed.append(item)
+        self.modified = True
+        return item
+
+
+class RecordFile:
+    """Items stored as records in an append-only file, read through mmap.
+
+    An id -> offset index (a sorted file of id hashes, also memory-mapped)
+    lets a lookup touch only the index pages of a binary search and the
+    bytes of one record, so neither file has to fit in memory. Creates are
+    appended, deletes leave tombstones, and the file is compacted once
+    tombstones take up half of it.
+
+    Any number of threads and processes may share one file: writes take an
+    inter-process lock, and readers notice other processes' writes from the
+    header before answering.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + '.idx'
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(path + '.lock')
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._index: Optional[mmap.mmap] = None
+        self._index_count = 0
+        # Live records past the indexed part of the file: id -> offset
+        self._tail: Dict[str, int] = {}
+        # Offset up to which the file has been indexed or scanned, and the
+        # header checkpoint counter of the index in use
+        self._scanned = 0
+        self._checkpoint = 0
+        with self._file_lock.exclusive():
+            self._open(exclusive=True)
+
+    # --- Opening and catching up ---
+
+    def _header(self) -> _Header:
+        return _Header._make(FILE_HEADER.unpack_from(self._mm, 0))
+
+    def _write_header(self, **changes) -> None:
+        FILE_HEADER.pack_into(self._mm, 0, *self._header()._replace(**changes))
+
+    def _open(self, exclusive: bool) -> None:
+        """Opens (or creates) the file and its index.
+
+        The caller holds the inter-process lock; only with the exclusive one
+        are repairs written (a torn tail cut off, a missing index rebuilt).
+        """
+        self.close()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size == 0 and exclusive:
+            now_ms = int(time.time() * 1000)
+            os.write(self._fd, FILE_HEADER.pack(FILE_MAGIC, random.getrandbits(63), random.getrandbits(63),
+                                                0, now_ms, FILE_HEADER.size, 0, 0, 0, 0))
+            os.fsync(self._fd)
+        self._mm = mmap.mmap(self._fd, 0)
+        header = self._header()
+        if header.magic != FILE_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a media record file.")
+        if exclusive and os.fstat(self._fd).st_size > header.end:
+            # Left over from a write that was never committed
+            self._mm = None
+            os.ftruncate(self._fd, header.end)
+            self._mm = mmap.mmap(self._fd, 0)
+        if not self._load_index():
+            if exclusive:
+                self._write_index(self._live_entries(FILE_HEADER.size))
+            else:
+                self._scan_everything()
+
+    def _load_index(self) -> bool:
+        """Maps the index file and scans the records after it; False if it is missing or stale."""
+        header = self._header()
+        try:
+            fd = os.open(self.index_path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        try:
+            index = _map_index(fd)
+        except ValueError:
+            return False
+        finally:
+            os.close(fd)
+        magic, generation, covered, count = INDEX_HEADER.unpack_from(index, 0)
+        if (magic != INDEX_MAGIC or generation != header.generation or covered > header.end
+                or len(index) != INDEX_HEADER.size + count * INDEX_ENTRY.size):
+            return False
+        self._index, self._index_count = index, count
+        self._checkpoint = header.checkpoint
+        self._tail = {}
+        self._scanned = covered
+        self._scan_tail(header.end)
+        return True
+
+    def _scan_everything(self) -> None:
+        """Works without an index, keeping every record in the tail."""
+        self._index, self._index_count = None, 0
+        self._checkpoint = self._header().checkpoint
+        self._tail = {}
+        self._scanned = FILE_HEADER.size
+        self._scan_tail(self._header().end)
+
+    def _remap(self) -> None:
+        """Maps the file again after it grew; old maps stay valid for readers still using them."""
+        self._mm = mmap.mmap(self._fd, 0)
+
+    def _scan_tail(self, end: int) -> None:
+        if end > len(self._mm):
+            self._remap()
+        mm = self._mm
+        for offset, state, id_size, _ in _records(mm, self._scanned, end):
+            if state == LIVE:
+                self._tail[_record_id(mm, offset, id_size)] = offset
+        self._scanned = end
+
+    def _refresh(self, exclusive: bool = False) -> None:
+        """Picks up writes, checkpoints and compactions made by other processes.
+
+        The caller holds self._lock, and the exclusive inter-process lock if
+        it says so. Only the header is read when nothing changed.
+        """
+        if self._mm is None:
+            raise ValueError(f"{self.path} is closed.")
+        header = self._header()
+        if not header.retired and header.checkpoint == self._checkpoint and header.end == self._scanned:
+            return
+        if exclusive:
+            self._catch_up(header, exclusive)
+        else:
+            with self._file_lock.shared():
+                self._catch_up(self._header(), exclusive)
+
+    def _catch_up(self, header: _Header, exclusive: bool) -> None:
+        if header.retired:
+            self._open(exclusive)
+        elif header.checkpoint != self._checkpoint:
+            if not self._load_index():
+                self._scan_everything()
+        else:
+            self._scan_tail(header.end)
+
+    def close(self) -> None:
+        """Releases the file. Maps are left to the garbage collector, as iterators may still read them."""
+        with self._lock:
+            self._mm = self._index = None
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    # --- Index ---
+
+    def _indexed_offsets(self, key: bytes) -> Iterator[int]:
+        """Yields the offsets the index holds for an id hash (normally at most one)."""
+        index, base, size = self._index, INDEX_HEADER.size, INDEX_ENTRY.size
+        lo, hi = 0, self._index_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            position = base + mid * size
+            if index[position:position + KEY_SIZE] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        while lo < self._index_count:
+            entry_key, offset = INDEX_ENTRY.unpack_from(index, base + lo * size)
+            if entry_key != key:
+                return
+            yield offset
+            lo += 1
+
+    def _lookup(self, item_id: str) -> Optional[int]:
+        """Returns the offset of the live record for item_id, if there is one."""
+        mm = self._mm
+        offset = self._tail.get(item_id)
+        if offset is not None and mm[offset] == LIVE:
+            return offset
+        for offset in self._indexed_offsets(_key(item_id)):
+            state, id_size, _ = RECORD_HEADER.unpack_from(mm, offset)
+            # Different ids can share a hash; the record holds the real one
+            if state == LIVE and _record_id(mm, offset, id_size) == item_id:
+                return offset
+        return None
+
+    def _read(self, offset: int) -> Optional[Dict[str, Any]]:
+        """Returns the item stored at offset, or None if it was deleted."""
+        state, id_size, size = RECORD_HEADER.unpack_from(self._mm, offset)
+        if state != LIVE:
+            return None
+        start = offset + RECORD_HEADER.size + id_size
+        return json.loads(self._mm[start:start + size])
+
+    def _live_entries(self, offset: int) -> List[Tuple[bytes, int]]:
+        """Returns (key, offset) of every live record from offset on."""
+        mm = self._mm
+        return [(_key(_record_id(mm, position, id_size)), position)
+                for position, state, id_size, _ in _records(mm, offset, self._header().end) if state == LIVE]
+
+    def _write_index(self, entries: List[Tuple[bytes, int]]) -> None:
+        """Replaces the index with the given entries, covering the whole file.
+
+        The caller holds the exclusive lock. Bumping the checkpoint counter
+        tells other processes to load the new index.
+        """
+        header = self._header()
+        _write_index_file(self.index_path, header.generation, header.end, entries)
+        self._write_header(checkpoint=header.checkpoint + 1)
+        self._mm.flush()
+        self._load_index()
+
+    def checkpoint(self) -> None:
+        """Folds the records appended since the last index write into the index."""
+        with self._lock, self._file_lock.exclusive():
+            self._refresh(exclusive=True)
+            self._checkpoint_locked()
+
+    def _checkpoint_locked(self) -> None:
+        mm, base = self._mm, INDEX_HEADER.size
+        entries = []
+        if self._index is not None:
+            entries = [(key, offset) for key, offset in
+                       INDEX_ENTRY.iter_unpack(self._index[base:base + self._index_count * INDEX_ENTRY.size])
+                       if mm[offset] == LIVE]
+        entries.extend((_key(item_id), offset) for item_id, offset in self._tail.items() if mm[offset] == LIVE)
+        self._write_index(entries)
+
+    def compact(self) -> None:
+        """Rewrites the file without deleted records, together with a fresh index."""
+        with self._lock, self._file_lock.exclusive():
+            self._refresh(exclusive=True)
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        old, header = self._mm, self._header()
+        generation = random.getrandbits(63)
+        tmp_file = self.path + '.tmp'
+        entries = []
+        with open(tmp_file, 'wb') as f:
+            f.write(FILE_HEADER.pack(*header._replace(generation=generation, end=0, dead=0,
+                                                      checkpoint=0, retired=0)))
+            offset = FILE_HEADER.size
+            for position, state, id_size, size in _records(old, FILE_HEADER.size, header.end):
+                if state == LIVE:
+                    length = RECORD_HEADER.size + id_size + size
+                    f.write(old[position:position + length])
+                    entries.append((_key(_record_id(old, position, id_size)), offset))
+                    offset += length
+            # Commit the end only once every record is in place
+            f.seek(0)
+            f.write(FILE_HEADER.pack(*header._replace(generation=generation, end=offset, dead=0,
+                                                      checkpoint=0, retired=0)))
+            f.flush()
+            os.fsync(f.fileno())
+        # The new index goes first: a process opening the new file finds it ready
+        _write_index_file(self.index_path, generation, offset, entries)
+        os.replace(tmp_file, self.path)
+        # Processes still reading the old file see this and reopen
+        FILE_HEADER.pack_into(old, 0, *header._replace(retired=1))
+        old.flush()
+        self._open(exclusive=True)
+
+    def _maintain(self) -> None:
+        """Compacts or checkpoints after a write if it is due; the caller holds the exclusive lock."""
+        header = self._header()
+        if header.dead >= COMPACT_MIN_BYTES and header.dead * 2 > header.end:
+            self._compact_locked()
+        elif len(self._tail) >= max(CHECKPOINT_RECORDS, self._index_count // 8):
+            self._checkpoint_locked()
+
+    # --- Writes ---
+
+    @contextmanager
+    def transaction(self) -> Iterator[_Transaction]:
+        """Runs the block as one write; an exception discards it.
+
+        New records reach the disk before they are committed. Tombstones are
+        written after that, so a crash in between can keep items a batch was
+        deleting, but never loses the ones it created.
+        """
+        with self._lock, self._file_lock.exclusive():
+            self._refresh(exclusive=True)
+            header = self._header()
+            tx = _Transaction(self, self._tag(header), header.end)
+            yield tx
+            if not tx.modified:
+                return
+            tx._flush()
+            os.fsync(self._fd)
+            if tx._end > len(self._mm):
+                self._remap()
+            mm = self._mm
+            created = {item_id: offset for item_id, offset in tx._appended.items() if offset is not None}
+            self._tail.update(created)
+            dead = header.dead
+            for offset in tx._tombstones:
+                mm[offset] = DELETED
+                _, id_size, size = RECORD_HEADER.unpack_from(mm, offset)
+                dead += RECORD_HEADER.size + id_size + size
+            self._write_header(version=header.version + 1, modified_ms=int(time.time() * 1000), end=tx._end,
+                               live=header.live + len(created) - len(tx._tombstones), dead=dead)
+            self._scanned = tx._end
+            mm.flush()
+            tx.version = self._tag(self._header())
+            self._maintain()
+
+    def import_items(self, items: Iterable[Dict[str, Any]]) -> int:
+        """Bulk-loads existing items, keeping their ids; returns how many were written."""
+        count = 0
+        with self.transaction() as tx:
+            for item in items:
+                tx.insert(dict(item, id=str(item["id"])))
+                count += 1
+        return count
+
+    # --- Reads ---
+
+    @staticmethod
+    def _tag(header: _Header) -> str:
+        return f"{header.instance:x}.{header.version}"
+
+    def version(self) -> str:
+        """Token that changes with every committed write, from any process."""
+        return self.data_version()[0]
+
+    def data_version(self) -> Tuple[str, float]:
+        """Returns (tag, last_modified) for conditional requests; the same in every process."""
+        with self._lock:
+            self._refresh()
+            header = self._header()
+            return self._tag(header), header.modified_ms / 1000
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._header().live
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the file size, dead bytes, and how many records are live, indexed or only in the tail."""
+        with self._lock:
+            self._refresh()
+            header = self._header()
+            return {"file_bytes": header.end, "dead_bytes": header.dead, "live": header.live,
+                    "indexed": self._index_count, "unindexed": len(self._tail)}
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            offset = self._lookup(item_id)
+            return None if offset is None else self._read(offset)
+
+    def get_many(self, ids: Sequence[str]) -> List[Dict[str, Any]]:
+        """Returns the items with the given ids, in that order; missing ids are skipped."""
+        items = (self.get(item_id) for item_id in ids)
+        return [item for item in items if item is not None]
+
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """Yields every item in file order (creation order; compaction keeps it).
+
+        Reads the file as of the call: items created later are not included.
+        Items deleted meanwhile are skipped, unless the file was compacted
+        in between.
+        """
+        with self._lock:
+            self._refresh()
+            mm, end = self._mm, self._header().end
+        for offset, state, id_size, size in _records(mm, FILE_HEADER.size, end):
+            if state == LIVE:
+                start = offset + RECORD_HEADER.size + id_size
+                yield json.loads(mm[start:start + size])
@@ -0,0 +1,97 @@
+import operator
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Public item keys, in record order
+ITEM_KEYS = ("id", "Name", "Publication date", "Author", "Category")
+# Position of each item key in a record
+FIELD_POSITIONS = {key: position for position, key in enumerate(ITEM_KEYS)}
+ID, NAME, DATE, AUTHOR, CATEGORY = range(len(ITEM_KEYS))
+
+# A media item stored as a plain tuple in ITEM_KEYS order. A tuple of
+# strings is far smaller than the equivalent dict, and the garbage
+# collector stops tracking it, so a large catalogue does not slow down
+# every collection.
+Record = Tuple[str, ...]
+
+_first = operator.itemgetter(ID)
+
+
+def _intern(value: Any) -> Any:
+    """Interns strings, so values repeated across items share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def make_record(item: Dict[str, Any]) -> Record:
+    """Converts an item dict to a record."""
+    # Dates, authors and categories repeat a lot; names and ids rarely do
+    return (item["id"], item["Name"], _intern(item["Publication date"]),
+            _intern(item["Author"]), _intern(item["Category"]))
+
+
+def record_to_dict(record: Record) -> Dict[str, Any]:
+    """Builds the public (JSON) form of a record."""
+    return dict(zip(ITEM_KEYS, record))
+
+
+class MediaRecords(MutableMapping):
+    """Mapping of id -> item that holds the items as records.
+
+    Reading an item builds a fresh dict, so only items actually returned
+    are materialized; record() and records() give the stored records for
+    scans inside the manager. Assigning an item dict stores it as a record.
+    """
+
+    def __init__(self, records: Optional[Dict[str, Record]] = None):
+        self._records: Dict[str, Record] = {} if records is None else records
+
+    @classmethod
+    def from_items(cls, items: Dict[str, Dict[str, Any]]) -> "MediaRecords":
+        """Builds the mapping from item dicts by id, e.g. a JSON snapshot."""
+        return cls({media_id: make_record(item) for media_id, item in items.items()})
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Record]) -> "MediaRecords":
+        """Builds the mapping from records, e.g. those returned by rows()."""
+        rows = list(rows)
+        return cls(dict(zip(map(_first, rows), rows)))
+
+    def rows(self) -> List[Record]:
+        """Returns every record, e.g. for a snapshot."""
+        return list(self._records.values())
+
+    def __getitem__(self, media_id: str) -> Dict[str, Any]:
+        return record_to_dict(self._records[media_id])
+
+    def __setitem__(self, media_id: str, item) -> None:
+        self._records[media_id] = item if type(item) is tuple else make_record(item)
+
+    def __delitem__(self, media_id: str) -> None:
+        del self._records[media_id]
+
+    def __contains__(self, media_id) -> bool:
+        return media_id in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def record(self, media_id: str) -> Record:
+        return self._records[media_id]
+
+    def records(self):
+        """Returns a view of the stored records."""
+        return self._records.values()
+
+    def pop_record(self, media_id: str) -> Optional[Record]:
+        """Removes and returns the record for media_id, or None if there is none."""
+        return self._records.pop(media_id, None)
+
+    def copy(self) -> "MediaRecords":
+        return MediaRecords(dict(self._records))
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {media_id: record_to_dict(record) for media_id, record in self._records.items()}
@@ -0,0 +1,94 @@
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from flask import Response, make_response, request
+
+from .streaming import wants_ndjson
+
+# Upper bound on the encoded bodies kept by a ResponseCache
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ResponseCache:
+    """LRU cache of encoded response bodies, bounded by their total size.
+
+    Every entry remembers the data version it was encoded from; a lookup
+    with a different version is a miss, so entries go stale exactly when the
+    data they were built from changes (and are replaced or evicted later).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable, version: Any) -> Optional[bytes]:
+        """Returns the body cached for key if it was encoded at this version."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: Any, body: bytes) -> None:
+        """Stores a body, evicting the least recently used ones to stay within max_bytes."""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old[1])
+            self._entries[key] = (version, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss/eviction counters and the current number and size of entries."""
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._size)
+
+
+def cached_response(cache: ResponseCache, get_version: Callable[..., Any]):
+    """Decorator serving a GET view's JSON body from ``cache`` while its data is unchanged.
+
+    ``get_version`` is called with the view's arguments and returns a token
+    that changes whenever the data behind the response does (for example
+    the version of one category). Entries are keyed by path and query
+    string. NDJSON streams are passed through uncached.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if wants_ndjson():
+                return view(*args, **kwargs)
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            # Read before the view runs: if a write lands meanwhile, the body
+            # is stored under the older version and the next lookup misses
+            version = get_version(*args, **kwargs)
+            body = cache.get(key, version)
+            if body is not None:
+                response = Response(body, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                cache.put(key, version, response.get_data())
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
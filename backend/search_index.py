@@ -0,0 +1,205 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+from .suggest_index import SuggestIndex
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Prefix expansions considered per query term
+MAX_PREFIX_EXPANSIONS = 50
+# Best trigram-overlap candidates verified by edit distance per query term
+MAX_FUZZY_CANDIDATES = 16
+# Relative weight of a match found by prefix or by edit distance
+PREFIX_WEIGHT = 0.7
+FUZZY_WEIGHT = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into casefolded word tokens."""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def trigrams(token: str) -> set:
+    """Returns the padded character trigrams of a token."""
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def within_distance(a: str, b: str, max_dist: int) -> bool:
+    """True if a and b are at most max_dist edits apart.
+
+    Edits are insertions, deletions, substitutions and transpositions of
+    adjacent characters (optimal string alignment distance).
+    """
+    if abs(len(a) - len(b)) > max_dist:
+        return False
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > max_dist:
+            return False
+        before, previous = previous, current
+    return previous[-1] <= max_dist
+
+
+def max_typos(token: str) -> int:
+    """Number of edits tolerated for a query token of this length."""
+    if len(token) < 4:
+        return 0
+    return 1 if len(token) < 8 else 2
+
+
+class SearchIndex:
+    """Incrementally maintained inverted index with prefix and typo-tolerant lookup.
+
+    Documents are added as (text, weight) pairs, one per field, e.g.
+    ``[(item["Name"], 2.0), (item["Author"], 1.0)]``. The field texts
+    themselves are also kept in a SuggestIndex, for typeahead completions.
+    """
+
+    def __init__(self):
+        # token -> {doc_id: summed field weight}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        # doc_id -> tokens it was indexed under (needed for removal)
+        self._doc_tokens: Dict[str, Tuple[str, ...]] = {}
+        # trigram -> tokens containing it, for fuzzy candidates
+        self._grams: Dict[str, set] = {}
+        # Sorted vocabulary, for prefix expansion
+        self._vocab: List[str] = []
+        # doc_id -> its field texts, completed by suggest()
+        self._doc_texts: Dict[str, Tuple[str, ...]] = {}
+        self._completions = SuggestIndex()
+        self._bulk_loading = False
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def add(self, doc_id: str, fields: Iterable[Tuple[str, float]]) -> None:
+        """Indexes a document; re-adding an existing id replaces it."""
+        if doc_id in self._doc_tokens:
+            self.remove(doc_id)
+        weights: Dict[str, float] = {}
+        texts = []
+        for text, weight in fields:
+            texts.append(text)
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0.0) + weight
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._add_token(token)
+            postings[doc_id] = weight
+        self._doc_tokens[doc_id] = tuple(weights)
+        self._doc_texts[doc_id] = tuple(texts)
+        if not self._bulk_loading:
+            for text in texts:
+                self._completions.add(text)
+
+    def remove(self, doc_id: str) -> None:
+        """Removes a document from the index (no-op if it is absent)."""
+        for token in self._doc_tokens.pop(doc_id, ()):
+            postings = self._postings[token]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[token]
+                self._remove_token(token)
+        for text in self._doc_texts.pop(doc_id, ()):
+            self._completions.remove(text)
+
+    def _add_token(self, token: str) -> None:
+        if self._bulk_loading:
+            return
+        insort(self._vocab, token)
+        for gram in trigrams(token):
+            self._grams.setdefault(gram, set()).add(token)
+
+    def _remove_token(self, token: str) -> None:
+        del self._vocab[bisect_left(self._vocab, token)]
+        for gram in trigrams(token):
+            tokens = self._grams[gram]
+            tokens.discard(token)
+            if not tokens:
+                del self._grams[gram]
+
+    def _expand(self, term: str) -> Dict[str, float]:
+        """Vocabulary tokens that may stand for a query term, with match weights."""
+        expansions: Dict[str, float] = {}
+        if term in self._postings:
+            expansions[term] = 1.0
+
+        start = bisect_left(self._vocab, term)
+        for token in self._vocab[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not token.startswith(term):
+                break
+            expansions.setdefault(token, PREFIX_WEIGHT)
+
+        # Only words missing from the vocabulary are treated as possible typos
+        max_dist = max_typos(term)
+        if max_dist and term not in self._postings:
+            grams = trigrams(term)
+            # A single edit changes at most four trigrams (a transposition)
+            needed = max(1, len(grams) - 4 * max_dist)
+            shared: Dict[str, int] = {}
+            for gram in grams:
+                for token in self._grams.get(gram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            candidates = heapq.nlargest(
+                MAX_FUZZY_CANDIDATES,
+                (token for token, count in shared.items()
+                 if count >= needed and abs(len(token) - len(term)) <= max_dist),
+                key=shared.__getitem__)
+            for token in candidates:
+                if token not in expansions and within_distance(term, token, max_dist):
+                    expansions[token] = FUZZY_WEIGHT
+        return expansions
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Returns up to ``limit`` (doc_id, score) pairs, best match first."""
+        total_docs = len(self._doc_tokens)
+        scores: Dict[str, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            term_scores: Dict[str, float] = {}
+            for token, match_weight in self._expand(term).items():
+                postings = self._postings[token]
+                idf = math.log(1 + total_docs / len(postings))
+                for doc_id, field_weight in postings.items():
+                    score = match_weight * field_weight * idf
+                    if score > term_scores.get(doc_id, 0.0):
+                        term_scores[doc_id] = score
+            for doc_id, score in term_scores.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+        return heapq.nlargest(limit, scores.items(), key=lambda pair: pair[1])
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Returns up to ``limit`` (field text, count) pairs starting with ``prefix``, most frequent first."""
+        return self._completions.suggest(prefix, limit)
+
+    def rebuild(self, docs: Iterable[Tuple[str, Iterable[Tuple[str, float]]]]) -> None:
+        """Replaces the whole index with the given (doc_id, fields) pairs.
+
+        The vocabulary structures are built once at the end instead of being
+        updated token by token, which keeps bulk loading linear.
+        """
+        self._postings, self._doc_tokens, self._grams, self._vocab = {}, {}, {}, []
+        self._doc_texts = {}
+        self._bulk_loading = True
+        try:
+            for doc_id, fields in docs:
+                self.add(doc_id, fields)
+        finally:
+            self._bulk_loading = False
+        self._vocab = sorted(self._postings)
+        self._completions.rebuild(text for texts in self._doc_texts.values() for text in texts)
+        for token in self._vocab:
+            for gram in trigrams(token):
+                self._grams.setdefault(gram, set()).add(token)
@@ -0,0 +1,420 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from .search_index import SearchIndex
+
+# Table columns holding item fields, in the order items are built from them
+COLUMNS = ("name", "publication_date", "author", "category")
+# Columns covered by full-text search, with their ranking weights
+SEARCH_COLUMNS = [("name", 2.0), ("author", 1.0)]
+# Sort names accepted by page(), mapped to columns
+SORT_COLUMNS = {"name": "name", "author": "author", "date": "publication_date", "category": "category"}
+# Rows fetched per query while iterating over a whole table
+ITER_CHUNK = 1000
+
+# seq is the rowid: it keeps insertion order and, with numeric ids, is the id.
+# changes holds the latest creates (item as JSON) and deletes (item NULL) in
+# commit order, if the store is asked to keep them.
+# NOCASE indexes serve both the case-insensitive lookups and the sorted pages;
+# {category_key} is the id order within a category ("seq" or "id").
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT,
+    publication_date TEXT,
+    author TEXT,
+    category TEXT
+);
+CREATE INDEX IF NOT EXISTS media_category ON media (category COLLATE NOCASE, {category_key});
+CREATE INDEX IF NOT EXISTS media_name ON media (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL, item TEXT);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('modified_ms', {now_ms});
+INSERT OR IGNORE INTO meta (key, value) VALUES ('instance', {instance});
+"""
+
+
+class _ThreadConnection:
+    """Holds one thread's connection in SQLiteStore's thread-local.
+
+    The thread-local drops it when the thread ends; a finalizer then closes
+    the connection, so short-lived threads do not leave connections behind.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _close_connection(conn: sqlite3.Connection, connections: Set[sqlite3.Connection],
+                      lock: threading.Lock) -> None:
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
+
+class _Transaction:
+    """Write access handed out by SQLiteStore.transaction()."""
+
+    def __init__(self, store: 'SQLiteStore', conn: sqlite3.Connection, version: int):
+        self._store = store
+        self._conn = conn
+        # Database version the transaction started from; committing makes it version + 1
+        self.version = version
+        # (doc_id, item or None) in order, for the search index and the changes table
+        self.changes: List[Tuple[str, Optional[Dict[str, Any]]]] = []
+        # Set by anything that writes; a transaction that wrote nothing is rolled back
+        self.modified = False
+        # Lower-cased categories whose items were added or removed
+        self.categories = set()
+
+    def exists(self, item_id: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM media WHERE id = ?", (item_id,)).fetchone() is not None
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT count(*) FROM media").fetchone()[0]
+
+    def insert(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Adds an item and returns it. With numeric ids the id is assigned here."""
+        values = [item.get(field) for field in self._store.fields]
+        if self._store.numeric_ids:
+            row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'media'").fetchone()
+            seq = (row[0] if row else 0) + 1
+            item = dict(item, id=str(seq))
+        else:
+            seq = None
+        self._conn.execute("INSERT INTO media (seq, id, name, publication_date, author, category) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", [seq, item["id"]] + values)
+        item = self._store._item([item["id"]] + values)
+        self.changes.append((item["id"], item))
+        self.categories.add((values[3] or "").lower())
+        self.modified = True
+        return item
+
+    def delete(self, item_id: str) -> bool:
+        """Removes an item; returns False if there was none with that id."""
+        row = self._conn.execute("SELECT category FROM media WHERE id = ?", (item_id,)).fetchone()
+        if row is None:
+            return False
+        self._conn.execute("DELETE FROM media WHERE id = ?", (item_id,))
+        self.changes.append((item_id, None))
+        self.categories.add((row[0] or "").lower())
+        self.modified = True
+        return True
+
+
+class SQLiteStore:
+    """Media items in a SQLite database in WAL mode, one row per item.
+
+    Only the rows a query needs are read, so the dataset does not have to fit
+    in memory (the full-text index, built on the first search, still does).
+    Any number of threads and processes may share one database file: readers
+    never block, writers are serialized by SQLite.
+
+    ``fields`` names the item keys stored in COLUMNS, so each app gets items
+    in its own shape. With ``numeric_ids`` ids are assigned here as
+    increasing integers (as strings); otherwise callers supply them.
+    ``keep_changes`` is how many of the latest creates and deletes are kept
+    in the changes table (see changes_after), for following them from any
+    process; none by default.
+    """
+
+    def __init__(self, path: str, fields: Sequence[str], numeric_ids: bool = False,
+                 synchronous: str = "FULL", keep_changes: int = 0):
+        self.path = path
+        self.fields = tuple(fields)
+        self.numeric_ids = numeric_ids
+        self.synchronous = synchronous
+        self.keep_changes = keep_changes
+        # One connection per thread, closed when the thread ends; the open
+        # ones are also kept here so close() can reach them
+        self._local = threading.local()
+        self._connections: Set[sqlite3.Connection] = set()
+        self._connections_lock = threading.Lock()
+        # Full-text index, valid while _search_version matches the database
+        self._search = SearchIndex()
+        self._search_lock = threading.Lock()
+        self._search_version: Optional[int] = None
+        # A database created from scratch gets a new instance number, so its
+        # versions never repeat the tags of one that was deleted
+        self._conn().executescript(SCHEMA.format(category_key="seq" if numeric_ids else "id",
+                                                 now_ms=int(time.time() * 1000),
+                                                 instance=random.getrandbits(48)))
+
+    def _conn(self) -> sqlite3.Connection:
+        held = getattr(self._local, "held", None)
+        if held is None:
+            # Autocommit mode: transactions are opened explicitly below
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            held = self._local.held = _ThreadConnection(conn)
+            with self._connections_lock:
+                self._connections.add(conn)
+            # Not a bound method: the finalizer must not keep the store alive
+            weakref.finalize(held, _close_connection, conn, self._connections, self._connections_lock)
+        return held.conn
+
+    def close(self) -> None:
+        """Closes every connection opened by this store."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _item(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """Builds an item from (id, *COLUMNS)."""
+        item = {"id": row[0]}
+        item.update(zip(self.fields, row[1:]))
+        return item
+
+    @staticmethod
+    def _version(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def version(self) -> int:
+        """Counter bumped by every committed write, from any process."""
+        return self._version(self._conn())
+
+    def data_version(self) -> Tuple[str, float]:
+        """Returns (tag, last_modified) for conditional requests; the same in every process."""
+        meta = dict(self._conn().execute(
+            "SELECT key, value FROM meta WHERE key IN ('version', 'modified_ms', 'instance')"))
+        return f"{meta['instance']:x}.{meta['version']}", meta['modified_ms'] / 1000
+
+    def category_version(self, category: Optional[str] = None) -> str:
+        """Token that changes whenever an item of ``category`` (or, for None, any item) changes."""
+        if category is None:
+            return self.data_version()[0]
+        meta = dict(self._conn().execute("SELECT key, value FROM meta WHERE key IN ('instance', ?)",
+                                         ("category:" + category.lower(),)))
+        return f"{meta['instance']:x}.c{meta.get('category:' + category.lower(), 0)}"
+
+    def instance(self) -> int:
+        """Random number picked when the database was created."""
+        return self._conn().execute("SELECT value FROM meta WHERE key = 'instance'").fetchone()[0]
+
+    def changes_after(self, seq: int, limit: int) -> List[Tuple[int, str, Optional[Dict[str, Any]]]]:
+        """Returns up to ``limit`` (seq, id, item or None for a delete) kept in the changes table after ``seq``."""
+        rows = self._conn().execute("SELECT seq, id, item FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                                    (seq, limit))
+        return [(seq, item_id, None if item is None else json.loads(item)) for seq, item_id, item in rows]
+
+    # --- Writes ---
+
+    @contextmanager
+    def transaction(self) -> Iterator[_Transaction]:
+        """Runs the block as one atomic write; an exception rolls it back."""
+        conn = self._conn()
+        # IMMEDIATE takes the write lock up front, so existence checks made
+        # inside the block stay true until commit
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = self._version(conn)
+            tx = _Transaction(self, conn, version)
+            yield tx
+            if not tx.modified:
+                conn.execute("ROLLBACK")
+                return
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'version'", (version + 1,))
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'modified_ms'", (int(time.time() * 1000),))
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, 1) "
+                             "ON CONFLICT (key) DO UPDATE SET value = value + 1",
+                             [("category:" + category,) for category in tx.categories])
+            if self.keep_changes:
+                conn.executemany("INSERT INTO changes (id, item) VALUES (?, ?)",
+                                 [(item_id, None if item is None else json.dumps(item))
+                                  for item_id, item in tx.changes])
+                conn.execute("DELETE FROM changes WHERE seq <= (SELECT max(seq) FROM changes) - ?",
+                             (self.keep_changes,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if tx.changes:
+            self._update_search(version, tx.changes)
+
+    def import_items(self, items: Iterable[Dict[str, Any]]) -> int:
+        """Bulk-loads existing items, keeping their ids; returns how many were added."""
+        def rows():
+            for item in items:
+                seq = int(item["id"]) if self.numeric_ids else None
+                values = [item.get(field) for field in self.fields]
+                tx.categories.add((values[3] or "").lower())
+                yield [seq, str(item["id"])] + values
+
+        with self.transaction() as tx:
+            # Not recorded in tx.changes: the search index is rebuilt instead
+            tx.modified = True
+            return tx._conn.executemany(
+                "INSERT INTO media (seq, id, name, publication_date, author, category) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows()).rowcount
+
+    # --- Reads ---
+
+    def count(self, category: Optional[str] = None) -> int:
+        if category is None:
+            return self._conn().execute("SELECT count(*) FROM media").fetchone()[0]
+        return self._conn().execute("SELECT count(*) FROM media WHERE category = ? COLLATE NOCASE",
+                                    (category,)).fetchone()[0]
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT id, name, publication_date, author, category "
+                                   "FROM media WHERE id = ?", (item_id,)).fetchone()
+        return self._item(row) if row else None
+
+    def get_many(self, ids: Sequence[str]) -> List[Dict[str, Any]]:
+        """Returns the items with the given ids, in that order; missing ids are skipped."""
+        if not ids:
+            return []
+        rows = self._conn().execute(
+            "SELECT id, name, publication_date, author, category FROM media "
+            f"WHERE id IN ({', '.join('?' * len(ids))})", list(ids)).fetchall()
+        found = {row[0]: self._item(row) for row in rows}
+        return [found[item_id] for item_id in ids if item_id in found]
+
+    def list_items(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Returns all items (optionally in a category, matched case-insensitively) in insertion order."""
+        sql = "SELECT id, name, publication_date, author, category FROM media"
+        params: list = []
+        if category is not None:
+            sql += " WHERE category = ? COLLATE NOCASE"
+            params.append(category)
+        return [self._item(row) for row in self._conn().execute(sql + " ORDER BY seq", params)]
+
+    def iter_items(self, category: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Like list_items, but fetches ITER_CHUNK rows at a time.
+
+        No transaction stays open between chunks; items deleted while the
+        caller is iterating are skipped.
+        """
+        sql = "SELECT seq, id, name, publication_date, author, category FROM media WHERE seq > ?"
+        params: list = []
+        if category is not None:
+            sql += " AND category = ? COLLATE NOCASE"
+            params.append(category)
+        sql += " ORDER BY seq LIMIT ?"
+        last = 0
+        while True:
+            rows = self._conn().execute(sql, [last] + params + [ITER_CHUNK]).fetchall()
+            for row in rows:
+                yield self._item(row[1:])
+            if len(rows) < ITER_CHUNK:
+                return
+            last = rows[-1][0]
+
+    def find_by_name(self, name: str, ignore_case: bool = True) -> List[Dict[str, Any]]:
+        """Returns the items with this name in insertion order.
+
+        Case folding is SQLite's NOCASE, which only folds ASCII letters.
+        """
+        sql = ("SELECT id, name, publication_date, author, category FROM media "
+               "WHERE name = ? COLLATE NOCASE")
+        params = [name]
+        if not ignore_case:
+            # Still lets the NOCASE index narrow the rows down first
+            sql += " AND name = ?"
+            params.append(name)
+        return [self._item(row) for row in self._conn().execute(sql + " ORDER BY seq", params)]
+
+    def page(self, category: Optional[str] = None, sort: str = "id", limit: int = DEFAULT_PAGE_SIZE,
+             cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Returns one page of items and the next-page cursor, like pagination.paginate.
+
+        The ordering and the keyset condition run in SQL on the indexes.
+        Text sorts are case-insensitive and break ties by insertion order.
+        """
+        descending = sort.startswith('-')
+        name = sort[1:] if descending else sort
+        if name == "id":
+            keys = ["seq" if self.numeric_ids else "id"]
+        elif name in SORT_COLUMNS:
+            keys = [f"{SORT_COLUMNS[name]} COLLATE NOCASE", "seq"]
+        else:
+            choices = ', '.join(["id"] + list(SORT_COLUMNS))
+            raise ValueError(f"Invalid sort field '{name}'. Must be one of: {choices}")
+
+        where, params = [], []
+        if category is not None:
+            where.append("category = ? COLLATE NOCASE")
+            params.append(category)
+        if cursor:
+            payload = decode_cursor(cursor)
+            if payload["sort"] != sort:
+                raise ValueError("Cursor does not match the requested sort order.")
+            after = payload["key"]
+            if len(after) != len(keys) or not all(type(value) in (str, int) for value in after):
+                raise ValueError("Invalid cursor.")
+            op = '<' if descending else '>'
+            # The bound on the first key alone is redundant, but lets SQLite
+            # seek the index instead of scanning it from the start
+            where.append(f"{keys[0]} {op}= ? AND ({', '.join(keys)}) {op} ({', '.join('?' * len(keys))})")
+            params.extend([after[0]] + after)
+
+        direction = " DESC" if descending else ""
+        sql = (f"SELECT {', '.join(keys)}, id, name, publication_date, author, category FROM media"
+               + (" WHERE " + " AND ".join(where) if where else "")
+               + " ORDER BY " + ", ".join(key + direction for key in keys) + " LIMIT ?")
+        rows = self._conn().execute(sql, params + [limit + 1]).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(sort, rows[-1][:len(keys)])
+        return [self._item(row[len(keys):]) for row in rows], next_cursor
+
+    # --- Full-text search ---
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Ranked, typo-tolerant search over name and author; best match first."""
+        with self._search_lock:
+            self._sync_search()
+            hits = self._search.search(query, limit)
+        return self.get_many([item_id for item_id, _ in hits])
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Most frequent names and authors starting with ``prefix``, as (text, count) pairs."""
+        with self._search_lock:
+            self._sync_search()
+            return self._search.suggest(prefix, limit)
+
+    @staticmethod
+    def _search_fields(values: Sequence[Any]) -> List[Tuple[str, float]]:
+        """Pairs the SEARCH_COLUMNS values of an item with their weights."""
+        return [(value or "", weight) for value, (_, weight) in zip(values, SEARCH_COLUMNS)]
+
+    def _sync_search(self) -> None:
+        """Rebuilds the full-text index if the database changed underneath it."""
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            version = self._version(conn)
+            if version == self._search_version:
+                return
+            rows = conn.execute(f"SELECT id, {', '.join(column for column, _ in SEARCH_COLUMNS)} FROM media")
+            self._search.rebuild((row[0], self._search_fields(row[1:])) for row in rows)
+            self._search_version = version
+        finally:
+            conn.execute("COMMIT")
+
+    def _update_search(self, version: int, changes: List[Tuple[str, Optional[Dict[str, Any]]]]) -> None:
+        """Applies a committed transaction to the index if it was current just before it."""
+        keys = [self.fields[COLUMNS.index(column)] for column, _ in SEARCH_COLUMNS]
+        with self._search_lock:
+            if self._search_version != version:
+                return
+            for item_id, item in changes:
+                if item is None:
+                    self._search.remove(item_id)
+                else:
+                    self._search.add(item_id, self._search_fields([item.get(key) for key in keys]))
+            self._search_version = version + 1
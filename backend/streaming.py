@@ -0,0 +1,57 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from flask import Response, request
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+EVENT_STREAM_MIMETYPE = 'text/event-stream'
+# Lines are grouped into chunks of roughly this size before being sent
+CHUNK_BYTES = 64 * 1024
+
+
+def wants_ndjson() -> bool:
+    """True when the client prefers newline-delimited JSON over a JSON array."""
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def iter_ndjson(items: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Encodes items one per line, yielding them in chunks as they are produced."""
+    chunk, size = [], 0
+    for item in items:
+        line = json.dumps(item, ensure_ascii=False, separators=(',', ':')) + '\n'
+        chunk.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield ''.join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield ''.join(chunk)
+
+
+def ndjson_response(items: Iterable[Dict[str, Any]]) -> Response:
+    """Streams items as application/x-ndjson without building the whole body."""
+    return Response(iter_ndjson(items), mimetype=NDJSON_MIMETYPE)
+
+
+def wants_event_stream() -> bool:
+    """True when the client asked for Server-Sent Events (e.g. a browser EventSource)."""
+    best = request.accept_mimetypes.best_match(['application/json', EVENT_STREAM_MIMETYPE])
+    return best == EVENT_STREAM_MIMETYPE
+
+
+def format_event(data: Any, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """Encodes one Server-Sent Event with a JSON payload."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    return "\n".join(lines) + "\n\n"
+
+
+def event_stream_response(messages: Iterable[str]) -> Response:
+    """Streams already formatted events as text/event-stream, unbuffered by proxies."""
+    return Response(messages, mimetype=EVENT_STREAM_MIMETYPE,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
@@ -0,0 +1,135 @@
+import heapq
+from bisect import bisect_left, insort
+from itertools import groupby
+from typing import Dict, Iterable, List, Tuple
+
+# Largest number of completions a caller may ask for
+MAX_SUGGESTIONS = 20
+# Completions remembered per popular prefix; the slack lets removals shrink
+# a list without recomputing it
+MEMO_SIZE = 2 * MAX_SUGGESTIONS
+# Prefixes matching more keys than this have their top completions memoized;
+# smaller ranges are ranked on every lookup
+MEMO_THRESHOLD = 512
+# Prefixes up to this long are memoized by rebuild() instead of on their
+# first lookup, which would rank a large share of all keys
+WARM_PREFIX_LENGTH = 2
+# Sorts after every character, so bisecting for prefix + _END finds the end of the prefix range
+_END = "\U0010ffff"
+
+
+def normalize(text: str) -> str:
+    """Casefolds text and collapses runs of whitespace to single spaces."""
+    return " ".join(text.casefold().split())
+
+
+class SuggestIndex:
+    """Most frequent completions of a prefix over a changing multiset of texts.
+
+    Texts (e.g. media names and authors) are keyed by their normalized
+    form, counted, and kept in a sorted list, so the keys starting with a
+    prefix are one bisect away. Completions are ranked by how many times
+    the text was added, then alphabetically.
+
+    Ranking a large range on every keystroke would be linear in its size,
+    so prefixes whose range is larger than MEMO_THRESHOLD remember their
+    MEMO_SIZE best keys. add() and remove() update the remembered lists of
+    every prefix of the key they touch, like the top-k lists kept at the
+    nodes of a completion trie.
+    """
+
+    def __init__(self):
+        # Sorted normalized keys
+        self._keys: List[str] = []
+        # key -> [text as first added, count]
+        self._entries: Dict[str, list] = {}
+        # prefix -> its best keys, best first
+        self._memo: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _rank(self, key: str) -> Tuple[int, str]:
+        return -self._entries[key][1], key
+
+    def add(self, text: str) -> None:
+        key = normalize(text)
+        if not key:
+            return
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [text, 0]
+            insort(self._keys, key)
+        entry[1] += 1
+        rank = self._rank(key)
+        for length in range(len(key) + 1):
+            best = self._memo.get(key[:length])
+            if best is None:
+                continue
+            if key in best:
+                best.sort(key=self._rank)
+            elif best and rank < self._rank(best[-1]):
+                # Anything better than the last remembered key belongs in the list
+                best.append(key)
+                best.sort(key=self._rank)
+                del best[MEMO_SIZE:]
+
+    def remove(self, text: str) -> None:
+        key = normalize(text)
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        for length in range(len(key) + 1):
+            best = self._memo.get(key[:length])
+            if best is None or key not in best:
+                continue
+            best.remove(key)
+            # A key still ranked above the last one stays: nothing unlisted can overtake it
+            if entry[1] and best and self._rank(key) < self._rank(best[-1]):
+                best.append(key)
+                best.sort(key=self._rank)
+        if not entry[1]:
+            del self._entries[key]
+            del self._keys[bisect_left(self._keys, key)]
+
+    def rebuild(self, texts: Iterable[str]) -> None:
+        """Replaces the contents with ``texts``, sorting the keys once."""
+        self._entries, self._memo = {}, {}
+        entries = self._entries
+        for text in texts:
+            key = normalize(text)
+            if not key:
+                continue
+            entry = entries.get(key)
+            if entry is None:
+                entries[key] = [text, 1]
+            else:
+                entry[1] += 1
+        self._keys = sorted(entries)
+        for length in range(1, WARM_PREFIX_LENGTH + 1):
+            for prefix, keys in groupby(self._keys, key=lambda key: key[:length]):
+                keys = list(keys)
+                if len(prefix) == length and len(keys) > MEMO_THRESHOLD:
+                    self._memo[prefix] = heapq.nsmallest(MEMO_SIZE, keys, key=self._rank)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Returns up to ``limit`` (text, count) completions of ``prefix``, most frequent first.
+
+        A trailing space in the prefix is kept, so "dune " completes to
+        "Dune Messiah" but not to "Dunes".
+        """
+        key = normalize(prefix)
+        if key and prefix[-1:].isspace():
+            key += " "
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+        best = self._memo.get(key)
+        if best is None or len(best) < limit:
+            start = bisect_left(self._keys, key)
+            end = bisect_left(self._keys, key + _END, start)
+            if end - start <= MEMO_THRESHOLD:
+                best = heapq.nsmallest(limit, self._keys[start:end], key=self._rank)
+            else:
+                best = self._memo[key] = heapq.nsmallest(MEMO_SIZE, self._keys[start:end], key=self._rank)
+        entries = self._entries
+        return [tuple(entries[key]) for key in best[:limit]]
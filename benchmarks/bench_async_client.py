@@ -0,0 +1,99 @@
+# benchmarks/bench_async_client.py
+# Total time to fetch the details of many items one at a time with ApiClient
+# and concurrently with AsyncApiClient.get_many_details, against a local
+# stand-in server that adds LATENCY seconds to every response (as a remote
+# backend would). Run from the project root:
+#     python -m benchmarks.bench_async_client
+
+import asyncio
+import http.client
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from frontend.api_client import ApiClient
+from frontend.async_api_client import AsyncApiClient
+
+PORT = 5097
+BASE_URL = f"http://127.0.0.1:{PORT}/media"
+ITEMS = 200
+LATENCY = 0.02
+CONCURRENCY = [1, 5, 10, 20]
+
+STAND_IN_SERVER = """
+import json, sys, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(float(sys.argv[2]))
+        body = json.dumps({"id": self.path.rsplit("/", 1)[-1], "Name": "Title"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+server = ThreadingHTTPServer(("127.0.0.1", int(sys.argv[1])), Handler)
+server.daemon_threads = True
+server.serve_forever()
+"""
+
+
+def wait_until_up():
+    for _ in range(100):
+        try:
+            http.client.HTTPConnection("127.0.0.1", PORT, timeout=1).request("GET", "/media/1")
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def sequential(ids):
+    with ApiClient(base_url=BASE_URL) as client:
+        return [client.get_media_details(media_id) for media_id in ids]
+
+
+async def fan_out(ids, concurrency):
+    async with AsyncApiClient(BASE_URL, concurrency=concurrency) as client:
+        return await client.get_many_details(ids)
+
+
+def timed(fetch):
+    start = time.perf_counter()
+    items = fetch()
+    assert all("error" not in item for item in items)
+    return time.perf_counter() - start
+
+
+def main():
+    ids = [str(i) for i in range(ITEMS)]
+    server = subprocess.Popen([sys.executable, "-c", STAND_IN_SERVER, str(PORT), str(LATENCY)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up()
+        base = timed(lambda: sequential(ids))
+        print(f"{ITEMS} items, {LATENCY * 1e3:.0f} ms server latency")
+        print(f"{'client':<22} {'total s':>8} {'speedup':>8}")
+        print(f"{'ApiClient (one by one)':<22} {base:>8.2f} {1:>8.2f}")
+        for concurrency in CONCURRENCY:
+            elapsed = timed(lambda: asyncio.run(fan_out(ids, concurrency)))
+            print(f"{f'async, {concurrency} at once':<22} {elapsed:>8.2f} {base / elapsed:>8.2f}")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
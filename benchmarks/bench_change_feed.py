@@ -0,0 +1,138 @@
+# benchmarks/bench_change_feed.py
+# The two halves of following /media/changes instead of reloading.
+# "wake" is the time from the start of DataManager.create_media until each
+# of N long-polling readers (DataManager.get_changes with a timeout, one
+# thread each) has the new event. "apply" is LibraryApp applying one create
+# or delete made elsewhere to a table of R loaded rows (model, local search
+# index and repaint), against "reload": what the GUI did before, showing
+# the whole list again and re-indexing it, not counting the download of
+# the list itself. Needs PyQt6. Run from the project root:
+#     python -m benchmarks.bench_change_feed [rows...]
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt6.QtWidgets import QApplication
+
+from backend.data_manager import DataManager
+from benchmarks.bench_gui_search import make_items
+from frontend.gui import LibraryApp
+
+READERS = [1, 16, 64]
+WRITES = 200
+ROWS = [10_000, 100_000]
+CHANGES = 200
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return [samples[int(len(samples) * q) - 1] * 1e3 for q in (0.5, 0.99, 1.0)]
+
+
+def measure_wake(readers):
+    """Milliseconds from each create to every reader having it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        dm = DataManager(data_file=os.path.join(tmp, 'media.json'), log_file=os.path.join(tmp, 'media.log'),
+                         durability="os")
+        started = {}
+        latencies = []
+        lock = threading.Lock()
+        done = threading.Barrier(readers + 1)
+
+        def follow(cursor):
+            seen = 0
+            while seen < WRITES:
+                events, cursor = dm.get_changes(cursor, timeout=5)
+                now = time.perf_counter()
+                with lock:
+                    latencies.extend(now - started[event["item"]["Name"]] for event in events)
+                seen += len(events)
+            done.wait()
+
+        cursor = dm.get_changes()[1]
+        threads = [threading.Thread(target=follow, args=(cursor,), daemon=True) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for i in range(WRITES):
+            name = f"Item {i}"
+            started[name] = time.perf_counter()
+            dm.create_media({"Name": name, "Publication date": "2000", "Author": "A", "Category": "Book"})
+            # Let every reader go back to waiting, so each write is a wake-up
+            time.sleep(0.002 * readers)
+        done.wait()
+        return latencies
+
+
+class FakeApiClient:
+    """Serves every item in one page; the change feed never has anything."""
+
+    def __init__(self, items):
+        self.items = items
+
+    def get_changes(self, cursor=None, wait=0):
+        time.sleep(wait)
+        return {"changes": [], "cursor": cursor or "c0"}
+
+    def get_media_page(self, category=None, cursor=None):
+        return {"items": self.items, "next_cursor": None}
+
+    def close(self):
+        pass
+
+
+def measure_gui(app, rows):
+    items = make_items(rows)
+    window = LibraryApp(FakeApiClient(items))
+    window.show()
+    deadline = time.monotonic() + 60
+    while len(window.search_index) < rows and time.monotonic() < deadline:
+        app.processEvents()
+    rng = random.Random(7)
+    apply = []
+    next_id = rows + 1
+    for step in range(CHANGES):
+        if step % 2:
+            change = {"op": "delete", "id": rng.choice(window.media_model.loaded_items)["id"]}
+        else:
+            change = {"op": "create", "item": dict(items[rng.randrange(rows)], id=str(next_id))}
+            next_id += 1
+        start = time.perf_counter()
+        window._apply_changes([change])
+        app.processEvents()
+        apply.append(time.perf_counter() - start)
+    reload = []
+    for _ in range(3):
+        start = time.perf_counter()
+        window.load_media(list(window.media_model.loaded_items))
+        app.processEvents()
+        reload.append(time.perf_counter() - start)
+    window.close()
+    return apply, statistics.median(reload) * 1e3
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or ROWS
+    print(f"{'readers':>8} {'wake p50 ms':>12} {'p99 ms':>8} {'max ms':>8}")
+    for readers in READERS:
+        p50, p99, worst = percentiles(measure_wake(readers))
+        print(f"{readers:>8} {p50:>12.2f} {p99:>8.2f} {worst:>8.2f}")
+
+    app = QApplication.instance() or QApplication([])
+    print(f"\n{'rows':>8} {'apply p50 ms':>13} {'p99 ms':>8} {'max ms':>8} {'reload ms':>10}")
+    for rows in sizes:
+        apply, reload = measure_gui(app, rows)
+        p50, p99, worst = percentiles(apply)
+        print(f"{rows:>8} {p50:>13.2f} {p99:>8.2f} {worst:>8.2f} {reload:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
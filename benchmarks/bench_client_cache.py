@@ -0,0 +1,91 @@
+# benchmarks/bench_client_cache.py
+# Network calls and wall time for a simulated GUI session (switching between
+# the full list and the category filters, opening item details, and now and
+# then creating an item) with and without ApiClient's ClientCache. The
+# server is serve.py with one worker over a copy of media_data.json. Run
+# from the project root:
+#     python -m benchmarks.bench_client_cache
+
+import http.client
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from frontend.api_client import ApiClient
+from frontend.client_cache import ClientCache
+
+PORT = 5096
+BASE_URL = f"http://127.0.0.1:{PORT}/media"
+ACTIONS = 1000
+CATEGORIES = ["Book", "Film", "Magazine"]
+
+
+def wait_until_up():
+    for _ in range(100):
+        try:
+            http.client.HTTPConnection("127.0.0.1", PORT, timeout=1).request("GET", "/media/1")
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def session(client, seed=0):
+    """Replays the same random sequence of GUI actions; returns the number of requests sent."""
+    rng = random.Random(seed)
+    sent = 0
+    original_send = client._send
+
+    def counting_send(*args, **kwargs):
+        nonlocal sent
+        sent += 1
+        return original_send(*args, **kwargs)
+
+    client._send = counting_send
+    for _ in range(ACTIONS):
+        action = rng.random()
+        if action < 0.3:
+            client.get_all_media()
+        elif action < 0.6:
+            client.get_media_by_category(rng.choice(CATEGORIES))
+        elif action < 0.98:
+            client.get_media_details(str(rng.randint(1, 13)))
+        else:
+            client.create_media({"Name": "New", "Publication date": "2024", "Author": "Bench",
+                                 "Category": rng.choice(CATEGORIES)})
+    return sent
+
+
+def main():
+    print(f"{ACTIONS} GUI actions")
+    print(f"{'client':<10} {'requests':>9} {'seconds':>8} {'hits':>6} {'stale':>6} {'misses':>7}")
+    for name, cache in (("no cache", None), ("cache", ClientCache())):
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copy(os.path.join(ROOT, 'media_data.json'), tmp)
+            server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'serve.py'), '--workers', '1',
+                                       '--port', str(PORT)],
+                                      cwd=tmp, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_until_up()
+                with ApiClient(base_url=BASE_URL, cache=cache) as client:
+                    start = time.perf_counter()
+                    sent = session(client)
+                    elapsed = time.perf_counter() - start
+                stats = cache.stats() if cache else {"hits": "-", "stale_hits": "-", "misses": "-"}
+                print(f"{name:<10} {sent:>9} {elapsed:>8.2f} {stats['hits']:>6} {stats['stale_hits']:>6} "
+                      f"{stats['misses']:>7}")
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
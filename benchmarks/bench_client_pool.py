@@ -0,0 +1,118 @@
+# benchmarks/bench_client_pool.py
+# Requests per second from the frontend client against a local server, with
+# a new connection per request (module-level requests.get, as ApiClient did
+# before) and with ApiClient's pooled keep-alive session. Two servers:
+#   serve.py    one threaded worker over a copy of media_data.json. Werkzeug
+#               closes the connection after every response, so only the
+#               cost of building a new Session per call is saved.
+#   keep-alive  a minimal HTTP/1.1 server answering every GET with a fixed
+#               item, as a WSGI server with keep-alive would. This shows the
+#               client side of a connection setup per request.
+# Run from the project root:
+#     python -m benchmarks.bench_client_pool
+
+import http.client
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from frontend.api_client import ApiClient
+
+PORT = 5098
+BASE_URL = f"http://127.0.0.1:{PORT}/media"
+DURATION = 5.0
+THREADS = [1, 4]
+
+KEEP_ALIVE_SERVER = """
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BODY = b'{"id": "1", "Name": "Dune", "Publication date": "1965", "Author": "Frank Herbert", "Category": "Book"}'
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this the body waits for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+ThreadingHTTPServer(("127.0.0.1", int(sys.argv[1])), Handler).serve_forever()
+"""
+SERVERS = {
+    "serve.py": [sys.executable, os.path.join(ROOT, 'serve.py'), '--workers', '1', '--threads', '--port', str(PORT)],
+    "keep-alive": [sys.executable, "-c", KEEP_ALIVE_SERVER, str(PORT)],
+}
+
+
+def wait_until_up():
+    for _ in range(100):
+        try:
+            http.client.HTTPConnection("127.0.0.1", PORT, timeout=1).request("GET", "/media/1")
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def unpooled(url):
+    return requests.get(url, timeout=5).json()
+
+
+def measure(get, threads):
+    """Runs ``get`` in a loop from ``threads`` threads for DURATION seconds; returns requests/s."""
+    counts = [0] * threads
+    deadline = time.monotonic() + DURATION
+
+    def run(slot):
+        done = 0
+        while time.monotonic() < deadline:
+            get(f"{BASE_URL}/{done % 10 + 1}")
+            done += 1
+        counts[slot] = done
+
+    workers = [threading.Thread(target=run, args=(slot,)) for slot in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / DURATION
+
+
+def main():
+    print(f"{'server':<11} {'threads':>8} {'unpooled req/s':>15} {'pooled req/s':>13} {'speedup':>8}")
+    for name, command in SERVERS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copy(os.path.join(ROOT, 'media_data.json'), tmp)
+            server = subprocess.Popen(command, cwd=tmp, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_until_up()
+                for threads in THREADS:
+                    before = measure(unpooled, threads)
+                    with ApiClient(base_url=BASE_URL) as client:
+                        after = measure(lambda url: client._send('GET', url).json(), threads)
+                    print(f"{name:<11} {threads:>8} {before:>15.0f} {after:>13.0f} {after / before:>8.2f}")
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_group_commit.py
+# Compares journal write throughput and latency across durability modes and
+# client concurrency levels. "serial" is the old behaviour: one fsync per
+# write with writers queued on a lock.
+#     python -m benchmarks.bench_group_commit
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.journal import Journal
+
+MODES = ["serial", "fsync", "interval", "os"]
+CONCURRENCY = [1, 4, 16, 64]
+WRITES_PER_CLIENT = 200
+RECORD = {"op": "create", "item": {"id": "1", "Name": "Title", "Publication date": "2020",
+                                   "Author": "Author", "Category": "Book"}}
+
+
+def run(mode, clients):
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = Journal(os.path.join(tmp, 'media.log'), "fsync" if mode == "serial" else mode)
+        serial_lock = threading.Lock()
+        latencies = []
+        latencies_lock = threading.Lock()
+
+        def client():
+            local = []
+            for _ in range(WRITES_PER_CLIENT):
+                start = time.perf_counter()
+                if mode == "serial":
+                    with serial_lock:
+                        journal.append(RECORD)
+                else:
+                    journal.append(RECORD)
+                local.append(time.perf_counter() - start)
+            with latencies_lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        journal.close()
+
+    latencies.sort()
+    return len(latencies) / elapsed, latencies[int(len(latencies) * 0.99) - 1]
+
+
+def main():
+    print(f"{'mode':>9} {'clients':>8} {'writes/s':>10} {'p99 ms':>9}")
+    for mode in MODES:
+        for clients in CONCURRENCY:
+            rate, p99 = run(mode, clients)
+            print(f"{mode:>9} {clients:>8} {rate:>10.0f} {p99 * 1000:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
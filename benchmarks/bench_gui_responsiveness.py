@@ -0,0 +1,142 @@
+# benchmarks/bench_gui_responsiveness.py
+# How long the GUI's event loop is blocked while the user switches category
+# filters and selects rows against a slow backend: a local stand-in server
+# that delays every response by LATENCY seconds. A 5 ms timer records the
+# gaps between its ticks; a gap far above 5 ms is a frozen window. The
+# "synchronous" run makes the same calls directly on the UI thread, as the
+# GUI did before ApiDispatcher. Needs PyQt6; runs without a display:
+#     python -m benchmarks.bench_gui_responsiveness
+
+import http.client
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+from frontend.api_client import ApiClient
+from frontend.gui import LibraryApp
+from frontend.workers import ApiDispatcher
+
+PORT = 5095
+BASE_URL = f"http://127.0.0.1:{PORT}/media"
+LATENCY = 0.3
+TICK_MS = 5
+# (ms after start, action): filter changes faster than the server answers, then row selections
+SCRIPT = [(200 + 150 * i, ("filter", i % 4)) for i in range(8)] + \
+         [(2000 + 400 * i, ("select", i % 3)) for i in range(5)]
+DURATION_MS = 4500
+
+STAND_IN_SERVER = """
+import json, sys, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ITEMS = [{"id": str(i), "Name": f"Title {i}", "Author": "A", "Publication date": "2000",
+          "Category": ["Book", "Film", "Magazine"][i % 3]} for i in range(1, 31)]
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(float(sys.argv[2]))
+        path, _, query = self.path.partition("?")
+        parts = path.strip("/").split("/")
+        if len(parts) == 1:
+            body = ITEMS
+        elif parts[1] == "category":
+            body = [it for it in ITEMS if it["Category"] == parts[2]]
+        else:
+            body = ITEMS[int(parts[1]) - 1]
+        if "limit=" in query:
+            body = {"items": body, "next_cursor": None}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+server = ThreadingHTTPServer(("127.0.0.1", int(sys.argv[1])), Handler)
+server.daemon_threads = True
+server.serve_forever()
+"""
+
+
+class SynchronousDispatcher(ApiDispatcher):
+    """Runs every call on the UI thread, like the GUI before background workers."""
+
+    def run(self, channel, call, *args, callback):
+        callback(call(*args))
+
+
+def wait_until_up():
+    for _ in range(100):
+        try:
+            http.client.HTTPConnection("127.0.0.1", PORT, timeout=1).request("GET", "/media/1")
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def measure(app, dispatcher_class):
+    """Replays SCRIPT on a fresh window; returns the timer gaps in ms."""
+    window = LibraryApp(ApiClient(base_url=BASE_URL))
+    window.dispatcher = dispatcher_class(window)
+    window.dispatcher.busy_changed.connect(window._show_busy)
+    window.show()
+    gaps = []
+    last = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        gaps.append((now - last[0]) * 1e3)
+        last[0] = now
+
+    def act(action, value):
+        if action == "filter":
+            window.category_combo.setCurrentIndex(value)
+        else:
+            window.media_table.selectRow(value)
+
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(TICK_MS)
+    for at, (action, value) in SCRIPT:
+        QTimer.singleShot(at, lambda action=action, value=value: act(action, value))
+    QTimer.singleShot(DURATION_MS, app.quit)
+    app.exec()
+    timer.stop()
+    window.close()
+    return sorted(gaps)
+
+
+def main():
+    app = QApplication(sys.argv)
+    server = subprocess.Popen([sys.executable, "-c", STAND_IN_SERVER, str(PORT), str(LATENCY)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up()
+        print(f"{LATENCY * 1e3:.0f} ms server latency, {len(SCRIPT)} user actions")
+        print(f"{'dispatch':<12} {'max gap ms':>11} {'p99 gap ms':>11} {'gaps > 50 ms':>13}")
+        for name, dispatcher_class in (("synchronous", SynchronousDispatcher), ("thread pool", ApiDispatcher)):
+            gaps = measure(app, dispatcher_class)
+            p99 = gaps[int(len(gaps) * 0.99)]
+            print(f"{name:<12} {gaps[-1]:>11.0f} {p99:>11.0f} {sum(g > 50 for g in gaps):>13}")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_gui_search.py
+# Time per keystroke of search-as-you-type in the GUI table: the text is
+# typed one character at a time. "filter" is the time to compute and apply
+# the new rows, "frame" adds the event loop turn that lays out and paints
+# the view (about 7 ms of it is painting the visible cells, filtered or
+# not). "index" is what LibraryApp does (LocalSearchIndex.search, then
+# MediaTableModel.set_filter); "proxy" is the QSortFilterProxyModel substring
+# filter over every column that the "Filter Rows" box used. The index is
+# built once per size beforehand (in the GUI this happens page by page as
+# rows arrive) and its build time is reported separately. Needs PyQt6. Run
+# from the project root:
+#     python -m benchmarks.bench_gui_search [sizes...]
+
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QTableView
+
+from frontend.gui import METADATA_FIELDS, TABLE_HEADERS
+from frontend.local_search import LocalSearchIndex
+from frontend.media_model import MediaTableModel, make_proxy
+
+SIZES = [10_000, 100_000]
+QUERIES = ["star", "the lost", "herbert dune", "zzz"]
+# One frame at 60 Hz
+FRAME_MS = 16.7
+
+WORDS = ("the a of lost star city night dune river house war time king dark light shadow garden "
+         "stone fire winter summer road sea moon sun secret last first empire silent glass iron").split()
+NAMES = "frank herbert ursula le guin isaac asimov mary shelley neil gaiman jane austen george orwell".split()
+
+
+def make_items(count):
+    rng = random.Random(42)
+    return [{"id": str(i), "Name": " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title(),
+             "Author": f"{rng.choice(NAMES).title()} {rng.choice(NAMES).title()}",
+             "Publication date": str(1900 + i % 120), "Category": ["Book", "Film", "Magazine"][i % 3]}
+            for i in range(1, count + 1)]
+
+
+def type_query(app, query, apply):
+    """Types ``query`` a character at a time; returns (filter ms, frame ms) per keystroke."""
+    timings = []
+    for end in range(1, len(query) + 1):
+        start = time.perf_counter()
+        apply(query[:end])
+        filtered = time.perf_counter()
+        app.processEvents()
+        timings.append(((filtered - start) * 1e3, (time.perf_counter() - start) * 1e3))
+    apply("")
+    app.processEvents()
+    return timings
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    app = QApplication([])
+    print(f"{'rows':>7} {'':<6} {'filter median/max ms':>21} {'frame median/max ms':>20} {'frames over':>12}")
+    for count in sizes:
+        items = make_items(count)
+        model = MediaTableModel(METADATA_FIELDS, TABLE_HEADERS)
+        proxy = make_proxy(model)
+        view = QTableView()
+        view.setModel(proxy)
+        view.resize(800, 600)
+        view.show()
+        model.set_items(items)
+        app.processEvents()
+
+        start = time.perf_counter()
+        index = LocalSearchIndex()
+        index.extend(items)
+        print(f"{count:>7} index built in {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+        def apply_index(text):
+            rows = index.search(text)
+            if rows is None:
+                model.clear_filter()
+            else:
+                model.set_filter(rows)
+
+        for name, apply in (("index", apply_index), ("proxy", proxy.setFilterFixedString)):
+            timings = [step for query in QUERIES for step in type_query(app, query, apply)]
+            filters, frames = zip(*timings)
+            print(f"{count:>7} {name:<6} {statistics.median(filters):>12.1f} /{max(filters):>7.1f} "
+                  f"{statistics.median(frames):>11.1f} /{max(frames):>7.1f} "
+                  f"{sum(ms > FRAME_MS for ms in frames):>9}/{len(frames)}")
+
+
+if __name__ == '__main__':
+    main()
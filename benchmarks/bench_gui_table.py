@@ -0,0 +1,92 @@
+# benchmarks/bench_gui_table.py
+# Time until the first rows are on screen and the memory the table adds, for
+# the old QTableWidget (one QTableWidgetItem per cell) and the model/view
+# table (MediaTableModel behind the sort/filter proxy). The model is measured
+# with the whole list handed over at once (set_items) and paged (pages
+# served instantly from memory, so only the GUI side is timed). Every run is
+# a fresh offscreen process; memory is the growth of its resident set. Needs
+# PyQt6. Run from the project root:
+#     python -m benchmarks.bench_gui_table [sizes...]
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SIZES = [10_000, 100_000, 1_000_000]
+MODES = ["widget", "model", "paged"]
+
+CHILD = """
+import json, os, sys, time
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+from PyQt6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem, QTableView
+from frontend.gui import METADATA_FIELDS, TABLE_HEADERS
+from frontend.media_model import MediaTableModel, make_proxy
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+count, mode = int(sys.argv[1]), sys.argv[2]
+app = QApplication([])
+items = [{"id": str(i), "Name": f"Title {i}", "Author": f"Author {i % 5000}",
+          "Publication date": str(1900 + i % 120), "Category": ["Book", "Film", "Magazine"][i % 3]}
+         for i in range(1, count + 1)]
+
+if mode == "widget":
+    view = QTableWidget()
+    view.setColumnCount(len(TABLE_HEADERS))
+    view.setHorizontalHeaderLabels(TABLE_HEADERS)
+else:
+    model = MediaTableModel(METADATA_FIELDS, TABLE_HEADERS)
+    view = QTableView()
+    view.setModel(make_proxy(model))
+view.resize(800, 600)
+view.show()
+app.processEvents()
+before = rss_mb()
+
+start = time.perf_counter()
+if mode == "widget":
+    # What LibraryApp.load_media did before the model/view table
+    view.setRowCount(len(items))
+    for row, item in enumerate(items):
+        for col, field in enumerate(METADATA_FIELDS):
+            view.setItem(row, col, QTableWidgetItem(str(item.get(field))))
+elif mode == "model":
+    model.set_items(items)
+else:
+    def request_page(cursor, callback, page_size=200):
+        start_row = int(cursor or 0)
+        end_row = start_row + page_size
+        callback({"items": items[start_row:end_row],
+                  "next_cursor": str(end_row) if end_row < len(items) else None})
+    model.start_paging(request_page)
+app.processEvents()
+view.viewport().repaint()
+first_rows = time.perf_counter() - start
+assert view.model().rowCount() > 0
+print(json.dumps([first_rows, rss_mb() - before]))
+"""
+
+
+def measure(count, mode):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.run([sys.executable, "-c", CHILD, str(count), mode], env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'rows':>9} {'table':<7} {'first rows ms':>14} {'memory MB':>10}")
+    for count in sizes:
+        for mode in MODES:
+            first_rows, memory = measure(count, mode)
+            print(f"{count:>9} {mode:<7} {first_rows * 1e3:>14.1f} {memory:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_memory.py
+# Memory held per media item: the plain dict-of-dicts DataManager used to
+# keep vs the compact MediaRecords it keeps now, both built from the same
+# JSON snapshot (as on a cold start) and measured with tracemalloc.
+# Run from the project root:
+#     python -m benchmarks.bench_memory [sizes...]
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.records import MediaRecords
+
+SIZES = [10_000, 100_000, 1_000_000]
+CATEGORIES = ["Book", "Film", "Magazine"]
+
+
+def make_snapshot(count):
+    return json.dumps({
+        str(i + 1): {
+            "id": str(i + 1),
+            "Name": f"Title {i}",
+            "Publication date": str(1900 + i % 120),
+            "Author": f"Author {i % 5000}",
+            "Category": CATEGORIES[i % 3],
+        }
+        for i in range(count)
+    })
+
+
+def as_dicts(text):
+    return json.loads(text)
+
+
+def as_records(text):
+    return MediaRecords.from_items(json.loads(text))
+
+
+def retained_bytes(build, text):
+    """Bytes still allocated once build(text) has returned and its temporaries are freed."""
+    gc.collect()
+    tracemalloc.start()
+    media = build(text)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del media
+    return size
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'items':>9} {'dicts B/item':>13} {'records B/item':>15} {'saved':>7}")
+    for count in sizes:
+        text = make_snapshot(count)
+        dicts = retained_bytes(as_dicts, text) / count
+        records = retained_bytes(as_records, text) / count
+        print(f"{count:>9} {dicts:>13.0f} {records:>15.0f} {1 - records / dicts:>7.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_search.py
+# Measures ranked/fuzzy query latency of SearchIndex on a synthetic catalogue.
+#     python -m benchmarks.bench_search [items]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.search_index import SearchIndex
+
+DEFAULT_ITEMS = 1_000_000
+QUERIES = ["martian", "martain", "dune mesiah", "hail mar", "weir", "zzzzz"]
+REPEAT = 200
+
+
+def make_word(rng):
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9)))
+
+
+def build(count):
+    rng = random.Random(42)
+    words = [make_word(rng) for _ in range(50_000)]
+    authors = [f"{make_word(rng)} {make_word(rng)}" for _ in range(20_000)]
+    index = SearchIndex()
+    docs = ((str(i), [(' '.join(rng.choices(words, k=3)), 2.0), (rng.choice(authors), 1.0)])
+            for i in range(count))
+    index.rebuild(docs)
+    index.add("m1", [("The Martian", 2.0), ("Andy Weir", 1.0)])
+    index.add("m2", [("Dune Messiah", 2.0), ("Frank Herbert", 1.0)])
+    index.add("m3", [("Project Hail Mary", 2.0), ("Andy Weir", 1.0)])
+    return index
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITEMS
+    start = time.perf_counter()
+    index = build(count)
+    print(f"built index over {len(index)} items in {time.perf_counter() - start:.1f}s")
+    print(f"{'query':>14} {'p50 us':>10} {'p99 us':>10}  top hit")
+    for query in QUERIES:
+        samples = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            hits = index.search(query, 10)
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        top = hits[0][0] if hits else '-'
+        print(f"{query:>14} {samples[len(samples) // 2] * 1e6:>10.1f} {samples[int(len(samples) * 0.99) - 1] * 1e6:>10.1f}  {top}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_startup.py
+# Cold start of the backend API with a JSON vs a binary snapshot: time to
+# import backend.api, to answer the first GET /media/<id> (which loads the
+# data) and to answer the first search (which builds the search index).
+# Every run is a fresh interpreter. Run from the project root:
+#     python -m benchmarks.bench_startup [sizes...]
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from backend.records import MediaRecords, make_record
+from backend.snapshot import write_snapshot
+
+SIZES = [10_000, 100_000, 1_000_000]
+CATEGORIES = ["Book", "Film", "Magazine"]
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+import backend.api as api
+imported = time.perf_counter()
+client = api.app.test_client()
+assert client.get('/media/1').status_code == 200
+first_get = time.perf_counter()
+assert client.get('/media/search/text?q=title').status_code == 200
+first_search = time.perf_counter()
+print(json.dumps([imported - start, first_get - imported, first_search - first_get]))
+"""
+
+
+def write_data(tmp, count, snapshot_format):
+    media = {
+        str(i + 1): make_record({
+            "id": str(i + 1),
+            "Name": f"Title {i}",
+            "Publication date": str(1900 + i % 120),
+            "Author": f"Author {i % 5000}",
+            "Category": CATEGORIES[i % 3],
+        })
+        for i in range(count)
+    }
+    if snapshot_format == "binary":
+        write_snapshot(os.path.join(tmp, 'media_data.snapshot'), MediaRecords(media).rows(), count + 1)
+    else:
+        with open(os.path.join(tmp, 'media_data.json'), 'w', encoding='utf-8') as f:
+            json.dump(MediaRecords(media).to_dict(), f, indent=4)
+
+
+def measure(count, snapshot_format):
+    with tempfile.TemporaryDirectory() as tmp:
+        write_data(tmp, count, snapshot_format)
+        env = dict(os.environ, PYTHONPATH=ROOT, MEDIA_STORAGE_ENGINE="json", MEDIA_SNAPSHOT_FORMAT=snapshot_format)
+        output = subprocess.run([sys.executable, "-c", CHILD], cwd=tmp, env=env,
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'items':>9} {'snapshot':<8} {'import ms':>10} {'1st get ms':>11} {'1st search ms':>14}")
+    for count in sizes:
+        for snapshot_format in ("json", "binary"):
+            imported, first_get, first_search = measure(count, snapshot_format)
+            print(f"{count:>9} {snapshot_format:<8} {imported * 1e3:>10.1f} {first_get * 1e3:>11.1f} "
+                  f"{first_search * 1e3:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
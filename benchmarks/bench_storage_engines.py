@@ -0,0 +1,196 @@
+# benchmarks/bench_storage_engines.py
+# Compares the storage engines of both apps as the catalogue grows:
+# time to open (first read after start), lookup by id, one category page and
+# one create. Run from the project root:
+#     python -m benchmarks.bench_storage_engines [sizes...]
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import storage
+import storage_records
+import storage_sqlite
+from backend.data_manager import DataManager, SQLiteDataManager
+
+SIZES = [10_000, 100_000, 1_000_000]
+READS = 200
+WRITES = 10
+CATEGORIES = ["Book", "Film", "Magazine"]
+
+
+def make_items(count, keys, numeric_ids):
+    for i in range(count):
+        yield {
+            "id": str(i + 1) if numeric_ids else str(uuid.UUID(int=i)),
+            keys[0]: f"Title {i}",
+            keys[1]: str(1900 + i % 120),
+            keys[2]: f"Author {i % 5000}",
+            keys[3]: CATEGORIES[i % 3],
+        }
+
+
+class StorageJson:
+    name = "storage.py json"
+
+    def __init__(self, tmp, count):
+        storage.DATA_FILE = Path(tmp) / "media_store.json"
+        items = list(make_items(count, ("name", "publication_date", "author", "category"), False))
+        storage.DATA_FILE.write_text(json.dumps(items, indent=2), encoding="utf-8")
+        self.ids = [item["id"] for item in items]
+
+    def open(self):
+        storage.clear_cache()
+        storage.load_all()
+
+    def get(self, item_id):
+        storage.find_by_id(item_id)
+
+    def page(self):
+        storage.page_media("Book", limit=100)
+
+    def create(self, i):
+        storage.add_media({"name": f"New {i}", "publication_date": "2024", "author": "Bench", "category": "Book"})
+
+    def close(self):
+        storage.clear_cache()
+
+
+class StorageSqlite(StorageJson):
+    name = "storage.py sqlite"
+
+    def __init__(self, tmp, count):
+        storage_sqlite.DB_FILE = Path(tmp) / "media_store.db"
+        items = make_items(count, storage_sqlite.FIELDS, False)
+        storage_sqlite.import_items(items)
+        storage_sqlite.close()
+        self.ids = [str(uuid.UUID(int=i)) for i in range(count)]
+
+    def open(self):
+        storage_sqlite.close()
+        storage_sqlite.find_by_id(self.ids[0])
+
+    def get(self, item_id):
+        storage_sqlite.find_by_id(item_id)
+
+    def page(self):
+        storage_sqlite.page_media("Book", limit=100)
+
+    def create(self, i):
+        storage_sqlite.add_media({"name": f"New {i}", "publication_date": "2024", "author": "Bench", "category": "Book"})
+
+    def close(self):
+        storage_sqlite.close()
+
+
+class StorageRecords(StorageJson):
+    name = "storage.py records"
+
+    def __init__(self, tmp, count):
+        storage_records.DATA_FILE = Path(tmp) / "media_store.records"
+        storage_records.import_items(make_items(count, ("name", "publication_date", "author", "category"), False))
+        storage_records.close()
+        self.ids = [str(uuid.UUID(int=i)) for i in range(count)]
+
+    def open(self):
+        storage_records.close()
+        storage_records.find_by_id(self.ids[0])
+
+    def get(self, item_id):
+        storage_records.find_by_id(item_id)
+
+    def page(self):
+        storage_records.page_media("Book", limit=100)
+
+    def create(self, i):
+        storage_records.add_media({"name": f"New {i}", "publication_date": "2024", "author": "Bench", "category": "Book"})
+
+    def close(self):
+        storage_records.close()
+
+
+class ManagerJson:
+    name = "DataManager json"
+
+    def __init__(self, tmp, count):
+        self.paths = os.path.join(tmp, 'media.json'), os.path.join(tmp, 'media.log')
+        items = make_items(count, ("Name", "Publication date", "Author", "Category"), True)
+        with open(self.paths[0], 'w', encoding='utf-8') as f:
+            json.dump({item["id"]: item for item in items}, f, indent=4)
+        self.ids = [str(i + 1) for i in range(count)]
+        self.dm = None
+
+    def open(self):
+        self.dm = DataManager(data_file=self.paths[0], log_file=self.paths[1], compact_bytes=1 << 40)
+
+    def get(self, item_id):
+        self.dm.get_media_by_id(item_id)
+
+    def page(self):
+        self.dm.get_media_page("Book", limit=100)
+
+    def create(self, i):
+        self.dm.create_media({"Name": f"New {i}", "Publication date": "2024", "Author": "Bench", "Category": "Book"})
+
+    def close(self):
+        self.dm = None
+
+
+class ManagerSqlite(ManagerJson):
+    name = "DataManager sqlite"
+
+    def __init__(self, tmp, count):
+        self.path = os.path.join(tmp, 'media.db')
+        dm = SQLiteDataManager(self.path)
+        dm.import_media(make_items(count, ("Name", "Publication date", "Author", "Category"), True))
+        dm.close()
+        self.ids = [str(i + 1) for i in range(count)]
+        self.dm = None
+
+    def open(self):
+        self.dm = SQLiteDataManager(self.path)
+        self.dm.get_media_by_id(self.ids[0])
+
+    def close(self):
+        self.dm.close()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def measure(engine_cls, count):
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = engine_cls(tmp, count)
+        try:
+            opened = timed(engine.open)
+            get = sum(timed(engine.get, rng.choice(engine.ids)) for _ in range(READS)) / READS
+            page = sum(timed(engine.page) for _ in range(10)) / 10
+            create = sum(timed(engine.create, i) for i in range(WRITES)) / WRITES
+        finally:
+            engine.close()
+    return opened, get, page, create
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'items':>9} {'engine':<20} {'open ms':>10} {'get us':>10} {'page ms':>10} {'create ms':>10}")
+    for count in sizes:
+        for engine_cls in (StorageJson, StorageSqlite, StorageRecords, ManagerJson, ManagerSqlite):
+            opened, get, page, create = measure(engine_cls, count)
+            print(f"{count:>9} {engine_cls.name:<20} {opened * 1e3:>10.1f} {get * 1e6:>10.1f} "
+                  f"{page * 1e3:>10.2f} {create * 1e3:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_suggest.py
+# Latency of /media/suggest lookups (SuggestIndex.suggest) on a synthetic
+# catalogue of names and authors, with a create or delete between every
+# few lookups. Prefixes are typed the way a user would: the first 1-8
+# characters of existing names and authors, with common words ("The ...")
+# and prolific authors making some prefixes match a large share of the
+# catalogue. The first pass starts with only the prefixes rebuild()
+# memoizes; the second shows the steady state.
+#     python -m benchmarks.bench_suggest [items]
+
+import os
+import random
+import sys
+import time
+from itertools import accumulate
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.suggest_index import SuggestIndex
+
+DEFAULT_ITEMS = 1_000_000
+LOOKUPS = 20_000
+# One create or delete per this many lookups
+LOOKUPS_PER_WRITE = 10
+
+
+def make_word(rng):
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 9))).title()
+
+
+def make_catalogue(count, rng):
+    words = ["The", "A", "Of", "Star", "Night"] + [make_word(rng) for _ in range(50_000)]
+    # Zipf-like word frequencies: a handful of words start a large share of the names
+    weights = list(accumulate(1 / (rank + 1) for rank in range(len(words))))
+    authors = [f"{make_word(rng)} {make_word(rng)}" for _ in range(100_000)]
+    author_weights = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(authors))))
+    names = [' '.join(rng.choices(words, cum_weights=weights, k=rng.randint(1, 4))) for _ in range(count)]
+    return names, rng.choices(authors, cum_weights=author_weights, k=count)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return [samples[int(len(samples) * q) - 1] * 1e6 for q in (0.5, 0.99, 1.0)]
+
+
+def run(index, names, authors, rng):
+    lookups, writes = [], []
+    live = list(range(len(names)))
+    for step in range(LOOKUPS):
+        if step % LOOKUPS_PER_WRITE == 0:
+            start = time.perf_counter()
+            if rng.random() < 0.5:
+                names.append(' '.join(rng.choice(names).split()[:2] + ["Returns"]))
+                authors.append(rng.choice(authors))
+                index.add(names[-1])
+                index.add(authors[-1])
+                live.append(len(names) - 1)
+            else:
+                position = rng.randrange(len(live))
+                live[position], live[-1] = live[-1], live[position]
+                removed = live.pop()
+                index.remove(names[removed])
+                index.remove(authors[removed])
+            writes.append(time.perf_counter() - start)
+        source = rng.choice(names if rng.random() < 0.6 else authors)
+        prefix = source[:rng.randint(1, 8)]
+        start = time.perf_counter()
+        index.suggest(prefix, 10)
+        lookups.append(time.perf_counter() - start)
+    return lookups, writes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITEMS
+    rng = random.Random(42)
+    names, authors = make_catalogue(count, rng)
+    start = time.perf_counter()
+    index = SuggestIndex()
+    index.rebuild(names + authors)
+    print(f"built index over {count} items ({len(index)} distinct texts) in {time.perf_counter() - start:.1f}s")
+    print(f"{'pass':>6} {'':<7} {'p50 us':>9} {'p99 us':>9} {'max us':>10}")
+    for name in ("cold", "warm"):
+        lookups, writes = run(index, names, authors, rng)
+        for kind, samples in (("suggest", lookups), ("write", writes)):
+            p50, p99, worst = percentiles(samples)
+            print(f"{name:>6} {kind:<7} {p50:>9.1f} {p99:>9.1f} {worst:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_workers.py
+# Read throughput of serve.py as the number of worker processes grows.
+# Each run starts the launcher in a scratch directory seeded with the
+# repository's media_data.json and drives it from several client processes.
+#     python -m benchmarks.bench_workers
+
+import http.client
+import multiprocessing
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+WORKERS = [1, 2, 4]
+CLIENTS = 8
+DURATION = 5.0
+PORT = 5099
+
+
+def client(duration, counter):
+    conn = http.client.HTTPConnection("127.0.0.1", PORT)
+    done, deadline = 0, time.monotonic() + duration
+    while time.monotonic() < deadline:
+        conn.request("GET", f"/media/{done % 10 + 1}")
+        response = conn.getresponse()
+        response.read()
+        if response.getheader("Connection", "").lower() == "close" or response.version == 10:
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", PORT)
+        done += 1
+    with counter.get_lock():
+        counter.value += done
+
+
+def wait_until_up():
+    for _ in range(100):
+        try:
+            http.client.HTTPConnection("127.0.0.1", PORT, timeout=1).request("GET", "/media/1")
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def measure(workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(ROOT, 'media_data.json'), tmp)
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'serve.py'),
+                                   '--workers', str(workers), '--port', str(PORT)],
+                                  cwd=tmp, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_up()
+            counter = multiprocessing.Value('i', 0)
+            procs = [multiprocessing.Process(target=client, args=(DURATION, counter)) for _ in range(CLIENTS)]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join()
+            return counter.value / DURATION
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+
+def main():
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+    base = None
+    for workers in WORKERS:
+        rate = measure(workers)
+        base = base or rate
+        print(f"{workers:>8} {rate:>10.0f} {rate / base:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_write_latency.py
+# Measures DataManager.create_media latency as the catalogue grows.
+#
+# "rewrite" reproduces the old behaviour (full JSON snapshot on every write),
+# "journal" is the append-only log. Run from the project root:
+#     python -m benchmarks.bench_write_latency
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.data_manager import DataManager
+
+SIZES = [1_000, 10_000, 100_000]
+WRITES = 50
+
+
+def make_item(i):
+    return {"Name": f"Title {i}", "Publication date": "2020", "Author": f"Author {i}", "Category": "Book"}
+
+
+def seed(dm, count):
+    """Fills the manager directly in memory, then snapshots once."""
+    for i in range(count):
+        media_id = str(dm.next_id)
+        dm.media[media_id] = dict(make_item(i), id=media_id)
+        dm.next_id += 1
+    dm._save_data()
+
+
+def measure(size, mode):
+    with tempfile.TemporaryDirectory() as tmp:
+        dm = DataManager(data_file=os.path.join(tmp, 'media.json'),
+                         log_file=os.path.join(tmp, 'media.log'),
+                         compact_bytes=1 << 40)
+        seed(dm, size)
+        samples = []
+        for i in range(WRITES):
+            start = time.perf_counter()
+            dm.create_media(make_item(size + i))
+            if mode == "rewrite":
+                dm._save_data()
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        return samples[len(samples) // 2], samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    print(f"{'items':>10} {'mode':>8} {'p50 ms':>10} {'p99 ms':>10}")
+    for size in SIZES:
+        for mode in ("rewrite", "journal"):
+            p50, p99 = measure(size, mode)
+            print(f"{size:>10} {mode:>8} {p50 * 1000:>10.3f} {p99 * 1000:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
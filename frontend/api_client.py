@@ -1,18 +1,141 @@
+import json
+import random
+import threading
+import time
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Tuple
+
+from .client_cache import ClientCache, FRESH, STALE
 
 # The base URL where your Flask backend is running
 BASE_URL = 'http://127.0.0.1:5000/media'
+# Items requested per page by the iter_* helpers
+PAGE_SIZE = 200
+# Operations sent per request by apply_batch
+BATCH_CHUNK_SIZE = 1000
+# Most changes asked for per get_changes call
+CHANGES_LIMIT = 1000
+# GET responses kept for revalidation with If-None-Match (oldest dropped first)
+MAX_VALIDATED_RESPONSES = 256
+# Connections kept open to the server (also the most requests in flight at once)
+POOL_SIZE = 10
+# Seconds allowed to open a connection, and to wait for each read from the server
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+# Further attempts for requests that may be repeated safely
+MAX_RETRIES = 3
+# The wait before retry n is random in [0, min(BACKOFF_MAX, BACKOFF_BASE * 2**n)] seconds
+BACKOFF_BASE = 0.2
+BACKOFF_MAX = 5.0
+# Methods that are retried. DELETE is idempotent too, but retrying one whose
+# response was lost would report 404 for an item that was in fact deleted.
+RETRY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT'})
+# Responses that mean the server may answer if asked again
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class ApiError(Exception):
+    """Raised by the iterator/streaming helpers, which cannot return an error dictionary."""
 
 class ApiClient:
-    """Client to communicate with the Flask Media API."""
+    """Client to communicate with the Flask Media API.
+
+    GET responses that carry an ETag are remembered, and repeating the same
+    GET sends If-None-Match: when the server answers 304 Not Modified the
+    remembered result is returned without downloading it again. Results
+    returned this way are shared between calls and must not be mutated.
+
+    Requests go through one requests.Session, which keeps up to
+    ``pool_size`` connections alive between calls. Requests whose method
+    is in RETRY_METHODS (GET, HEAD, OPTIONS and PUT) that fail to
+    connect, time out or get a 502/503/504 are retried up to
+    ``max_retries`` times, waiting a random, exponentially growing time
+    in between; POST and DELETE are sent once. Call close() (or use the
+    client as a context manager) to release the connections.
+
+    With a ClientCache, list, search and detail responses are reused
+    without contacting the server until they expire; creating or deleting
+    media drops the entries it may have changed.
+    """
+
+    def __init__(self, base_url: str = BASE_URL, pool_size: int = POOL_SIZE,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT,
+                 max_retries: int = MAX_RETRIES, backoff: float = BACKOFF_BASE,
+                 cache: Optional[ClientCache] = None):
+        self.base_url = base_url
+        self.cache = cache
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # (url, params) -> (etag, last_modified, parsed body) of the last 200 response
+        self._validated: Dict[Tuple, Tuple[str, Optional[str], Any]] = {}
+        self._validated_lock = threading.Lock()
+        self._session = requests.Session()
+        # Retries are done by _send, so the adapter itself never retries
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> "ApiClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: spreads out clients that failed at the same moment."""
+        return random.uniform(0, min(BACKOFF_MAX, self.backoff * 2 ** attempt))
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends one request through the session, retrying it if that is safe.
+
+        Connection errors and timeouts of the last attempt are raised; a
+        retryable status on the last attempt is returned as the response.
+        """
+        attempts = 1 + self.max_retries if method in RETRY_METHODS else 1
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if last:
+                    raise
+            else:
+                if last or response.status_code not in RETRY_STATUSES:
+                    return response
+                # Hand the connection back to the pool before waiting
+                response.close()
+            time.sleep(self._backoff_delay(attempt))
+
+    def _request(self, method: str, url: str, json_data: Optional[Dict] = None, params: Optional[Dict] = None,
+                 cache_as: Optional[Tuple[str, Iterable[str]]] = None) -> Optional[Dict[str, Any]]:
+        """Generic request handler with basic error checking.
 
-    def _request(self, method: str, url: str, json_data: Optional[Dict] = None, params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
-        """Generic request handler with basic error checking."""
+        ``cache_as`` is (endpoint, tags) for GETs that may be answered from the cache.
+        """
+        if cache_as is not None and self.cache is not None:
+            return self._cached_get(url, params, *cache_as)
         try:
+            headers = {}
+            key = (url, tuple(sorted((params or {}).items())))
+            cached = self._validated.get(key) if method == 'GET' else None
+            if cached is not None:
+                headers['If-None-Match'] = cached[0]
+                if cached[1]:
+                    headers['If-Modified-Since'] = cached[1]
+
             # Send the request
-            response = requests.request(method, url, json=json_data, params=params, timeout=5)
-            
+            response = self._send(method, url, json=json_data, params=params, headers=headers)
+
+            if response.status_code == 304 and cached is not None:
+                return cached[2]
+
             # Check for success status codes (2xx)
             if 200 <= response.status_code < 300:
                 # 204 No Content (for DELETE) returns no JSON
@@ -20,16 +143,22 @@ class ApiClient:
                     return {"success": True, "message": "Operation successful"}
                 
                 # Return JSON data for other successful codes (200, 201)
-                return response.json()
+                result = response.json()
+                if method == 'GET' and response.status_code == 200:
+                    self._remember(key, response, result)
+                return result
             
             # Handle client/server errors
-            # Attempt to get error message from JSON body
+            # Attempt to get error message from JSON body, keeping any other
+            # details it has (such as a rejected batch's per-operation results)
             try:
-                error_message = response.json().get("error", f"Unknown API Error (Status: {response.status_code})")
+                body = response.json()
             except requests.JSONDecodeError:
-                error_message = f"API Error (Status: {response.status_code}). Response was not JSON."
-                
-            return {"error": error_message}
+                return {"error": f"API Error (Status: {response.status_code}). Response was not JSON."}
+            if not isinstance(body, dict):
+                body = {}
+            body.setdefault("error", f"Unknown API Error (Status: {response.status_code})")
+            return body
 
         except requests.exceptions.ConnectionError:
             return {"error": "Connection Failed. Ensure the Flask backend is running on 127.0.0.1:5000."}
@@ -38,34 +167,225 @@ class ApiClient:
         except Exception as e:
             return {"error": f"An unexpected network error occurred: {e}"}
 
+    def _cached_get(self, url: str, params: Optional[Dict], endpoint: str, tags: Iterable[str]) -> Any:
+        """GET via the cache: fresh entries skip the network, stale ones are refreshed in the background."""
+        key = ('GET', url, tuple(sorted((params or {}).items())))
+        state, value, generation = self.cache.lookup(key)
+        if state == FRESH:
+            return value
+        if state == STALE:
+            if self.cache.start_refresh(key):
+                threading.Thread(target=self._refresh, args=(key, url, params, endpoint, tags, generation),
+                                 name='api-cache-refresh', daemon=True).start()
+            return value
+        return self._fetch_into_cache(key, url, params, endpoint, tags, generation)
+
+    def _fetch_into_cache(self, key: Tuple, url: str, params: Optional[Dict], endpoint: str,
+                          tags: Iterable[str], generation: int) -> Any:
+        result = self._request('GET', url, params=params)
+        if not (isinstance(result, dict) and "error" in result):
+            self.cache.put(key, endpoint, tags, result, generation)
+        return result
+
+    def _refresh(self, key: Tuple, url: str, params: Optional[Dict], endpoint: str,
+                 tags: Iterable[str], generation: int) -> None:
+        try:
+            self._fetch_into_cache(key, url, params, endpoint, tags, generation)
+        finally:
+            self.cache.end_refresh(key)
+
+    def _invalidate(self, *tags: str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(tags)
+
+    def _remember(self, key: Tuple, response: requests.Response, result: Any) -> None:
+        """Keeps a GET result with its validators, or forgets it if it has none."""
+        etag = response.headers.get('ETag')
+        with self._validated_lock:
+            self._validated.pop(key, None)
+            if not etag:
+                return
+            if len(self._validated) >= MAX_VALIDATED_RESPONSES:
+                del self._validated[next(iter(self._validated))]
+            self._validated[key] = (etag, response.headers.get('Last-Modified'), result)
+
+    def _iter_pages(self, url: str, sort: str, page_size: int) -> Iterator[Dict[str, Any]]:
+        """Yields items page by page, fetching the next page only when needed."""
+        params = {'limit': page_size, 'sort': sort}
+        while True:
+            result = self._request('GET', url, params=params)
+            if not isinstance(result, dict) or "items" not in result:
+                error = result.get("error") if isinstance(result, dict) else None
+                raise ApiError(error or "Unexpected response while paging.")
+            yield from result["items"]
+            if not result.get("next_cursor"):
+                return
+            params = {'limit': page_size, 'sort': sort, 'cursor': result["next_cursor"]}
+
+    def iter_all_media(self, sort: str = 'id', page_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Endpoint 1 (paged): lazily walks every media item in ``sort`` order."""
+        return self._iter_pages(self.base_url, sort, page_size)
+
+    def iter_media_by_category(self, category: str, sort: str = 'id', page_size: int = PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Endpoint 2 (paged): lazily walks the media of one category."""
+        return self._iter_pages(f"{self.base_url}/category/{category}", sort, page_size)
+
+    def get_media_page(self, category: Optional[str] = None, cursor: Optional[str] = None,
+                       sort: str = 'id', limit: int = PAGE_SIZE) -> Dict[str, Any]:
+        """Endpoints 1 and 2 (paged): one page as {"items": [...], "next_cursor": ...}.
+
+        Pass the previous page's next_cursor to get the following page; it
+        is None on the last page.
+        """
+        if category is None:
+            url, cache_as = self.base_url, ("list", ("list",))
+        else:
+            url = f"{self.base_url}/category/{category}"
+            cache_as = ("category", ("category", f"category:{category.lower()}"))
+        params = {'limit': limit, 'sort': sort}
+        if cursor:
+            params['cursor'] = cursor
+        return self._request('GET', url, params=params, cache_as=cache_as)
+
+    def _stream(self, url: str) -> Iterator[Dict[str, Any]]:
+        """Yields items from an NDJSON response as each line arrives."""
+        try:
+            with self._send('GET', url, headers={'Accept': 'application/x-ndjson'}, stream=True) as response:
+                if response.status_code != 200:
+                    try:
+                        error = response.json().get("error")
+                    except ValueError:
+                        error = None
+                    raise ApiError(error or f"API Error (Status: {response.status_code}).")
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+        except requests.exceptions.ConnectionError:
+            raise ApiError("Connection Failed. Ensure the Flask backend is running on 127.0.0.1:5000.")
+        except requests.exceptions.Timeout:
+            raise ApiError("Request timed out.")
+
+    def stream_all_media(self) -> Iterator[Dict[str, Any]]:
+        """Endpoint 1 (streamed): yields every media item while the download is in progress."""
+        return self._stream(self.base_url)
+
+    def stream_media_by_category(self, category: str) -> Iterator[Dict[str, Any]]:
+        """Endpoint 2 (streamed): yields the media of one category as they arrive."""
+        return self._stream(f"{self.base_url}/category/{category}")
+
     def get_all_media(self) -> List[Dict[str, Any]]:
         """Endpoint 1: List all available media."""
-        result = self._request('GET', BASE_URL)
+        result = self._request('GET', self.base_url, cache_as=("list", ("list",)))
         return result if isinstance(result, list) else result
 
     def get_media_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Endpoint 2: List media by category."""
-        url = f"{BASE_URL}/category/{category}"
-        result = self._request('GET', url)
+        url = f"{self.base_url}/category/{category}"
+        result = self._request('GET', url, cache_as=("category", ("category", f"category:{category.lower()}")))
         return result if isinstance(result, list) else result
 
     def search_media_by_name(self, name: str) -> List[Dict[str, Any]]:
         """Endpoint 3: Search for media items by exact name."""
-        url = f"{BASE_URL}/search"
+        url = f"{self.base_url}/search"
         params = {'name': name}
-        result = self._request('GET', url, params=params)
+        result = self._request('GET', url, params=params, cache_as=("search", ("search",)))
+        return result if isinstance(result, list) else result
+
+    def search_media_text(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Ranked full-text search across name and author, tolerant of typos."""
+        url = f"{self.base_url}/search/text"
+        params = {'q': query, 'limit': limit}
+        result = self._request('GET', url, params=params, cache_as=("text", ("text",)))
         return result if isinstance(result, list) else result
 
     def get_media_details(self, media_id: str) -> Optional[Dict[str, Any]]:
         """Endpoint 4: Display the metadata of a specific media item."""
-        url = f"{BASE_URL}/{media_id}"
-        return self._request('GET', url)
+        url = f"{self.base_url}/{media_id}"
+        return self._request('GET', url, cache_as=("details", (f"details:{media_id}",)))
 
     def create_media(self, data: Dict[str, str]) -> Optional[Dict[str, Any]]:
         """Endpoint 5: Create a new media item."""
-        return self._request('POST', BASE_URL, json_data=data)
+        result = self._request('POST', self.base_url, json_data=data)
+        # The backend API uses "Category", app.py "category"
+        category = data.get("Category", data.get("category"))
+        self._invalidate("list", "search", "text",
+                         f"category:{category.lower()}" if isinstance(category, str) else "category")
+        return result
 
     def delete_media(self, media_id: str) -> Optional[Dict[str, Any]]:
         """Endpoint 6: Delete a specific media item."""
-        url = f"{BASE_URL}/{media_id}"
-        return self._request('DELETE', url)
\ No newline at end of file
+        url = f"{self.base_url}/{media_id}"
+        result = self._request('DELETE', url)
+        # The item's category is not known here, so every category listing goes
+        self._invalidate("list", "category", "search", "text", f"details:{media_id}")
+        return result
+
+    def get_changes(self, cursor: Optional[str] = None, wait: float = 0,
+                    limit: int = CHANGES_LIMIT) -> Dict[str, Any]:
+        """Endpoint 8: creates and deletes after ``cursor``, as {"changes": [...], "cursor": ...}.
+
+        Without a cursor there are no changes, only the cursor to follow the
+        feed from. With ``wait`` the server holds the request up to that many
+        seconds until a change arrives. When the cursor has aged out of the
+        server's buffer the result is {"error": ..., "expired": True,
+        "cursor": ...}: reload the data, then continue from that cursor.
+
+        Cached responses the changes may affect are dropped, so writes made
+        by other clients are not answered from the cache.
+        """
+        params = {'limit': limit}
+        if cursor:
+            params['since'] = cursor
+        if wait:
+            params['timeout'] = wait
+        try:
+            response = self._send('GET', f"{self.base_url}/changes", params=params,
+                                  timeout=(self.timeout[0], self.timeout[1] + wait))
+            result = response.json()
+        except requests.exceptions.ConnectionError:
+            return {"error": "Connection Failed. Ensure the Flask backend is running on 127.0.0.1:5000."}
+        except requests.exceptions.Timeout:
+            return {"error": "Request timed out."}
+        except ValueError:
+            return {"error": f"API Error (Status: {response.status_code}). Response was not JSON."}
+        if response.status_code == 410:
+            return {"error": result.get("error", "Cursor has expired."), "expired": True, "cursor": result.get("cursor")}
+        if response.status_code != 200:
+            return {"error": result.get("error", f"Unknown API Error (Status: {response.status_code})")}
+        tags = set()
+        for change in result["changes"]:
+            if change["op"] == "create":
+                category = change["item"].get("Category", change["item"].get("category"))
+                tags.add(f"category:{category.lower()}" if isinstance(category, str) else "category")
+            else:
+                tags.update(("category", f"details:{change['id']}"))
+        if tags:
+            self._invalidate("list", "search", "text", *tags)
+        return result
+
+    def apply_batch(self, operations: List[Dict[str, Any]], chunk_size: int = BATCH_CHUNK_SIZE) -> Dict[str, Any]:
+        """Endpoint 7: Applies create/delete operations in chunks of ``chunk_size``.
+
+        Each chunk is applied atomically by the server. Stops at the first
+        rejected chunk and reports how many operations were applied before it,
+        with the server's per-operation results for that chunk if it sent them.
+        """
+        url = f"{self.base_url}/batch"
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(operations), chunk_size):
+            result = self._request('POST', url, json_data={"operations": operations[start:start + chunk_size]})
+            if self.cache is not None:
+                self.cache.clear()
+            if "error" in result:
+                rejected = {"error": result["error"], "applied": len(results)}
+                if "results" in result:
+                    rejected["results"] = [dict(item, index=item["index"] + start) for item in result["results"]]
+                return rejected
+            for item in result["results"]:
+                item["index"] += start
+                results.append(item)
+        return {"results": results, "applied": len(results)}
+
+    def bulk_create(self, items: List[Dict[str, str]], chunk_size: int = BATCH_CHUNK_SIZE) -> Dict[str, Any]:
+        """Creates many media items via the batch endpoint."""
+        return self.apply_batch([{"op": "create", "data": item} for item in items], chunk_size)
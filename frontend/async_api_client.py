@@ -0,0 +1,115 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Iterable
+
+from .api_client import ApiClient, BASE_URL
+
+# Requests in flight at once
+CONCURRENCY = 10
+# Seconds a single request may take before it is reported as timed out
+REQUEST_TIMEOUT = 10.0
+
+
+def _set_done(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AsyncApiClient:
+    """Asyncio counterpart of ApiClient, for fetching many things at once.
+
+    Each call runs a blocking ApiClient request on a worker thread, so the
+    pooled connections, retries and ETag revalidation are shared with the
+    synchronous client; at most ``concurrency`` requests are in flight.
+    Errors come back as ``{"error": ...}`` dictionaries, like ApiClient.
+    A request's timeout starts when its thread starts it, not while it
+    waits for a slot. One that exceeds it is reported as timed out at once,
+    while its thread finishes in the background and keeps its slot until
+    then (the read timeout of the underlying client bounds how long that
+    takes). The underlying client does not retry, since a retry could run
+    long past the timeout.
+
+        async with AsyncApiClient() as client:
+            items = await client.get_many_details(ids)
+    """
+
+    def __init__(self, base_url: str = BASE_URL, concurrency: int = CONCURRENCY,
+                 timeout: float = REQUEST_TIMEOUT, **client_options):
+        self.timeout = timeout
+        self._client = ApiClient(base_url, pool_size=concurrency, read_timeout=timeout, max_retries=0,
+                                 **client_options)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='api-client')
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def close(self) -> None:
+        """Waits for running requests, then closes the pooled connections."""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self._client.close()
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _call(self, method, *args, timeout: Optional[float] = None) -> Any:
+        """Runs ``method(*args)`` of the synchronous client on a worker thread."""
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+
+        def run():
+            loop.call_soon_threadsafe(_set_done, started)
+            return method(*args)
+
+        await self._slots.acquire()
+        try:
+            future = loop.run_in_executor(self._executor, run)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Released when the thread is done, not when the caller stops waiting
+        future.add_done_callback(self._release)
+        await started
+        try:
+            # Shielded: cancelling the future would release the slot early
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            return {"error": "Request timed out."}
+
+    def _release(self, future: asyncio.Future) -> None:
+        self._slots.release()
+        if not future.cancelled():
+            # Marks a late failure as seen, if nobody waits for it any more
+            future.exception()
+
+    async def get_all_media(self) -> List[Dict[str, Any]]:
+        """Endpoint 1: List all available media."""
+        return await self._call(self._client.get_all_media)
+
+    async def get_media_by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Endpoint 2: List media by category."""
+        return await self._call(self._client.get_media_by_category, category)
+
+    async def search_media_by_name(self, name: str) -> List[Dict[str, Any]]:
+        """Endpoint 3: Search for media items by exact name."""
+        return await self._call(self._client.search_media_by_name, name)
+
+    async def get_media_details(self, media_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Endpoint 4: Display the metadata of a specific media item."""
+        return await self._call(self._client.get_media_details, media_id, timeout=timeout)
+
+    async def create_media(self, data: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Endpoint 5: Create a new media item."""
+        return await self._call(self._client.create_media, data)
+
+    async def delete_media(self, media_id: str) -> Optional[Dict[str, Any]]:
+        """Endpoint 6: Delete a specific media item."""
+        return await self._call(self._client.delete_media, media_id)
+
+    async def get_many_details(self, media_ids: Iterable[str], timeout: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+        """Fetches the details of many items concurrently, in the order of ``media_ids``.
+
+        Each entry is the item or an error dictionary for that id alone;
+        ``timeout`` applies to each request separately.
+        """
+        return await asyncio.gather(*(self.get_media_details(media_id, timeout) for media_id in media_ids))
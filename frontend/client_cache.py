@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Tuple
+
+# Entries kept before the least recently used one is dropped
+DEFAULT_MAX_ENTRIES = 256
+# Seconds a response stays fresh, per endpoint
+DEFAULT_TTLS = {
+    "list": 30.0,
+    "category": 30.0,
+    "search": 10.0,
+    "text": 10.0,
+    "details": 60.0,
+}
+# Seconds after expiry during which a stale response is still returned
+# while a fresh one is fetched in the background
+DEFAULT_STALE_TTL = 300.0
+
+FRESH, STALE = "fresh", "stale"
+
+
+class ClientCache:
+    """LRU cache of parsed API responses, for ApiClient.
+
+    Entries are keyed by (method, url, params) and remember the endpoint
+    they came from, which decides their TTL, and a set of tags used to
+    drop them when a write may have changed them. A fresh entry is served
+    without contacting the server; an expired one is served for up to
+    ``stale_ttl`` seconds more while the caller refreshes it (stale while
+    revalidate). Cached values are shared and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttls: Optional[Dict[str, float]] = None,
+                 stale_ttl: float = DEFAULT_STALE_TTL, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        # key -> (expires_at, tags, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, FrozenSet[str], Any]]" = OrderedDict()
+        self._refreshing = set()
+        # Bumped by every invalidation; a response fetched across one is not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0,
+                       "evictions": 0, "invalidations": 0}
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[str], Any, int]:
+        """Returns (FRESH or STALE or None, value, generation) for key.
+
+        The generation is passed back to put() when the response fetched
+        after a miss (or for a refresh) arrives.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, value = entry
+                if now < expires_at:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return FRESH, value, self._generation
+                if now < expires_at + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._stats["stale_hits"] += 1
+                    return STALE, value, self._generation
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return None, None, self._generation
+
+    def start_refresh(self, key: Hashable) -> bool:
+        """Claims the background refresh of a stale key; False if one is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._stats["refreshes"] += 1
+            return True
+
+    def end_refresh(self, key: Hashable) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def put(self, key: Hashable, endpoint: str, tags: Iterable[str], value: Any, generation: int) -> None:
+        """Stores a response unless an invalidation happened since ``generation`` was read."""
+        expires_at = self._clock() + self.ttls[endpoint]
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = (expires_at, frozenset(tags), value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Drops every entry carrying one of ``tags``."""
+        tags = set(tags)
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, (_, entry_tags, _) in self._entries.items() if entry_tags & tags]:
+                del self._entries[key]
+                self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the counters and the number of entries.
+
+        ``hits`` are requests answered without any network call;
+        ``stale_hits`` were answered at once but started a ``refresh``.
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
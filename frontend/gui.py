@@ -1,29 +1,97 @@
 import sys
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QTableWidget, QTableWidgetItem, QComboBox, QLineEdit, QPushButton, 
-    QLabel, QGridLayout, QMessageBox, QInputDialog, QHeaderView
+    QTableView, QAbstractItemView, QComboBox, QLineEdit, QPushButton, 
+    QLabel, QGridLayout, QMessageBox, QInputDialog, QHeaderView, QProgressBar
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 
 # Ensure this import matches the file name 'api_client.py' in the same directory
 from .api_client import ApiClient
+from .local_search import LocalSearchIndex
+from .media_model import MediaTableModel, make_proxy
+from .record_store import RecordStore
+from .workers import ApiDispatcher, ChangePoller
 
 # --- Constants and Setup ---
 CATEGORIES = ["All", "Book", "Film", "Magazine"]
 METADATA_FIELDS = ["id", "Name", "Author", "Publication date", "Category"]
 # Headers for the table display
 TABLE_HEADERS = ["ID", "Name", "Author", "Publication Date", "Category"] 
+# Background call channels: a new call on a channel supersedes the previous one
+LIST_CHANNEL = "list"
+DETAILS_CHANNEL = "details"
+SEARCH_CHANNEL = "search"
+# Seconds after which a selected record is fetched again in case it changed
+RECORD_STALE_AFTER = 60.0
+# Quiet time after the last selection change before that refetch starts
+DETAILS_REFRESH_DELAY_MS = 400
+# Quiet time after a keystroke before the table is filtered (coalesces pastes and key repeat)
+SEARCH_DEBOUNCE_MS = 50
+# Quiet time after a keystroke before the server is searched for rows not loaded yet
+SERVER_SEARCH_DELAY_MS = 300
+# Server matches added below the local ones
+SERVER_SEARCH_LIMIT = 50
+
+
+def is_error(result) -> bool:
+    return isinstance(result, dict) and "error" in result
 
 class LibraryApp(QMainWindow):
-    """Main application window for the Online Library GUI."""
-
-    def __init__(self):
+    """Main application window for the Online Library GUI.
+
+    API calls run on worker threads (see ApiDispatcher) and their results
+    are applied by the ``_on_*`` slots, so a slow backend never freezes the
+    window. Loading the list, filtering and searching share one channel:
+    whichever the user asked for last is what the table shows.
+
+    Every item received is kept in a RecordStore, and the details panel is
+    rendered from it without a request; only a record older than
+    RECORD_STALE_AFTER is refetched, once the selection has settled.
+
+    Typing in the search box filters the loaded rows through a
+    LocalSearchIndex, without a request. While the listing still has pages
+    on the server, the server's text search runs once typing pauses and its
+    matches that are not loaded are listed below the local ones. Enter (or
+    the Search button) still runs the exact-name search on the server.
+
+    Creates and deletes, whether made here or by other clients, arrive
+    through the server's change feed (see ChangePoller) and are applied to
+    the table, the records and the search index in place. Every listing
+    takes a feed cursor just before its first page, so each later change
+    is either in the pages or delivered by the feed. Only when the server
+    no longer has the changes after that cursor is the listing reloaded.
+    """
+
+    def __init__(self, api_client=None):
         super().__init__()
         self.setWindowTitle("Online Library Management (PyQt6)")
         self.setGeometry(100, 100, 1200, 700)
         
-        self.api_client = ApiClient()
+        self.api_client = api_client or ApiClient()
+        self.dispatcher = ApiDispatcher(self)
+        self.records = RecordStore()
+        self.change_poller = ChangePoller(self.api_client.get_changes, self)
+        self.change_poller.changes.connect(self._apply_changes)
+        self.change_poller.expired.connect(self._on_changes_expired)
+        self.change_poller.failed.connect(self._on_changes_failed)
+        # Whether a created item belongs in the current listing
+        self._listing_accepts = lambda item: True
+        self._details_refresh_timer = QTimer(self)
+        self._details_refresh_timer.setSingleShot(True)
+        self._details_refresh_timer.setInterval(DETAILS_REFRESH_DELAY_MS)
+        self._details_refresh_timer.timeout.connect(self._refresh_selected_details)
+        self.search_index = LocalSearchIndex()
+        # (query, items) from the last server text search
+        self._server_matches = ("", [])
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self.apply_search)
+        self._server_search_timer = QTimer(self)
+        self._server_search_timer.setSingleShot(True)
+        self._server_search_timer.setInterval(SERVER_SEARCH_DELAY_MS)
+        self._server_search_timer.timeout.connect(self._search_server)
         
         # Central Widget and Layout
         central_widget = QWidget()
@@ -51,13 +119,13 @@ class LibraryApp(QMainWindow):
             QPushButton:hover {
                 background-color: #1557b0;
             }
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 alternate-background-color: #f9f9f9;
                 gridline-color: #ddd;
                 color: #000;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
                 color: #000;
             }
@@ -97,6 +165,14 @@ class LibraryApp(QMainWindow):
         main_layout.addWidget(self.detail_panel, 1) 
         
         self._init_details_view(detail_layout)
+
+        # Non-blocking loading indicator, shown while requests are in flight
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0)
+        self.busy_indicator.setMaximumWidth(120)
+        self.busy_indicator.hide()
+        self.statusBar().addPermanentWidget(self.busy_indicator)
+        self.dispatcher.busy_changed.connect(self._show_busy)
         
         # Initial load attempt
         self.load_media()
@@ -115,10 +191,11 @@ class LibraryApp(QMainWindow):
         self.category_combo.currentTextChanged.connect(self.filter_media)
         control_layout.addWidget(self.category_combo, 0, 1)
 
-        # Search by Name (Endpoint 3)
-        control_layout.addWidget(QLabel("Search by Name:"), 1, 0)
+        # Search as you type; Enter searches by exact name (Endpoint 3)
+        control_layout.addWidget(QLabel("Search:"), 1, 0)
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Enter exact name...")
+        self.search_input.setPlaceholderText("Type to filter by name or author, Enter for exact name...")
+        self.search_input.textChanged.connect(self._on_search_text_changed)
         control_layout.addWidget(self.search_input, 1, 1)
         
         self.search_button = QPushButton("Search")
@@ -136,20 +213,30 @@ class LibraryApp(QMainWindow):
         layout.addWidget(control_group)
 
     def _init_table(self, layout):
-        """Initializes the QTableWidget for displaying media list."""
-        self.media_table = QTableWidget()
-        self.media_table.setColumnCount(len(TABLE_HEADERS))
-        self.media_table.setHorizontalHeaderLabels(TABLE_HEADERS)
-        self.media_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.media_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        """Initializes the table view, its model and the sorting proxy."""
+        # Items stay plain dicts in the model; the view only renders the rows on screen
+        self.media_model = MediaTableModel(METADATA_FIELDS, TABLE_HEADERS, self)
+        self.media_model.page_loaded.connect(self._on_page_loaded)
+        self.media_model.fetch_failed.connect(self._on_fetch_failed)
+        self.media_proxy = make_proxy(self.media_model, self)
+
+        self.media_table = QTableView()
+        self.media_table.setModel(self.media_proxy)
+        self.media_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.media_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.media_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         
         # Auto-resize columns
         header = self.media_table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents) 
 
+        # Click a header to sort the loaded rows; until then rows keep the server's order
+        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.media_table.setSortingEnabled(True)
+
         # Connect selection event to display details (Endpoint 4)
-        self.media_table.itemSelectionChanged.connect(self.display_selected_details)
+        self.media_table.selectionModel().selectionChanged.connect(self.display_selected_details)
         
         layout.addWidget(self.media_table)
 
@@ -177,66 +264,208 @@ class LibraryApp(QMainWindow):
         self.delete_button.setEnabled(False)
         layout.addWidget(self.delete_button)
 
+    def closeEvent(self, event):
+        """Lets running requests finish before the window goes away."""
+        self._search_timer.stop()
+        self._server_search_timer.stop()
+        self.change_poller.stop()
+        self.dispatcher.wait()
+        self.api_client.close()
+        super().closeEvent(event)
+
+    def _show_busy(self, busy):
+        self.busy_indicator.setVisible(busy)
+        if busy:
+            self.statusBar().showMessage("Loading...")
+        else:
+            self.statusBar().clearMessage()
+
     # --- Data Loading and Filtering ---
 
+    def _clear_details(self):
+        """Empties the details panel and forgets any details still being fetched."""
+        self._details_refresh_timer.stop()
+        self.dispatcher.cancel(DETAILS_CHANNEL)
+        for label in self.detail_labels.values():
+            label.setText("N/A")
+        self.delete_button.setEnabled(False)
+
     def load_media(self, media_data=None):
-        """Loads data into the table, handling potential errors."""
+        """Shows ``media_data``, or all media page by page as the user scrolls if none is given."""
         # Clear any previous selection so old details do not remain
         self.media_table.clearSelection()
         # Also clear detail labels immediately when loading new list
-        for label in self.detail_labels.values():
-            label.setText("N/A")
-        self.delete_button.setEnabled(False)
-        
+        self._clear_details()
+
         if media_data is None:
             # Endpoint 1: Load all media
-            media_data = self.api_client.get_all_media()
-            
-            # Handle connection/API error
-            if isinstance(media_data, dict) and "error" in media_data:
-                 QMessageBox.critical(self, "Connection Error", media_data["error"])
-                 self.media_table.setRowCount(0)
-                 return
-                 
-        self.media_table.setRowCount(len(media_data))
-        
-        for row, item in enumerate(media_data):
-            media_id = str(item.get("id", "")) 
-            
-            # Create the list of values to display in the table
-            display_values = [media_id] + [item.get(field) for field in METADATA_FIELDS[1:]] 
-
-            for col, value in enumerate(display_values):
-                cell = QTableWidgetItem(str(value))
-                self.media_table.setItem(row, col, cell)
-                
-        if not media_data and self.category_combo.currentText() == "All":
+            self._load_pages(None)
+        else:
+            self.records.add_many(media_data)
+            # A fixed list; callers that know what it holds may widen this
+            self._listing_accepts = lambda item: False
+            self._reset_search_index()
+            self.media_model.set_items(media_data)
+            self.search_index.extend(media_data)
+            self.apply_search()
+
+    def _load_pages(self, category):
+        """Starts a paged listing of one category (or all media for None)."""
+        def request_page(cursor, callback):
+            def deliver(page):
+                if isinstance(page, tuple):
+                    feed_cursor, page = page
+                    self.change_poller.follow(feed_cursor)
+                if isinstance(page, dict) and "items" in page:
+                    self.records.add_many(page["items"])
+                callback(page)
+            if cursor is None:
+                self.dispatcher.run(LIST_CHANNEL, self._first_page, category, callback=deliver)
+            else:
+                self.dispatcher.run(LIST_CHANNEL, self.api_client.get_media_page, category, cursor, callback=deliver)
+        self._listing_accepts = lambda item: category is None or item.get("Category") == category
+        self._reset_search_index()
+        self.media_model.start_paging(request_page)
+
+    def _first_page(self, category):
+        """Runs on a worker thread: (change feed cursor, first page), the cursor taken first."""
+        feed = self.api_client.get_changes()
+        # Without the feed the listing still loads; polling then starts from whatever is current
+        return (None if is_error(feed) else feed["cursor"]), self.api_client.get_media_page(category, None)
+
+    def _reset_search_index(self):
+        """Forgets the indexed rows and server matches of the previous listing."""
+        self.search_index.clear()
+        self._server_matches = ("", [])
+        self.dispatcher.cancel(SEARCH_CHANNEL)
+
+    def _on_page_loaded(self, row_count):
+        loaded = self.media_model.loaded_items
+        if len(self.search_index) < len(loaded):
+            self.search_index.extend(loaded[len(self.search_index):])
+            self.apply_search()
+        if not row_count and self.category_combo.currentText() == "All":
              self.statusBar().showMessage("No media items found.", 3000)
 
+    def _on_fetch_failed(self, message):
+        QMessageBox.critical(self, "Connection Error", message)
+
+    # --- Changes from the server ---
+
+    def _apply_changes(self, changes):
+        """Applies creates and deletes to the loaded rows without reloading them."""
+        selected = self._selected_id()
+        created = []
+        for change in changes:
+            if change["op"] == "create":
+                item = change["item"]
+                self.records.add(item)
+                # While pages are left, a new item (which has the highest id) arrives with the last one
+                if str(item.get("id", "")) not in self.search_index and not self.media_model.has_more_pages \
+                        and self._listing_accepts(item):
+                    created.append(item)
+            else:
+                # Positions must be final before a row is taken out
+                self._add_rows(created)
+                created = []
+                self._remove_row(str(change["id"]))
+        self._add_rows(created)
+        if created and self.search_input.text().strip():
+            self.apply_search()
+        if selected is not None and self._selected_id() != selected:
+            self.display_selected_details()
+
+    def _add_rows(self, items):
+        if items:
+            self.media_model.append_items(items)
+            self.search_index.extend(items)
+
+    def _remove_row(self, media_id):
+        self.records.remove(media_id)
+        position = self.search_index.remove(media_id)
+        if position is not None:
+            self.media_model.remove_item(position)
+        query, matches = self._server_matches
+        if any(str(item.get("id", "")) == media_id for item in matches):
+            self._server_matches = (query, [item for item in matches if str(item.get("id", "")) != media_id])
+            self.media_model.remove_extra(media_id)
+
+    def _on_changes_expired(self):
+        """Changes were missed (e.g. the server restarted): reloads the current listing."""
+        self.statusBar().showMessage("Reloading: the list fell too far behind the server.", 5000)
+        self.filter_media()
+
+    def _on_changes_failed(self, message):
+        # The table keeps working; it just stops following other clients' changes for a while
+        self.statusBar().showMessage(f"Live updates paused: {message}", 5000)
+
     def filter_media(self):
         """Called when category dropdown changes (Endpoint 2)."""
         category = self.category_combo.currentText()
         if category == "All":
             self.load_media()
         else:
-            media_data = self.api_client.get_media_by_category(category)
-            if isinstance(media_data, dict) and "error" in media_data:
-                QMessageBox.critical(self, "API Error", media_data["error"])
-            else:
-                self.load_media(media_data)
+            self.media_table.clearSelection()
+            self._clear_details()
+            self._load_pages(category)
+
+    def _on_search_text_changed(self):
+        # A keystroke supersedes the server search of the previous text
+        self._server_search_timer.stop()
+        self.dispatcher.cancel(SEARCH_CHANNEL)
+        self._search_timer.start()
+
+    def apply_search(self):
+        """Filters the table to the loaded rows matching the search box, plus any server matches."""
+        query = self.search_input.text().strip()
+        rows = self.search_index.search(query)
+        if rows is None:
+            self.media_model.clear_filter()
+            return
+        extra = []
+        if self._server_matches[0] == query:
+            extra = [item for item in self._server_matches[1] if str(item.get("id", "")) not in self.search_index]
+        self.media_model.set_filter(rows, extra)
+        if self.media_model.has_more_pages and self._server_matches[0] != query:
+            self._server_search_timer.start()
+
+    def _search_server(self):
+        """Looks for matches among the rows the listing has not loaded yet."""
+        query = self.search_input.text().strip()
+        if not query or not self.media_model.has_more_pages:
+            return
+        self.dispatcher.run(SEARCH_CHANNEL, self.api_client.search_media_text, query, SERVER_SEARCH_LIMIT,
+                            callback=lambda result: self._on_server_matches(query, result))
+
+    def _on_server_matches(self, query, result):
+        if query != self.search_input.text().strip():
+            return
+        if is_error(result):
+            # The local matches are still shown; no need to interrupt the user
+            self.statusBar().showMessage(f"Could not search the server: {result['error']}", 5000)
+            return
+        category = self.category_combo.currentText()
+        matches = [item for item in result if category == "All" or item.get("Category") == category]
+        self.records.add_many(matches)
+        self._server_matches = (query, matches)
+        self.apply_search()
 
     def search_media(self):
-        """Called when Search button is clicked (Endpoint 3)."""
+        """Called when Search button is clicked or Enter is pressed (Endpoint 3)."""
         name = self.search_input.text().strip()
         if not name:
             QMessageBox.warning(self, "Input Required", "Please enter the exact name of the medium to search.")
             return
 
-        media_data = self.api_client.search_media_by_name(name)
-        if isinstance(media_data, dict) and "error" in media_data:
+        self.dispatcher.run(LIST_CHANNEL, self.api_client.search_media_by_name, name,
+                            callback=lambda media_data: self._on_search_done(name, media_data))
+
+    def _on_search_done(self, name, media_data):
+        if is_error(media_data):
              QMessageBox.critical(self, "API Error", media_data["error"])
         else:
              self.load_media(media_data)
+             self._listing_accepts = lambda item: str(item.get("Name", "")).casefold() == name.casefold()
              # If results found, select the first row to trigger detail display
              if media_data and len(media_data) > 0:
                  self.media_table.selectRow(0)
@@ -252,35 +481,61 @@ class LibraryApp(QMainWindow):
         selected_rows = self.media_table.selectionModel().selectedRows()
         if not selected_rows:
             # Clear details if nothing is selected
-            for label in self.detail_labels.values():
-                label.setText("N/A")
-            self.delete_button.setEnabled(False)
+            self._clear_details()
             return
 
-        row = selected_rows[0].row()
-        id_item = self.media_table.item(row, 0)
-        media_id = id_item.text() if id_item is not None else None
+        item = self._item_at(selected_rows[0])
+        media_id = str(item.get("id", ""))
 
         if not media_id:
-            for label in self.detail_labels.values():
-                label.setText("N/A")
-            self.delete_button.setEnabled(False)
+            self._clear_details()
             return
 
-        # Load details from API
-        details = self.api_client.get_media_details(media_id)
+        # The row already holds every field: render from the local records,
+        # and restart the quiet period before checking whether to refetch
+        self._show_details(self.records.get(media_id) or item)
+        self.dispatcher.cancel(DETAILS_CHANNEL)
+        self._details_refresh_timer.start()
 
-        if isinstance(details, dict) and "error" in details:
-            QMessageBox.critical(self, "API Error", details["error"])
-            self.delete_button.setEnabled(False)
-            return
+    def _item_at(self, index):
+        """Returns the item dict behind a (sorted) table index."""
+        return self.media_model.item(self.media_proxy.mapToSource(index).row())
+
+    def _selected_id(self):
+        selected_rows = self.media_table.selectionModel().selectedRows()
+        if not selected_rows:
+            return None
+        return str(self._item_at(selected_rows[0]).get("id", "")) or None
 
+    def _show_details(self, details):
         # Update detail labels (ensure string conversion)
         for field in METADATA_FIELDS:
             self.detail_labels[field].setText(str(details.get(field, "N/A")))
 
         self.delete_button.setEnabled(True)
 
+    def _refresh_selected_details(self):
+        """Refetches the selected record (Endpoint 4) if it may be out of date."""
+        media_id = self._selected_id()
+        if media_id is None:
+            return
+        age = self.records.age(media_id)
+        if age is not None and age < RECORD_STALE_AFTER:
+            return
+        self.dispatcher.run(DETAILS_CHANNEL, self.api_client.get_media_details, media_id,
+                            callback=lambda details: self._on_details_refreshed(media_id, details))
+
+    def _on_details_refreshed(self, media_id, details):
+        if is_error(details):
+            # The panel still shows the loaded record; no need to interrupt the user
+            self.statusBar().showMessage(f"Could not refresh details: {details['error']}", 5000)
+            return
+        self.records.add(details)
+        selected_rows = self.media_table.selectionModel().selectedRows()
+        if selected_rows and self._selected_id() == media_id:
+            self.media_model.replace_item(self.media_proxy.mapToSource(selected_rows[0]).row(), details)
+            self._show_details(details)
+
     def show_create_dialog(self):
         """Presents a dialog for creating a new media item (Endpoint 5)."""
         
@@ -306,41 +561,48 @@ class LibraryApp(QMainWindow):
             "Category": category,
         }
         
-        result = self.api_client.create_media(data) # Endpoint 5
+        # Endpoint 5
+        self.dispatcher.run(None, self.api_client.create_media, data,
+                            callback=lambda result: self._on_media_created(name, result))
 
-        if isinstance(result, dict) and "error" in result:
+    def _on_media_created(self, name, result):
+        if is_error(result):
             QMessageBox.critical(self, "Creation Failed", result["error"])
         else:
             QMessageBox.information(self, "Success", f"Media '{name}' created successfully!")
-            self.load_media() # Reload the list
+            # The feed delivers it as well; applying it twice changes nothing
+            self._apply_changes([{"op": "create", "item": result}])
 
     def delete_media(self):
         """Deletes the selected media item (Endpoint 6)."""
-        selected_items = self.media_table.selectedItems()
-        if not selected_items:
+        selected_rows = self.media_table.selectionModel().selectedRows()
+        if not selected_rows:
             QMessageBox.warning(self, "Selection Required", "Please select a media item to delete.")
             return
 
         # Get the ID and name of the selected item
-        row = selected_items[0].row()
-        media_id = self.media_table.item(row, 0).text()
-        media_name = self.media_table.item(row, 1).text()
+        item = self._item_at(selected_rows[0])
+        media_id = str(item.get("id", ""))
+        media_name = str(item.get("Name", ""))
 
         reply = QMessageBox.question(self, 'Confirm Delete',
             f"Are you sure you want to permanently delete '{media_name}' (ID: {media_id})?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
 
         if reply == QMessageBox.StandardButton.Yes:
-            result = self.api_client.delete_media(media_id) # Endpoint 6
+            # Endpoint 6; no second delete while this one is on its way
+            self.delete_button.setEnabled(False)
+            self.dispatcher.run(None, self.api_client.delete_media, media_id,
+                                callback=lambda result: self._on_media_deleted(media_id, media_name, result))
 
-            if isinstance(result, dict) and "error" in result:
-                QMessageBox.critical(self, "Deletion Failed", result["error"])
-            else:
-                QMessageBox.information(self, "Success", f"Media '{media_name}' deleted successfully!")
-                self.load_media() # Reload the list
-                for label in self.detail_labels.values():
-                    label.setText("N/A") # Clear details
-                self.delete_button.setEnabled(False)
+    def _on_media_deleted(self, media_id, media_name, result):
+        if is_error(result):
+            QMessageBox.critical(self, "Deletion Failed", result["error"])
+            self.delete_button.setEnabled(self.media_table.selectionModel().hasSelection())
+        else:
+            QMessageBox.information(self, "Success", f"Media '{media_name}' deleted successfully!")
+            self._apply_changes([{"op": "delete", "id": media_id}])
+            self._clear_details()
 
 # --- Main Execution ---
 if __name__ == '__main__':
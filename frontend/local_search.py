@@ -0,0 +1,136 @@
+import operator
+import re
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import compress, repeat
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Item fields searched as the user types
+SEARCH_FIELDS = ("Name", "Author")
+# Word prefixes up to this length have their own posting list
+PREFIX_LENGTH = 3
+
+_EMPTY = array('I')
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into casefolded word tokens."""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def _prefixes(words: List[str]) -> set:
+    """The distinct prefixes of up to PREFIX_LENGTH characters of ``words``."""
+    return {word[:length] for word in words for length in range(1, min(PREFIX_LENGTH, len(word)) + 1)}
+
+
+class LocalSearchIndex:
+    """Word-prefix index over the rows loaded into the GUI table.
+
+    A row matches a query when every query word starts one of the words of
+    its searched fields ("dun her" matches "Dune" by "Frank Herbert"). Rows
+    are numbered in the order they were added, and results come back in
+    that order as a sequence of row numbers.
+
+    Every prefix of up to PREFIX_LENGTH characters maps to a sorted array of
+    the rows having it, so a short query is a single dictionary lookup.
+    Longer words are checked on the rows of their first PREFIX_LENGTH
+    characters (or of the previous result, when the query only grew since
+    the last search), with C-level substring tests over each row's text.
+
+    remove() takes a row out without renumbering the postings: rows keep
+    the slot they were added in, and the slots removed so far are
+    subtracted from the results, so later rows move up by one like the
+    table's rows do.
+    """
+
+    def __init__(self, fields: Sequence[str] = SEARCH_FIELDS):
+        self.fields = tuple(fields)
+        self._postings: Dict[str, array] = {}
+        # Per row: its words, each preceded by a space (" dune frank herbert")
+        self._texts: List[str] = []
+        # id -> slot (the row number it was added as)
+        self._ids: Dict[str, int] = {}
+        # Sorted slots of the removed rows
+        self._removed: List[int] = []
+        # Last (terms, rows), reused while the user keeps typing
+        self._last = None
+
+    def __len__(self) -> int:
+        return len(self._texts) - len(self._removed)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._texts.clear()
+        self._ids.clear()
+        self._removed.clear()
+        self._last = None
+
+    def extend(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Adds rows after the existing ones."""
+        postings = self._postings
+        for item in items:
+            row = len(self._texts)
+            words = tokenize(" ".join(str(item.get(field) or "") for field in self.fields))
+            self._texts.append(" " + " ".join(words))
+            self._ids[str(item.get("id", ""))] = row
+            for prefix in _prefixes(words):
+                posting = postings.get(prefix)
+                if posting is None:
+                    postings[prefix] = posting = array('I')
+                posting.append(row)
+        self._last = None
+
+    def __contains__(self, media_id: str) -> bool:
+        return media_id in self._ids
+
+    def position(self, media_id: str) -> Optional[int]:
+        """Current row number of an item, or None if it is not indexed."""
+        slot = self._ids.get(media_id)
+        return None if slot is None else slot - bisect_left(self._removed, slot)
+
+    def remove(self, media_id: str) -> Optional[int]:
+        """Takes an item's row out; returns the row number it had, or None if it was not indexed."""
+        row = self.position(media_id)
+        if row is None:
+            return None
+        slot = self._ids.pop(media_id)
+        for prefix in _prefixes(self._texts[slot].split()):
+            posting = self._postings[prefix]
+            del posting[bisect_left(posting, slot)]
+        self._texts[slot] = ""
+        insort(self._removed, slot)
+        self._last = None
+        return row
+
+    def search(self, query: str) -> Optional[Sequence[int]]:
+        """Returns the matching row numbers in row order, or None for a query without words."""
+        terms = tokenize(query)
+        if not terms:
+            return None
+        last = self._last
+        if last is not None and len(terms) >= len(last[0]) and \
+                all(term.startswith(old) for term, old in zip(terms, last[0])):
+            # The query only grew: every match is among the previous matches
+            rows = last[1]
+            checks = [term for i, term in enumerate(terms) if i >= len(last[0]) or term != last[0][i]]
+        else:
+            lookups = sorted(((self._postings.get(term[:PREFIX_LENGTH], _EMPTY), term) for term in terms),
+                             key=lambda lookup: len(lookup[0]))
+            # A copy, as the posting keeps growing while rows are added
+            rows = lookups[0][0][:]
+            # The smallest posting is exact for a short word; everything else is verified
+            checks = [term for posting, term in lookups[1:]]
+            if len(lookups[0][1]) > PREFIX_LENGTH:
+                checks.append(lookups[0][1])
+        texts = self._texts.__getitem__
+        for term in checks:
+            if not rows:
+                break
+            rows = list(compress(rows, map(operator.contains, map(texts, rows), repeat(" " + term))))
+        self._last = (terms, rows)
+        if self._removed:
+            removed = self._removed
+            return [slot - bisect_right(removed, slot) for slot in rows]
+        return rows
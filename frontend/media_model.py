@@ -0,0 +1,245 @@
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt, pyqtSignal
+
+# Rows made visible at a time when a whole list is already in memory
+ROWS_PER_FETCH = 1000
+
+# request_page(cursor, callback): fetches one page in the background and
+# calls callback({"items": [...], "next_cursor": ...} or {"error": ...})
+PageRequester = Callable[[Optional[str], Callable[[Any], None]], None]
+
+
+class MediaTableModel(QAbstractTableModel):
+    """Read-only table over a plain list of item dicts.
+
+    Cell text is produced on demand in data(), so a row costs one dict and
+    no Qt objects, and the view only asks for the rows on screen. Rows are
+    added through canFetchMore/fetchMore as the view scrolls down: either
+    from the next server page (start_paging) or, for a list already in
+    memory (set_items), ROWS_PER_FETCH at a time.
+
+    set_filter() narrows the table to some of the loaded rows (by position,
+    as returned by LocalSearchIndex.search) plus extra items that are not
+    loaded; no paging happens until clear_filter().
+
+    append_items() and remove_item() apply changes made elsewhere (see
+    ChangePoller) without reloading, filtered or not.
+    """
+
+    # Emitted after each page with the number of rows loaded so far
+    page_loaded = pyqtSignal(int)
+    # Emitted with the error message when a page cannot be fetched; paging stops
+    fetch_failed = pyqtSignal(str)
+
+    def __init__(self, fields: Sequence[str], headers: Sequence[str], parent=None):
+        super().__init__(parent)
+        self.fields = list(fields)
+        self.headers = list(headers)
+        self._items: List[Dict[str, Any]] = []
+        # Rows the view can see; below len(_items) while an in-memory list is revealed
+        self._visible = 0
+        self._request_page: Optional[PageRequester] = None
+        self._next_cursor: Optional[str] = None
+        self._has_more = False
+        self._loading = False
+        # Bumped on every reset, so pages requested for an older listing are dropped
+        self._generation = 0
+        # While filtered: positions in _items shown, then items from elsewhere
+        self._rows: Optional[Sequence[int]] = None
+        self._extra: List[Dict[str, Any]] = []
+
+    # --- Loading ---
+
+    def set_items(self, items: List[Dict[str, Any]]) -> None:
+        """Shows a list that is already complete (e.g. search results)."""
+        self._reset(items)
+        self.fetchMore(QModelIndex())
+
+    def start_paging(self, request_page: PageRequester) -> None:
+        """Clears the table and loads it page by page through ``request_page``."""
+        self._reset([])
+        self._request_page = request_page
+        self._has_more = True
+        self.fetchMore(QModelIndex())
+
+    def _reset(self, items: List[Dict[str, Any]]) -> None:
+        self.beginResetModel()
+        self._generation += 1
+        self._items = items
+        self._visible = 0
+        self._request_page = None
+        self._next_cursor = None
+        self._has_more = False
+        self._loading = False
+        self._rows = None
+        self._extra = []
+        self.endResetModel()
+
+    def set_filter(self, rows: Sequence[int], extra: Sequence[Dict[str, Any]] = ()) -> None:
+        """Shows only the loaded rows at positions ``rows``, followed by ``extra``."""
+        self.beginResetModel()
+        self._rows = rows
+        self._extra = list(extra)
+        self.endResetModel()
+
+    def clear_filter(self) -> None:
+        if self._rows is None:
+            return
+        self.beginResetModel()
+        self._rows = None
+        self._extra = []
+        self.endResetModel()
+
+    @property
+    def loaded_items(self) -> List[Dict[str, Any]]:
+        """Every item received for the current listing, shown or not."""
+        return self._items
+
+    @property
+    def has_more_pages(self) -> bool:
+        """True while the server has pages of this listing not loaded yet."""
+        return self._has_more
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        if parent.isValid() or self._rows is not None:
+            return False
+        return self._visible < len(self._items) or (self._has_more and not self._loading)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        if parent.isValid() or self._rows is not None:
+            return
+        if self._visible < len(self._items):
+            self._reveal(min(len(self._items), self._visible + ROWS_PER_FETCH))
+        elif self._has_more and not self._loading:
+            self._loading = True
+            generation = self._generation
+            self._request_page(self._next_cursor, lambda page: self._on_page(generation, page))
+
+    def _reveal(self, count: int) -> None:
+        self.beginInsertRows(QModelIndex(), self._visible, count - 1)
+        self._visible = count
+        self.endInsertRows()
+
+    def _on_page(self, generation: int, page: Any) -> None:
+        if generation != self._generation:
+            return
+        self._loading = False
+        if not isinstance(page, dict) or "items" not in page:
+            self._has_more = False
+            error = page.get("error") if isinstance(page, dict) else None
+            self.fetch_failed.emit(error or "Unexpected response while paging.")
+            return
+        self._next_cursor = page.get("next_cursor")
+        self._has_more = bool(self._next_cursor)
+        if page["items"]:
+            self._items.extend(page["items"])
+            if self._rows is None:
+                self._reveal(len(self._items))
+            else:
+                # Shown once the filter is cleared or reapplied
+                self._visible = len(self._items)
+        self.page_loaded.emit(len(self._items))
+
+    # --- Changes ---
+
+    def append_items(self, items: List[Dict[str, Any]]) -> None:
+        """Adds items after the loaded rows, showing them at once if every loaded row is shown."""
+        shown = self._visible == len(self._items)
+        self._items.extend(items)
+        if not shown:
+            return
+        if self._rows is None:
+            self._reveal(len(self._items))
+        else:
+            # Shown once the filter is cleared or reapplied
+            self._visible = len(self._items)
+
+    def remove_item(self, position: int) -> None:
+        """Removes the loaded item at ``position``; the items after it move up by one."""
+        if self._rows is None:
+            row = position if position < self._visible else None
+        else:
+            # Filtered rows are in position order
+            after = bisect_left(self._rows, position)
+            row = after if after < len(self._rows) and self._rows[after] == position else None
+        if row is not None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        del self._items[position]
+        if position < self._visible:
+            self._visible -= 1
+        if self._rows is not None:
+            self._rows = list(self._rows[:after]) + [
+                later - 1 for later in self._rows[after + (row is not None):]]
+        if row is not None:
+            self.endRemoveRows()
+
+    def remove_extra(self, media_id: str) -> None:
+        """Removes a filtered-in item that is not loaded (see set_filter)."""
+        for index, item in enumerate(self._extra):
+            if str(item.get("id", "")) == media_id:
+                row = len(self._rows) + index
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._extra[index]
+                self.endRemoveRows()
+                return
+
+    # --- Access ---
+
+    def item(self, row: int) -> Dict[str, Any]:
+        if self._rows is None:
+            return self._items[row]
+        if row < len(self._rows):
+            return self._items[self._rows[row]]
+        return self._extra[row - len(self._rows)]
+
+    def replace_item(self, row: int, item: Dict[str, Any]) -> None:
+        """Swaps in a newer copy of the item at ``row`` (e.g. refetched details)."""
+        if self._rows is None:
+            self._items[row] = item
+        elif row < len(self._rows):
+            self._items[self._rows[row]] = item
+        else:
+            self._extra[row - len(self._rows)] = item
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.fields) - 1))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._visible if self._rows is None else len(self._rows) + len(self._extra)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.fields)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self.item(index.row()).get(self.fields[index.column()])
+            return "" if value is None else str(value)
+        if role == Qt.ItemDataRole.UserRole:
+            # Sort key: zero-padded digits, so numeric ids and years compare as numbers
+            value = self.item(index.row()).get(self.fields[index.column()])
+            value = "" if value is None else str(value)
+            return value.zfill(20) if value.isdigit() else value
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+
+def make_proxy(model: MediaTableModel, parent=None) -> QSortFilterProxyModel:
+    """Sorting (by the numeric-aware sort key) and case-insensitive row filtering over ``model``.
+
+    Both apply to the rows loaded so far; the view still triggers
+    fetchMore through the proxy when scrolled to the end.
+    """
+    proxy = QSortFilterProxyModel(parent)
+    proxy.setSourceModel(model)
+    proxy.setSortRole(Qt.ItemDataRole.UserRole)
+    proxy.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    # Match the filter text against every column
+    proxy.setFilterKeyColumn(-1)
+    return proxy
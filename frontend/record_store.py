@@ -0,0 +1,38 @@
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+class RecordStore:
+    """Media items the GUI has received, by id, with the time each arrived.
+
+    List pages and search results already carry every field of an item, so
+    the details panel is rendered from here; age() tells whether a record
+    is old enough to be worth fetching again.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        # id -> (item, time it was received)
+        self._records: Dict[str, Tuple[Dict[str, Any], float]] = {}
+
+    def add(self, item: Dict[str, Any]) -> None:
+        self._records[str(item.get("id", ""))] = (item, self._clock())
+
+    def add_many(self, items: Iterable[Dict[str, Any]]) -> None:
+        now = self._clock()
+        self._records.update((str(item.get("id", "")), (item, now)) for item in items)
+
+    def get(self, media_id: str) -> Optional[Dict[str, Any]]:
+        record = self._records.get(media_id)
+        return None if record is None else record[0]
+
+    def age(self, media_id: str) -> Optional[float]:
+        """Seconds since the record arrived, or None if there is none."""
+        record = self._records.get(media_id)
+        return None if record is None else self._clock() - record[1]
+
+    def remove(self, media_id: str) -> None:
+        self._records.pop(media_id, None)
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,199 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Worker threads for API calls; a few let a slow list load overlap a details lookup
+MAX_THREADS = 4
+# Seconds the server may hold a change-feed request before answering that nothing changed
+CHANGES_WAIT = 25.0
+# Seconds before asking the change feed again after a failed request, or
+# between polls of a server that does not hold requests open
+CHANGES_RETRY_DELAY = 5.0
+
+
+class _TaskSignals(QObject):
+    # (task, result), emitted on the worker thread and delivered on the UI thread
+    finished = pyqtSignal(object, object)
+
+
+class ApiTask(QRunnable):
+    """Runs one blocking ApiClient call on a pool thread."""
+
+    def __init__(self, channel: Optional[str], call: Callable[..., Any], args, callback: Callable[[Any], None]):
+        super().__init__()
+        self.channel = channel
+        self.call = call
+        self.args = args
+        self.callback = callback
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.call(*self.args)
+        except Exception as e:
+            # ApiClient reports errors as dictionaries; keep that shape for anything else
+            result = {"error": f"An unexpected error occurred: {e}"}
+        self.signals.finished.emit(self, result)
+
+
+class ApiDispatcher(QObject):
+    """Runs ApiClient calls off the UI thread and hands results back on it.
+
+    Calls made on the same ``channel`` supersede each other: starting one
+    cancels the previous call if it is still queued, and ignores its result
+    if it is already running. Calls without a channel (writes) always
+    deliver their result. ``busy_changed`` fires when the first call starts
+    and when the last one finishes, for a loading indicator.
+    """
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent: Optional[QObject] = None, max_threads: int = MAX_THREADS):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        # Tasks whose result has not been delivered yet (also keeps them alive)
+        self._tasks: Set[ApiTask] = set()
+        # channel -> the only task whose result that channel still wants
+        self._latest: Dict[str, ApiTask] = {}
+        self._busy = False
+
+    def run(self, channel: Optional[str], call: Callable[..., Any], *args, callback: Callable[[Any], None]) -> None:
+        """Calls ``call(*args)`` on a pool thread, then ``callback(result)`` on this thread."""
+        if channel is not None:
+            self._drop(channel)
+        task = ApiTask(channel, call, args, callback)
+        task.setAutoDelete(False)
+        task.signals.finished.connect(self._finished)
+        self._tasks.add(task)
+        if channel is not None:
+            self._latest[channel] = task
+        self.pool.start(task)
+        self._update_busy()
+
+    def cancel(self, channel: str) -> None:
+        """Drops the pending call of ``channel``: unstarted calls never run, running ones are ignored."""
+        self._drop(channel)
+        self._update_busy()
+
+    @property
+    def busy(self) -> bool:
+        """True while any call that is still wanted has not delivered its result."""
+        return self._busy
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Blocks until running calls finish (e.g. when closing); queued ones are dropped."""
+        self.pool.clear()
+        return self.pool.waitForDone(msecs)
+
+    def _drop(self, channel: str) -> None:
+        task = self._latest.pop(channel, None)
+        if task is not None and self.pool.tryTake(task):
+            self._tasks.discard(task)
+
+    def _update_busy(self) -> None:
+        busy = any(task.channel is None or self._latest.get(task.channel) is task for task in self._tasks)
+        if busy != self._busy:
+            self._busy = busy
+            self.busy_changed.emit(busy)
+
+    def _finished(self, task: ApiTask, result: Any) -> None:
+        wanted = task.channel is None or self._latest.get(task.channel) is task
+        if wanted and task.channel is not None:
+            del self._latest[task.channel]
+        self._tasks.discard(task)
+        self._update_busy()
+        if wanted:
+            task.callback(result)
+
+
+class ChangePoller(QObject):
+    """Follows the server's change feed and hands each batch of changes to the UI thread.
+
+    ``get_changes(cursor, wait)`` is ApiClient.get_changes. The long polls
+    run on a daemon thread rather than the dispatcher's pool: they are idle
+    most of the time, must not show as loading, and must not hold up
+    closing the window. follow() restarts from a new cursor; changes from a
+    request made with an older one are dropped.
+    """
+
+    # A list of {"op": "create", "item": {...}} / {"op": "delete", "id": ...}
+    changes = pyqtSignal(list)
+    # The cursor aged out on the server: changes were missed and the data must be reloaded
+    expired = pyqtSignal()
+    # A request failed (the message); it is retried after CHANGES_RETRY_DELAY
+    failed = pyqtSignal(str)
+    # (generation, result) from the polling thread, delivered on the UI thread
+    _received = pyqtSignal(int, object)
+
+    def __init__(self, get_changes: Callable[..., Any], parent: Optional[QObject] = None,
+                 wait: float = CHANGES_WAIT, retry_delay: float = CHANGES_RETRY_DELAY):
+        super().__init__(parent)
+        self._get_changes = get_changes
+        self.wait = wait
+        self.retry_delay = retry_delay
+        self._lock = threading.Lock()
+        self._cursor: Optional[str] = None
+        # Bumped by follow(), so results for an older cursor are dropped
+        self._generation = 0
+        # Cuts short the pause after a failure
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._received.connect(self._deliver)
+
+    def follow(self, cursor: Optional[str] = None) -> None:
+        """Delivers the changes after ``cursor`` from now on (starting the thread the first time)."""
+        with self._lock:
+            self._cursor = cursor
+            self._generation += 1
+        self._wake.set()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="change-poller", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stops polling; a request in progress is left to finish on its own."""
+        self._stopped.set()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            with self._lock:
+                cursor, generation = self._cursor, self._generation
+            self._wake.clear()
+            started = time.monotonic()
+            try:
+                result = self._get_changes(cursor, self.wait)
+            except Exception as e:
+                # ApiClient reports errors as dictionaries; keep that shape for anything else
+                result = {"error": f"An unexpected error occurred: {e}"}
+            if self._stopped.is_set():
+                return
+            with self._lock:
+                if generation != self._generation:
+                    continue
+                if isinstance(result, dict) and result.get("cursor"):
+                    self._cursor = result["cursor"]
+            self._received.emit(generation, result)
+            if not isinstance(result, dict) or not ("changes" in result or result.get("expired")):
+                self._wake.wait(self.retry_delay)
+            elif result.get("changes") == [] and time.monotonic() - started < self.wait / 2:
+                # The server did not hold the request (it does not long-poll,
+                # e.g. serve.py --no-threads): poll every retry_delay instead
+                self._wake.wait(self.retry_delay)
+
+    def _deliver(self, generation: int, result: Any) -> None:
+        # follow() runs on this thread too, so this check cannot race with it
+        if generation != self._generation or self._stopped.is_set():
+            return
+        if isinstance(result, dict) and "changes" in result:
+            if result["changes"]:
+                self.changes.emit(result["changes"])
+        elif isinstance(result, dict) and result.get("expired"):
+            self.expired.emit()
+        else:
+            error = result.get("error") if isinstance(result, dict) else None
+            self.failed.emit(error or "Unexpected response from the change feed.")
@@ -0,0 +1,71 @@
+# migrate_to_sqlite.py
+# One-shot copy of the JSON data files into the SQLite storage engine.
+#
+#     python migrate_to_sqlite.py                 # both apps
+#     python migrate_to_sqlite.py --app backend   # media_data.json (+ log) -> media_data.db
+#     python migrate_to_sqlite.py --app storage   # media_store.json -> media_store.db
+#
+# Ids are kept. The JSON files are left in place; afterwards start the apps
+# with MEDIA_STORAGE_ENGINE=sqlite.
+
+import argparse
+import os
+import sys
+
+# The JSON files are read through the JSON engines, whatever the environment says
+os.environ["MEDIA_STORAGE_ENGINE"] = "json"
+
+APPS = ("backend", "storage")
+
+
+def migrate_backend(force):
+    from backend.data_manager import DataManager, SQLiteDataManager, DATA_FILE, DB_FILE
+
+    if not prepare_target(DB_FILE, force):
+        return
+    # Snapshot plus replayed log; unlike the module-level data_manager, a
+    # plain DataManager does not seed an empty store with demo items
+    items = DataManager().get_all_media()
+    target = SQLiteDataManager(DB_FILE)
+    target.import_media(items)
+    target.close()
+    print(f"{DATA_FILE}: copied {len(items)} items to {DB_FILE}")
+
+
+def migrate_storage(force):
+    import storage
+    import storage_sqlite
+
+    if not prepare_target(storage_sqlite.DB_FILE, force):
+        return
+    items = storage.load_all()
+    storage_sqlite.import_items(items)
+    storage_sqlite.close()
+    print(f"{storage.DATA_FILE}: copied {len(items)} items to {storage_sqlite.DB_FILE}")
+
+
+def prepare_target(path, force):
+    """Refuses to overwrite an existing database unless --force was given."""
+    path = str(path)
+    if os.path.exists(path):
+        if not force:
+            print(f"{path} already exists; pass --force to replace it", file=sys.stderr)
+            return False
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Copy the JSON media data into SQLite databases.")
+    parser.add_argument("--app", choices=APPS, action="append",
+                        help="app whose data to migrate (default: both)")
+    parser.add_argument("--force", action="store_true", help="replace existing databases")
+    args = parser.parse_args(argv)
+    for name in args.app or APPS:
+        {"backend": migrate_backend, "storage": migrate_storage}[name](args.force)
+
+
+if __name__ == '__main__':
+    main()
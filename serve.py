@@ -0,0 +1,165 @@
+# serve.py
+# Production launcher: pre-forks several worker processes that share one
+# listening socket, instead of Flask's single-process debug server.
+#
+#     python serve.py --workers 4 --port 5000            # backend/api.py
+#     python serve.py --app storage --workers 4          # app.py
+#
+# Each worker handles requests on threads, so long-polling and event-stream
+# clients of GET /media/changes do not hold up other requests.
+# --no-threads serves one request at a time per worker and turns long
+# polling off.
+#
+# Signals to the master process:
+#     SIGHUP          graceful restart (new workers start before old ones drain)
+#     SIGTERM/SIGINT  graceful shutdown
+#
+# Workers run with MEDIA_SHARED_STORAGE=1 so the backend DataManager takes
+# inter-process locks and picks up the other workers' writes. With
+# MEDIA_STORAGE_ENGINE=sqlite the workers share the database directly.
+
+import argparse
+import importlib
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+APPS = {
+    "backend": ("backend.api", "app"),
+    "storage": ("app", "app"),
+}
+# Seconds a draining worker may take before it is killed
+GRACEFUL_TIMEOUT = 30
+
+
+def load_app(name):
+    module_name, attr = APPS[name]
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def run_worker(sock, args):
+    """Body of a forked worker: serve requests from the shared socket until told to stop."""
+    from werkzeug.serving import make_server
+
+    os.environ["MEDIA_SHARED_STORAGE"] = "1"
+    app = load_app(args.app)
+    # Without threads a held-open /media/changes request would block the worker
+    app.config["MEDIA_LONG_POLLING"] = args.threads
+    server = make_server(args.host, args.port, app, threaded=args.threads, fd=sock.fileno())
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever returns, so it cannot run in
+        # the signal handler itself; in-flight requests finish first
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    server.serve_forever()
+
+
+class Master:
+    """Keeps ``workers`` processes alive and handles restart/shutdown signals."""
+
+    def __init__(self, sock, args):
+        self.sock = sock
+        self.args = args
+        self.generation = 0
+        # pid -> generation it was started in
+        self.children = {}
+        self.draining = {}
+        self.reload_requested = False
+        self.stop_requested = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(self.sock, self.args)
+            finally:
+                os._exit(0)
+        self.children[pid] = self.generation
+
+    def reap(self):
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.children.pop(pid, None)
+            self.draining.pop(pid, None)
+
+    def drain_old_generation(self):
+        for pid, generation in list(self.children.items()):
+            if generation < self.generation and pid not in self.draining:
+                self.draining[pid] = time.monotonic()
+                os.kill(pid, signal.SIGTERM)
+
+    def kill_stragglers(self):
+        now = time.monotonic()
+        for pid, since in list(self.draining.items()):
+            if now - since > GRACEFUL_TIMEOUT:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+    def current_workers(self):
+        return sum(1 for g in self.children.values() if g == self.generation)
+
+    def run(self):
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, "reload_requested", True))
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "stop_requested", True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, "stop_requested", True))
+
+        print(f"Serving '{self.args.app}' on http://{self.args.host}:{self.args.port} "
+              f"with {self.args.workers} workers (master pid {os.getpid()})")
+        while not self.stop_requested:
+            if self.reload_requested:
+                self.reload_requested = False
+                self.generation += 1
+            # Start replacements first, then let the old workers drain
+            while self.current_workers() < self.args.workers:
+                self.spawn()
+            self.drain_old_generation()
+            self.reap()
+            self.kill_stragglers()
+            time.sleep(0.2)
+
+        self.generation += 1
+        self.drain_old_generation()
+        while self.children:
+            self.reap()
+            self.kill_stragglers()
+            time.sleep(0.1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-forking launcher for the media API.")
+    parser.add_argument("--app", choices=sorted(APPS), default="backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--threads", action=argparse.BooleanOptionalAction, default=True,
+                        help="handle requests on threads inside each worker (default); with "
+                             "--no-threads each worker serves one request at a time and "
+                             "GET /media/changes does not long-poll")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    if not hasattr(os, "fork"):
+        sys.exit("serve.py needs os.fork(); on this platform use run.py or a WSGI server such as waitress.")
+    args = parse_args(argv)
+    sock = socket.create_server((args.host, args.port), backlog=1024)
+    sock.set_inheritable(True)
+    Master(sock, args).run()
+
+
+if __name__ == '__main__':
+    main()
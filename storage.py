@@ -2,11 +2,44 @@
 # Simple JSON-backed storage for media items.
 
 import json
-import uuid
+import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Tuple
+
+from backend.filelock import FileLock
+from backend.pagination import DEFAULT_PAGE_SIZE, PageIndex
+from backend.search_index import SearchIndex
+from storage_common import new_item, plan_batch
 
 DATA_FILE = Path("media_store.json")
+# Fields covered by full-text search, with their ranking weights
+SEARCH_FIELDS = [("name", 2.0), ("author", 1.0)]
+# Sort names accepted by page_media, mapped to item fields
+SORT_FIELDS = {"name": "name", "author": "author", "date": "publication_date", "category": "category"}
+
+# In-memory copy of DATA_FILE, valid while the file's identity is unchanged.
+_cache: Optional[List[Dict]] = None
+_cache_key: Optional[Tuple[int, int, int]] = None
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "reloads": 0}
+# Change counters per lower-cased category for writes made by this process,
+# and the number of times the file was (re)parsed, which may change anything
+_category_versions: Dict[str, int] = {}
+_loads = 0
+
+# Full-text index over the cached items; valid while _search_key == _cache_key.
+_search_index = SearchIndex()
+_search_items: Dict[str, Dict] = {}
+_search_lock = threading.Lock()
+_search_key: Optional[Tuple[int, int, int]] = None
+
+# Cached items sorted for page_media; valid while _pages_key == _cache_key.
+_pages_lock = threading.Lock()
+_pages_key: Optional[Tuple[int, int, int]] = None
+
+# Inter-process write locks, one per data file path
+_file_locks: Dict[str, FileLock] = {}
 
 
 def _ensure_file():
@@ -14,15 +47,128 @@ def _ensure_file():
         DATA_FILE.write_text("[]", encoding="utf-8")
 
 
+def _file_key(st=None) -> Tuple[int, int, int]:
+    st = st or DATA_FILE.stat()
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _write_lock():
+    """Serializes read-modify-write cycles across threads and worker processes."""
+    path = str(DATA_FILE) + ".lock"
+    if path not in _file_locks:
+        _file_locks[path] = FileLock(path)
+    return _file_locks[path].exclusive()
+
+
 def load_all() -> List[Dict]:
+    """Returns all items, re-parsing the file only if it changed on disk.
+
+    The returned list is shared with the cache and must not be mutated.
+    """
+    return _load()[0]
+
+
+def _load() -> Tuple[List[Dict], Tuple[int, int, int]]:
+    """Like load_all(), plus the identity of the file the items were read from."""
+    global _cache, _cache_key, _loads
     _ensure_file()
-    with DATA_FILE.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    key = _file_key()
+    with _cache_lock:
+        if _cache is not None and key == _cache_key:
+            _stats["hits"] += 1
+            return _cache, _cache_key
+        _stats["misses" if _cache is None else "reloads"] += 1
+        _loads += 1
+        with DATA_FILE.open("r", encoding="utf-8") as f:
+            # Key the cache on the file actually opened, in case it was replaced
+            # between the stat above and the open
+            key = _file_key(os.fstat(f.fileno()))
+            _cache = json.load(f)
+        _cache_key = key
+        return _cache, _cache_key
 
 
 def save_all(items: List[Dict]) -> None:
-    with DATA_FILE.open("w", encoding="utf-8") as f:
+    """Replaces the file atomically, so other processes never read a partial write."""
+    global _cache, _cache_key
+    tmp_file = DATA_FILE.with_name(DATA_FILE.name + ".tmp")
+    with tmp_file.open("w", encoding="utf-8") as f:
         json.dump(items, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, DATA_FILE)
+    key = _file_key()
+    with _cache_lock:
+        _cache = items
+        _cache_key = key
+
+
+def data_version() -> Tuple[str, float]:
+    """Returns (tag, last_modified) of the stored items, for conditional requests.
+
+    Every save replaces the file, so its identity (inode, size, mtime) is the
+    version: it changes with each mutation and is the same in every worker
+    process reading the file.
+    """
+    ino, size, mtime_ns = _load()[1]
+    return f"{ino:x}-{size:x}-{mtime_ns:x}", mtime_ns / 1e9
+
+
+def category_version(category: Optional[str] = None) -> str:
+    """Returns a token that changes whenever an item of ``category`` (or, for None, any item) changes."""
+    if category is None:
+        return data_version()[0]
+    load_all()
+    return f"{_loads}.{_category_versions.get(category.lower(), 0)}"
+
+
+def _bump_categories(items: List[Dict]) -> None:
+    for category in {it.get("category", "").lower() for it in items}:
+        _category_versions[category] = _category_versions.get(category, 0) + 1
+
+
+def cache_stats() -> Dict[str, int]:
+    """Returns hit/miss/reload counters for the load_all cache."""
+    return dict(_stats)
+
+
+def clear_cache() -> None:
+    """Drops the cached items and resets the counters."""
+    global _cache, _cache_key
+    with _cache_lock:
+        _cache = None
+        _cache_key = None
+        for k in _stats:
+            _stats[k] = 0
+
+
+def _search_fields(item: Dict) -> List[Tuple[str, float]]:
+    return [(item.get(field, ""), weight) for field, weight in SEARCH_FIELDS]
+
+
+def _sync_search_index() -> None:
+    """Rebuilds the full-text index if the cached items changed underneath it; needs _search_lock."""
+    global _search_items, _search_key
+    items, key = _load()
+    if key == _search_key:
+        return
+    _search_items = {it["id"]: it for it in items}
+    _search_index.rebuild((it["id"], _search_fields(it)) for it in items)
+    _search_key = key
+
+
+def search_text(query: str, limit: int = 10) -> List[Dict]:
+    """Ranked, typo-tolerant search over name and author; best match first."""
+    with _search_lock:
+        _sync_search_index()
+        return [_search_items[item_id] for item_id, _ in _search_index.search(query, limit)]
+
+
+def suggest(prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+    """Most frequent names and authors starting with prefix, as (text, count) pairs."""
+    with _search_lock:
+        _sync_search_index()
+        return _search_index.suggest(prefix, limit)
 
 
 def find_by_id(item_id: str) -> Optional[Dict]:
@@ -46,24 +192,108 @@ def find_by_category(category: str) -> List[Dict]:
     return [it for it in items if it.get("category", "").lower() == category.lower()]
 
 
-def add_media(data: Dict) -> Dict:
+def iter_media(category: Optional[str] = None) -> Iterator[Dict]:
+    """Yields items one at a time (optionally in a category), for streaming."""
     items = load_all()
-    new_item = {
-        "id": str(uuid.uuid4()),
-        "name": data["name"],
-        "publication_date": data["publication_date"],
-        "author": data["author"],
-        "category": data["category"],
-    }
-    items.append(new_item)
-    save_all(items)
-    return new_item
+    if category is None:
+        yield from items
+    else:
+        wanted = category.lower()
+        yield from (it for it in items if it.get("category", "").lower() == wanted)
+
+
+def _category_key(item: Dict) -> str:
+    return item.get("category", "").lower()
+
+
+def _page_source(category: Optional[str]) -> List[Dict]:
+    return load_all() if category is None else find_by_category(category)
+
+
+_pages = PageIndex(SORT_FIELDS, _page_source, _category_key)
+
+
+def page_media(category: Optional[str] = None, sort: str = "id", limit: int = DEFAULT_PAGE_SIZE,
+               cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """Returns one page of items (optionally in a category) and the next-page cursor."""
+    global _pages_key
+    with _pages_lock:
+        key = _load()[1]
+        if key != _pages_key:
+            _pages.clear()
+            _pages_key = key
+        return _pages.page(None if category is None else category.lower(), sort, limit, cursor)
+
+
+def _after_save(base_key: Tuple[int, int, int], removed: List[Dict], created: List[Dict]) -> None:
+    """Accounts for a save_all() over the items of base_key in the category versions and the indexes."""
+    global _pages_key, _search_key
+    key = _file_key()
+    _bump_categories(removed + created)
+    with _pages_lock:
+        if _pages_key == base_key:
+            for item in removed:
+                _pages.remove(item)
+            for item in created:
+                _pages.add(item)
+            _pages_key = key
+    with _search_lock:
+        if _search_key != base_key:
+            return
+        for item in removed:
+            _search_items.pop(item["id"], None)
+            _search_index.remove(item["id"])
+        for item in created:
+            _search_items[item["id"]] = item
+            _search_index.add(item["id"], _search_fields(item))
+        _search_key = key
+
+
+def add_media(data: Dict) -> Dict:
+    item = new_item(data)
+    with _write_lock():
+        items, base_key = _load()
+        save_all(items + [item])
+        _after_save(base_key, [], [item])
+        return item
 
 
 def delete_media(item_id: str) -> bool:
-    items = load_all()
-    new_items = [it for it in items if it.get("id") != item_id]
-    if len(new_items) == len(items):
-        return False
-    save_all(new_items)
-    return True
+    with _write_lock():
+        items, base_key = _load()
+        new_items = [it for it in items if it.get("id") != item_id]
+        if len(new_items) == len(items):
+            return False
+        removed = [it for it in items if it.get("id") == item_id]
+        save_all(new_items)
+        _after_save(base_key, removed, [])
+        return True
+
+
+def apply_batch(operations: List[Dict]) -> Tuple[bool, List[Dict]]:
+    """Applies validated create/delete operations with a single save_all.
+
+    Returns (applied, results). If any delete targets a missing id nothing
+    is written and applied is False.
+    """
+    with _write_lock():
+        items, base_key = _load()
+        ok, results = plan_batch(operations, {it.get("id") for it in items}.__contains__)
+        if not ok:
+            return False, results
+
+        deleted = set()
+        created = []
+        for op, result in zip(operations, results):
+            if op["op"] == "create":
+                item = new_item(op["data"])
+                created.append(item)
+                result.update(status=201, item=item)
+            else:
+                deleted.add(str(op["id"]))
+                result.update(status=200, id=str(op["id"]))
+
+        removed = [it for it in items if it.get("id") in deleted]
+        save_all([it for it in items if it.get("id") not in deleted] + created)
+        _after_save(base_key, removed, created)
+        return True, results
@@ -0,0 +1,46 @@
+# storage_common.py
+# Helpers shared by the storage engines (storage.py, storage_sqlite.py and
+# storage_records.py), so they build items and check batches alike.
+
+import uuid
+from typing import Callable, Dict, List, Tuple
+
+NOT_APPLIED = "Not applied because another operation in the batch failed"
+
+
+def new_item(data: Dict) -> Dict:
+    """Returns a new item with a fresh id and the fields of validated data."""
+    return {
+        "id": str(uuid.uuid4()),
+        "name": data["name"],
+        "publication_date": data["publication_date"],
+        "author": data["author"],
+        "category": data["category"],
+    }
+
+
+def plan_batch(operations: List[Dict], exists: Callable[[str], bool]) -> Tuple[bool, List[Dict]]:
+    """Checks validated create/delete operations before any is applied.
+
+    ``exists`` tells whether an id is currently stored. Returns (ok,
+    results) with one result per operation. If a delete targets a missing
+    id (or one deleted earlier in the batch), ok is False and every result
+    has its status and error; otherwise the caller fills them in.
+    """
+    results = []
+    ok = True
+    deleted = set()
+    for index, op in enumerate(operations):
+        result = {"index": index, "op": op["op"]}
+        if op["op"] == "delete":
+            item_id = str(op.get("id"))
+            if item_id in deleted or not exists(item_id):
+                result.update(status=404, error="Not found")
+                ok = False
+            deleted.add(item_id)
+        results.append(result)
+    if not ok:
+        for result in results:
+            result.setdefault("status", 424)
+            result.setdefault("error", NOT_APPLIED)
+    return ok, results
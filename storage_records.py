@@ -0,0 +1,234 @@
+# storage_records.py
+# Record-file storage for media items, with the same functions as storage.py.
+# app.py uses it when MEDIA_STORAGE_ENGINE=records. Items live in a
+# memory-mapped record file with an id index (backend/record_file.py), so
+# lookups by id read only the bytes of one item; listings, name lookups and
+# search still scan the file. To carry over existing JSON data:
+#     storage_records.import_items(storage.load_all())
+
+import operator
+import threading
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional, Tuple
+
+from backend.pagination import DEFAULT_PAGE_SIZE, PageIndex
+from backend.record_file import RecordFile
+from backend.search_index import SearchIndex
+from storage_common import new_item, plan_batch
+
+DATA_FILE = Path("media_store.records")
+# Fields covered by full-text search, with their ranking weights
+SEARCH_FIELDS = [("name", 2.0), ("author", 1.0)]
+# Sort names accepted by page_media, mapped to item fields
+SORT_FIELDS = {"name": "name", "author": "author", "date": "publication_date", "category": "category"}
+
+# One record file per path, opened on first use
+_stores: Dict[str, RecordFile] = {}
+
+# Change counters per lower-cased category for writes made by this process,
+# plus a counter of changes noticed from elsewhere (other processes, another
+# file), which may change anything. _seen_version is the file version both
+# account for.
+_category_versions: Dict[str, int] = {}
+_other_changes = 0
+_seen_version: Optional[str] = None
+
+# Full-text index over the items, valid while _search_version is the file version
+_search_index = SearchIndex()
+_search_lock = threading.Lock()
+_search_version: Optional[str] = None
+
+# Sort keys and ids for page_media, valid while _pages_version is the file version
+_pages_lock = threading.Lock()
+_pages_version: Optional[str] = None
+
+
+def _store() -> RecordFile:
+    path = str(DATA_FILE)
+    if path not in _stores:
+        _stores[path] = RecordFile(path)
+    return _stores[path]
+
+
+def close() -> None:
+    """Closes all open record files."""
+    for store in _stores.values():
+        store.close()
+    _stores.clear()
+
+
+def stats() -> Dict[str, int]:
+    """Returns the size and record counts of the record file (see RecordFile.stats)."""
+    return _store().stats()
+
+
+def compact() -> None:
+    """Rewrites the record file without deleted items (this also happens automatically)."""
+    _store().compact()
+
+
+def load_all() -> List[Dict]:
+    return list(_store().iter_items())
+
+
+def data_version() -> Tuple[str, float]:
+    """Returns (tag, last_modified) of the stored items, for conditional requests."""
+    return _store().data_version()
+
+
+def category_version(category: Optional[str] = None) -> str:
+    """Returns a token that changes whenever an item of ``category`` (or, for None, any item) changes."""
+    global _other_changes, _seen_version
+    version = _store().version()
+    if category is None:
+        return version
+    if version != _seen_version:
+        _other_changes += 1
+        _seen_version = version
+    return f"{_other_changes}.{_category_versions.get(category.lower(), 0)}"
+
+
+def _after_write(tx) -> None:
+    """Accounts for a committed transaction in the category versions and the search index."""
+    global _search_version, _seen_version, _pages_version
+    if not tx.modified:
+        return
+    items = [item for _, item in tx.changes if item is not None] + tx.removed
+    for category in {it.get("category", "").lower() for it in items}:
+        _category_versions[category] = _category_versions.get(category, 0) + 1
+    if _seen_version == tx.base_version:
+        _seen_version = tx.version
+    with _pages_lock:
+        if _pages_version == tx.base_version:
+            removed = {item["id"]: item for item in tx.removed}
+            for item_id, item in tx.changes:
+                if item is None:
+                    _pages.remove(removed[item_id])
+                else:
+                    _pages.add(item)
+            _pages_version = tx.version
+    with _search_lock:
+        if _search_version != tx.base_version:
+            return
+        for item_id, item in tx.changes:
+            if item is None:
+                _search_index.remove(item_id)
+            else:
+                _search_index.add(item_id, _search_fields(item))
+        _search_version = tx.version
+
+
+def import_items(items: List[Dict]) -> int:
+    """Copies items (e.g. from storage.load_all()) into the record file, keeping their ids."""
+    return _store().import_items(items)
+
+
+def _search_fields(item: Dict) -> List[Tuple[str, float]]:
+    return [(item.get(field, ""), weight) for field, weight in SEARCH_FIELDS]
+
+
+def _sync_search_index(store: RecordFile) -> None:
+    """Rebuilds the full-text index if the file changed underneath it; needs _search_lock."""
+    global _search_version
+    version = store.version()
+    if version != _search_version:
+        _search_index.rebuild((it["id"], _search_fields(it)) for it in store.iter_items())
+        _search_version = version
+
+
+def search_text(query: str, limit: int = 10) -> List[Dict]:
+    """Ranked, typo-tolerant search over name and author; best match first."""
+    store = _store()
+    with _search_lock:
+        _sync_search_index(store)
+        hits = _search_index.search(query, limit)
+    return store.get_many([item_id for item_id, _ in hits])
+
+
+def suggest(prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+    """Most frequent names and authors starting with prefix, as (text, count) pairs."""
+    with _search_lock:
+        _sync_search_index(_store())
+        return _search_index.suggest(prefix, limit)
+
+
+def find_by_id(item_id: str) -> Optional[Dict]:
+    return _store().get(item_id)
+
+
+def find_by_name_exact(name: str) -> Optional[Dict]:
+    for it in _store().iter_items():
+        if it.get("name") == name:
+            return it
+    return None
+
+
+def find_by_category(category: str) -> List[Dict]:
+    return list(iter_media(category))
+
+
+def iter_media(category: Optional[str] = None) -> Iterator[Dict]:
+    """Yields items one at a time (optionally in a category), for streaming."""
+    items = _store().iter_items()
+    if category is None:
+        return items
+    wanted = category.lower()
+    return (it for it in items if it.get("category", "").lower() == wanted)
+
+
+def page_media(category: Optional[str] = None, sort: str = "id", limit: int = DEFAULT_PAGE_SIZE,
+               cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """Returns one page of items (optionally in a category) and the next-page cursor."""
+    global _pages_version
+    store = _store()
+    with _pages_lock:
+        version = store.version()
+        if version != _pages_version:
+            _pages.clear()
+            _pages_version = version
+        ids, next_cursor = _pages.page(None if category is None else category.lower(), sort, limit, cursor)
+    return store.get_many(ids), next_cursor
+
+
+def _category_key(item: Dict) -> str:
+    return item.get("category", "").lower()
+
+
+# Only sort keys and ids are held; page_media reads the items themselves from the file
+_pages = PageIndex(SORT_FIELDS, iter_media, _category_key, value=operator.itemgetter("id"))
+
+
+def add_media(data: Dict) -> Dict:
+    with _store().transaction() as tx:
+        item = tx.insert(new_item(data))
+    _after_write(tx)
+    return item
+
+
+def delete_media(item_id: str) -> bool:
+    with _store().transaction() as tx:
+        found = tx.delete(item_id) is not None
+    _after_write(tx)
+    return found
+
+
+def apply_batch(operations: List[Dict]) -> Tuple[bool, List[Dict]]:
+    """Applies validated create/delete operations in one transaction.
+
+    Returns (applied, results). If any delete targets a missing id nothing
+    is written and applied is False.
+    """
+    with _store().transaction() as tx:
+        ok, results = plan_batch(operations, tx.exists)
+        if not ok:
+            return False, results
+
+        for op, result in zip(operations, results):
+            if op["op"] == "delete":
+                tx.delete(str(op["id"]))
+                result.update(status=200, id=str(op["id"]))
+        for op, result in zip(operations, results):
+            if op["op"] == "create":
+                result.update(status=201, item=tx.insert(new_item(op["data"])))
+    _after_write(tx)
+    return True, results
@@ -0,0 +1,114 @@
+# storage_sqlite.py
+# SQLite-backed storage for media items, with the same functions as storage.py.
+# app.py uses it when MEDIA_STORAGE_ENGINE=sqlite.
+
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional, Tuple
+
+from backend.pagination import DEFAULT_PAGE_SIZE
+from backend.sqlite_store import SQLiteStore
+from storage_common import new_item, plan_batch
+
+DB_FILE = Path("media_store.db")
+FIELDS = ("name", "publication_date", "author", "category")
+
+# One store per database path, created on first use
+_stores: Dict[str, SQLiteStore] = {}
+
+
+def _store() -> SQLiteStore:
+    path = str(DB_FILE)
+    if path not in _stores:
+        _stores[path] = SQLiteStore(path, FIELDS)
+    return _stores[path]
+
+
+def close() -> None:
+    """Closes all open databases."""
+    for store in _stores.values():
+        store.close()
+    _stores.clear()
+
+
+def load_all() -> List[Dict]:
+    return _store().list_items()
+
+
+def data_version() -> Tuple[str, float]:
+    """Returns (tag, last_modified) of the stored items, for conditional requests."""
+    return _store().data_version()
+
+
+def category_version(category: Optional[str] = None) -> str:
+    """Returns a token that changes whenever an item of ``category`` (or, for None, any item) changes."""
+    return _store().category_version(category)
+
+
+def import_items(items: List[Dict]) -> int:
+    """Copies items (e.g. from storage.load_all()) into the database, keeping their ids."""
+    return _store().import_items(items)
+
+
+def search_text(query: str, limit: int = 10) -> List[Dict]:
+    """Ranked, typo-tolerant search over name and author; best match first."""
+    return _store().search(query, limit)
+
+
+def suggest(prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+    """Most frequent names and authors starting with prefix, as (text, count) pairs."""
+    return _store().suggest(prefix, limit)
+
+
+def find_by_id(item_id: str) -> Optional[Dict]:
+    return _store().get(item_id)
+
+
+def find_by_name_exact(name: str) -> Optional[Dict]:
+    found = _store().find_by_name(name, ignore_case=False)
+    return found[0] if found else None
+
+
+def find_by_category(category: str) -> List[Dict]:
+    return _store().list_items(category)
+
+
+def iter_media(category: Optional[str] = None) -> Iterator[Dict]:
+    """Yields items one at a time (optionally in a category), for streaming."""
+    return _store().iter_items(category)
+
+
+def page_media(category: Optional[str] = None, sort: str = "id", limit: int = DEFAULT_PAGE_SIZE,
+               cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """Returns one page of items (optionally in a category) and the next-page cursor."""
+    return _store().page(category, sort, limit, cursor)
+
+
+def add_media(data: Dict) -> Dict:
+    with _store().transaction() as tx:
+        return tx.insert(new_item(data))
+
+
+def delete_media(item_id: str) -> bool:
+    with _store().transaction() as tx:
+        return tx.delete(item_id)
+
+
+def apply_batch(operations: List[Dict]) -> Tuple[bool, List[Dict]]:
+    """Applies validated create/delete operations in one transaction.
+
+    Returns (applied, results). If any delete targets a missing id nothing
+    is written and applied is False.
+    """
+    with _store().transaction() as tx:
+        ok, results = plan_batch(operations, tx.exists)
+        if not ok:
+            return False, results
+
+        for op, result in zip(operations, results):
+            if op["op"] == "delete":
+                tx.delete(str(op["id"]))
+                result.update(status=200, id=str(op["id"]))
+        for op, result in zip(operations, results):
+            if op["op"] == "create":
+                result.update(status=201, item=tx.insert(new_item(op["data"])))
+        return True, results
@@ -0,0 +1,109 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+from frontend.async_api_client import AsyncApiClient
+
+# Seconds the stand-in server takes per request
+DELAY = 0.05
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers GET /media/<id> after DELAY seconds, counting requests in flight."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            media_id = self.path.rsplit('/', 1)[-1]
+            time.sleep(1.0 if media_id == "slow" else DELAY)
+            if media_id == "missing":
+                self.reply(404, {"error": "Media not found"})
+            else:
+                self.reply(200, {"id": media_id, "Name": f"Title {media_id}"})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncApiClient(unittest.TestCase):
+
+    def setUp(self):
+        """Start the stand-in server on a free port."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.in_flight = self.server.max_in_flight = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/media"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch(self, ids, request_timeout=None, **options):
+        async def run():
+            async with AsyncApiClient(self.base_url, **options) as client:
+                return await client.get_many_details(ids, request_timeout)
+        return asyncio.run(run())
+
+    # --- Test 1.1: Concurrent fan-out ---
+    def test_1_fetches_many_concurrently(self):
+        """Results keep the order of the ids, and no more than the limit run at once."""
+        ids = [str(i) for i in range(20)]
+        start = time.perf_counter()
+        items = self.fetch(ids, concurrency=5)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([item["id"] for item in items], ids)
+        self.assertEqual(self.server.max_in_flight, 5)
+        self.assertLess(elapsed, len(ids) * DELAY / 2)
+
+    # --- Test 1.2: Failures stay with their id ---
+    def test_2_errors_and_timeouts(self):
+        """A missing id and a slow request give error entries without failing the rest."""
+        start = time.perf_counter()
+        items = self.fetch(["1", "missing", "slow"], timeout=0.3)
+
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(items[0]["Name"], "Title 1")
+        self.assertEqual(items[1], {"error": "Media not found"})
+        self.assertEqual(items[2], {"error": "Request timed out."})
+
+    # --- Test 1.3: Timed-out requests keep their slot ---
+    def test_3_timeout_counts_from_start(self):
+        """A request queued behind a timed-out one that is still running gets its full timeout."""
+        # The slow request times out after 0.3s but its thread runs for 1s
+        items = self.fetch(["slow", "1"], request_timeout=0.3, concurrency=1)
+
+        self.assertEqual(items[0], {"error": "Request timed out."})
+        self.assertEqual(items[1]["Name"], "Title 1")
+        self.assertEqual(self.server.max_in_flight, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,267 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from backend import api
+from backend.change_feed import ChangeFeed, CursorExpired
+from backend.data_manager import DataManager, SQLiteDataManager
+
+try:
+    from PyQt6.QtWidgets import QApplication
+    from frontend import gui, workers
+except ImportError:
+    QApplication = None
+
+
+def make_item(name, category="Book"):
+    return {"Name": name, "Publication date": "1965", "Author": "Frank Herbert", "Category": category}
+
+
+class TestChangeFeed(unittest.TestCase):
+
+    # --- Test 1.1: Reading after a cursor ---
+    def test_1_cursors(self):
+        """Events come back in order, in limited batches, and old or foreign cursors expire."""
+        feed = ChangeFeed(capacity=3)
+        self.assertEqual(feed.read(None), ([], feed.cursor))
+        start = feed.cursor
+        feed.publish([{"op": "delete", "id": str(i)} for i in range(2)])
+        events, cursor = feed.read(start, limit=1)
+        self.assertEqual(events, [{"op": "delete", "id": "0"}])
+        self.assertEqual(feed.read(cursor)[0], [{"op": "delete", "id": "1"}])
+        self.assertEqual(feed.read(feed.cursor), ([], feed.cursor))
+
+        # Two more events push "0" out of the buffer
+        feed.publish([{"op": "delete", "id": "2"}, {"op": "delete", "id": "3"}])
+        with self.assertRaises(CursorExpired) as caught:
+            feed.read(start)
+        self.assertEqual(caught.exception.cursor, feed.cursor)
+        self.assertEqual([event["id"] for event in feed.read(cursor)[0]], ["1", "2", "3"])
+
+        kept = feed.cursor
+        feed.reset()
+        self.assertRaises(CursorExpired, feed.read, kept)
+        self.assertRaises(CursorExpired, feed.read, ChangeFeed().cursor)
+        self.assertRaises(ValueError, feed.read, "nonsense")
+
+    # --- Test 1.2: Long polling ---
+    def test_2_wait_for_change(self):
+        """A reader waiting on the newest cursor wakes as soon as something is published."""
+        feed = ChangeFeed()
+        cursor = feed.cursor
+        timer = threading.Timer(0.1, feed.publish, [[{"op": "delete", "id": "7"}]])
+        timer.start()
+        started = time.monotonic()
+        events, _ = feed.read(cursor, timeout=5)
+        self.assertEqual(events, [{"op": "delete", "id": "7"}])
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(feed.read(feed.cursor, timeout=0.05)[0], [])
+
+
+class TestChangesEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        """Serve backend/api.py from a private data file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dm = DataManager(data_file=os.path.join(self.tmp.name, 'media.json'),
+                              log_file=os.path.join(self.tmp.name, 'media.log'), durability="os")
+        patcher = mock.patch.object(api, "data_manager", self.dm)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = api.app.test_client()
+
+    def tearDown(self):
+        self.dm.wait_for_compaction()
+        self.tmp.cleanup()
+
+    # --- Test 2.1: Long poll, expiry and event stream ---
+    def test_1_follow_writes(self):
+        """Creates, deletes and batches are reported once, in order; stale cursors get 410."""
+        cursor = self.client.get("/media/changes").get_json()["cursor"]
+        item = self.client.post("/media", json=make_item("Dune")).get_json()
+        self.client.post("/media/batch", json={"operations": [{"op": "create", "data": make_item("Emma")},
+                                                              {"op": "delete", "id": item["id"]}]})
+        body = self.client.get(f"/media/changes?since={cursor}&timeout=5").get_json()
+        self.assertEqual([change["op"] for change in body["changes"]], ["create", "create", "delete"])
+        self.assertEqual(body["changes"][0]["item"], item)
+        self.assertEqual(self.client.get(f"/media/changes?since={body['cursor']}").get_json()["changes"], [])
+
+        self.dm.changes.reset()
+        expired = self.client.get(f"/media/changes?since={body['cursor']}")
+        self.assertEqual(expired.status_code, 410)
+        self.assertEqual(expired.get_json()["cursor"], self.dm.changes.cursor)
+        self.assertEqual(self.client.get("/media/changes?timeout=x").status_code, 400)
+
+        stream = self.client.get("/media/changes", headers={"Accept": "text/event-stream"}, buffered=False)
+        self.assertEqual(stream.mimetype, "text/event-stream")
+        first = next(iter(stream.response))
+        stream.close()
+        self.assertIn(f"id: {self.dm.changes.cursor}".encode(), first)
+
+    # --- Test 2.2: Cursors work on every worker ---
+    def test_2_cursor_from_another_worker(self):
+        """A cursor from one manager follows, on another, the writes of either (JSON shared mode and SQLite)."""
+        data_file = os.path.join(self.tmp.name, 'shared.json')
+        log_file = os.path.join(self.tmp.name, 'shared.log')
+        db_file = os.path.join(self.tmp.name, 'media.db')
+        for open_manager in (lambda: DataManager(data_file=data_file, log_file=log_file, shared=True),
+                             lambda: SQLiteDataManager(db_file)):
+            a, b = open_manager(), open_manager()
+            try:
+                first = cursor = a.get_changes()[1]
+                created = b.create_media(make_item("Dune"))
+                events, cursor = b.get_changes(cursor, timeout=5)
+                self.assertEqual(events, [{"op": "create", "item": created}])
+
+                a.delete_media(created["id"])
+                events, cursor = b.get_changes(cursor)
+                self.assertEqual(events, [{"op": "delete", "id": created["id"]}])
+                self.assertEqual(a.get_changes(cursor), ([], cursor))
+
+                # A manager opened afterwards still has the changes from before it started
+                late = open_manager()
+                self.assertEqual(late.get_changes(first), ([{"op": "create", "item": created},
+                                                            {"op": "delete", "id": created["id"]}], cursor))
+                getattr(late, "close", lambda: None)()
+            finally:
+                getattr(a, "close", lambda: None)()
+                getattr(b, "close", lambda: None)()
+
+    # --- Test 2.3: Only logged changes are published ---
+    def test_3_failed_log_write(self):
+        """A change whose log write fails never reaches the feed; later ones do."""
+        cursor = self.dm.get_changes()[1]
+
+        def fail(group):
+            group.error = IOError("disk full")
+
+        with mock.patch.object(self.dm._journal, "_commit", fail):
+            with self.assertRaises(IOError):
+                self.dm.create_media(make_item("Lost"))
+        self.assertEqual(self.dm.get_changes(cursor)[0], [])
+        created = self.dm.create_media(make_item("Dune"))
+        self.assertEqual(self.dm.get_changes(cursor)[0], [{"op": "create", "item": created}])
+
+    # --- Test 2.4: Servers that cannot hold requests open ---
+    def test_4_without_long_polling(self):
+        """With MEDIA_LONG_POLLING off, polls answer at once and event streams are refused."""
+        cursor = self.client.get("/media/changes").get_json()["cursor"]
+        with mock.patch.dict(api.app.config, {"MEDIA_LONG_POLLING": False}):
+            started = time.monotonic()
+            body = self.client.get(f"/media/changes?since={cursor}&timeout=5").get_json()
+            self.assertEqual(body, {"changes": [], "cursor": cursor})
+            self.assertLess(time.monotonic() - started, 1)
+            stream = self.client.get("/media/changes", headers={"Accept": "text/event-stream"})
+            self.assertEqual(stream.status_code, 406)
+
+
+class FakeApiClient:
+    """Serves a fixed first page and hands out the changes queued by the test."""
+
+    def __init__(self, items):
+        self.items = items
+        self.page_requests = 0
+        self.queue = []
+        self.ready = threading.Event()
+
+    def get_changes(self, cursor=None, wait=0):
+        if cursor is None:
+            return {"changes": [], "cursor": "c0"}
+        if not self.ready.wait(wait):
+            return {"changes": [], "cursor": cursor}
+        self.ready.clear()
+        return self.queue.pop(0)
+
+    def send(self, result):
+        self.queue.append(result)
+        self.ready.set()
+
+    def get_media_page(self, category=None, cursor=None):
+        self.page_requests += 1
+        return {"items": [item for item in self.items if category in (None, item["Category"])],
+                "next_cursor": None}
+
+    def close(self):
+        pass
+
+
+@unittest.skipIf(QApplication is None, "PyQt6 is not installed")
+class TestGuiFollowsChanges(unittest.TestCase):
+
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.client = FakeApiClient([dict(make_item(name), id=str(i)) for i, name in
+                                     enumerate(["Dune", "Emma", "Dune Messiah"], start=1)])
+        self.window = gui.LibraryApp(self.client)
+        self.window.change_poller.wait = 0.05
+        self.process_until(lambda: self.window.media_proxy.rowCount() == 3)
+
+    def tearDown(self):
+        self.window.close()
+
+    def process_until(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def names(self):
+        model = self.window.media_model
+        return [model.item(row)["Name"] for row in range(model.rowCount())]
+
+    # --- Test 3.1: Deltas instead of reloads ---
+    def test_1_apply_deltas(self):
+        """Other clients' creates and deletes update the table, search index and filter in place."""
+        self.window.search_input.setText("dune")
+        self.process_until(lambda: self.names() == ["Dune", "Dune Messiah"])
+
+        self.client.send({"changes": [{"op": "create", "item": dict(make_item("Dune Chronicles"), id="4")},
+                                      {"op": "delete", "id": "1"},
+                                      {"op": "create", "item": dict(make_item("Heat", "Film"), id="5")}],
+                          "cursor": "c1"})
+        self.process_until(lambda: self.names() == ["Dune Messiah", "Dune Chronicles"])
+        self.assertEqual(self.names(), ["Dune Messiah", "Dune Chronicles"])
+        self.assertEqual(self.client.page_requests, 1)
+        self.assertIsNone(self.window.records.get("1"))
+
+        self.window.search_input.setText("")
+        self.process_until(lambda: len(self.names()) == 4)
+        self.assertEqual(self.names(), ["Emma", "Dune Messiah", "Dune Chronicles", "Heat"])
+        self.assertEqual(list(self.window.search_index.search("heat")), [3])
+
+    # --- Test 3.2: Expired cursor ---
+    def test_2_resync(self):
+        """When the server no longer has the missed changes, the listing is loaded again."""
+        self.client.items.pop(0)
+        self.client.send({"error": "Cursor has expired.", "expired": True, "cursor": "c9"})
+        self.process_until(lambda: self.client.page_requests == 2 and len(self.names()) == 2)
+        self.assertEqual(self.names(), ["Emma", "Dune Messiah"])
+
+    # --- Test 3.3: Server without long polling ---
+    def test_3_paced_polls(self):
+        """Empty answers that come back at once are not asked for again straight away."""
+        calls = []
+
+        def get_changes(cursor, wait):
+            calls.append(cursor)
+            return {"changes": [], "cursor": "c0"}
+
+        poller = workers.ChangePoller(get_changes, wait=25, retry_delay=0.2)
+        poller.follow("c0")
+        time.sleep(0.5)
+        poller.stop()
+        self.assertLessEqual(len(calls), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+import storage
+from app import app
+
+
+class TestConditionalRequests(unittest.TestCase):
+
+    def setUp(self):
+        """Serve app.py from a private data file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_file = storage.DATA_FILE
+        storage.DATA_FILE = Path(self.tmp.name) / "media_store.json"
+        storage.clear_cache()
+        self.client = app.test_client()
+        self.item = storage.add_media({"name": "Dune", "publication_date": "1965",
+                                       "author": "Frank Herbert", "category": "Book"})
+
+    def tearDown(self):
+        storage.DATA_FILE = self.original_file
+        storage.clear_cache()
+        self.tmp.cleanup()
+
+    # --- Test 1.1: Unchanged data is answered with 304 ---
+    def test_1_not_modified_until_a_write(self):
+        """Every read endpoint revalidates until the next mutation."""
+        for url in ("/media", "/media/category/book", "/media/search?name=Dune",
+                    "/media/search/text?q=dune", "/media/suggest?prefix=du", f"/media/{self.item['id']}"):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200, url)
+            self.assertIsNotNone(first.headers.get("ETag"), url)
+            self.assertIsNotNone(first.headers.get("Last-Modified"), url)
+
+            again = self.client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+            self.assertEqual(again.status_code, 304, url)
+            self.assertEqual(again.data, b"")
+
+        etag = self.client.get("/media").headers["ETag"]
+        self.client.post("/media", json={"name": "Emma", "publication_date": "1815",
+                                         "author": "Jane Austen", "category": "Book"})
+        changed = self.client.get("/media", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.get_json()), 2)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+
+    # --- Test 1.2: Representations and errors ---
+    def test_2_ndjson_and_errors(self):
+        """NDJSON gets its own tag and error responses carry none."""
+        etag = self.client.get("/media").headers["ETag"]
+        ndjson = self.client.get("/media", headers={"Accept": "application/x-ndjson",
+                                                    "If-None-Match": etag})
+        self.assertEqual(ndjson.status_code, 200)
+        self.assertNotEqual(ndjson.headers["ETag"], etag)
+
+        missing = self.client.get("/media/nope")
+        self.assertEqual(missing.status_code, 404)
+        self.assertNotIn("ETag", missing.headers)
+
+    # --- Test 1.3: Non-string fields are rejected, not a server error ---
+    def test_3_non_string_fields(self):
+        """A number where a string belongs gets 400 from both POST /media and POST /media/batch."""
+        data = {"name": "Emma", "publication_date": "1815", "author": "Jane Austen", "category": 5}
+        self.assertEqual(self.client.post("/media", json=data).status_code, 400)
+        batch = self.client.post("/media/batch", json={"operations": [{"op": "create", "data": data}]})
+        self.assertEqual(batch.status_code, 400)
+        self.assertEqual(len(self.client.get("/media").get_json()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
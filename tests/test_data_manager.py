@@ -0,0 +1,407 @@
+import unittest
+import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from unittest import mock
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+from backend import data_manager
+from backend.data_manager import DataManager, LazyDataManager, BatchError, SQLiteDataManager
+from backend.journal import Journal
+from backend.snapshot import MAGIC, read_snapshot
+
+
+def make_item(name, category="Book"):
+    return {"Name": name, "Publication date": "2020", "Author": "Someone", "Category": category}
+
+
+def assert_indexes_consistent(test, dm):
+    """Index lookups must agree with a full scan of dm.media."""
+    for category in ("Book", "Film", "Magazine"):
+        expected = [item for item in dm.media.values() if item["Category"] == category]
+        test.assertEqual(dm.get_media_by_category(category), expected)
+    for name in {item["Name"] for item in dm.media.values()} | {"missing"}:
+        expected = [item for item in dm.media.values() if item["Name"].lower() == name.lower()]
+        test.assertEqual(dm.search_media_by_name(name.upper()), expected)
+    test.assertFalse(any(not ids for ids in dm._by_category.values()))
+    test.assertFalse(any(not ids for ids in dm._by_name.values()))
+
+
+class TestDataManagerJournal(unittest.TestCase):
+
+    def setUp(self):
+        """Give every test its own snapshot and log files."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tmp.name, 'media.json')
+        self.log_file = os.path.join(self.tmp.name, 'media.log')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open_manager(self, **kwargs):
+        return DataManager(data_file=self.data_file, log_file=self.log_file, **kwargs)
+
+    # --- Test 1.1: Writes go to the log, not the snapshot ---
+    def test_1_writes_append_to_log(self):
+        """Each create/delete appends one record and leaves the snapshot alone."""
+        dm = self.open_manager()
+        dm.create_media(make_item("A"))
+        dm.create_media(make_item("B"))
+        dm.delete_media("1")
+
+        self.assertFalse(os.path.exists(self.data_file))
+        with open(self.log_file, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+    # --- Test 1.2: Restart replays snapshot plus log ---
+    def test_2_reload_replays_log(self):
+        """A new manager sees the same data and continues the id sequence."""
+        dm = self.open_manager()
+        for name in ("A", "B", "C"):
+            dm.create_media(make_item(name))
+        dm.delete_media("2")
+
+        reloaded = self.open_manager()
+        self.assertEqual(reloaded.media, dm.media)
+        self.assertEqual(reloaded.create_media(make_item("D"))["id"], "4")
+
+    # --- Test 1.3: A torn final record is ignored ---
+    def test_3_torn_tail_is_discarded(self):
+        """A partially written last line does not break loading or later writes."""
+        dm = self.open_manager()
+        dm.create_media(make_item("A"))
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write('{"op":"create","item":{"id":"2"')
+
+        reloaded = self.open_manager()
+        self.assertEqual(list(reloaded.media), ["1"])
+        reloaded.create_media(make_item("B"))
+        self.assertEqual(sorted(self.open_manager().media), ["1", "2"])
+
+    # --- Test 1.4: Compaction folds the log into the snapshot ---
+    def test_4_background_compaction(self):
+        """Passing the size threshold writes a snapshot and empties the log."""
+        dm = self.open_manager(compact_bytes=1024)
+        for i in range(30):
+            dm.create_media(make_item(f"Item {i}"))
+        dm.wait_for_compaction()
+
+        self.assertTrue(os.path.exists(dm.snapshot_file))
+        self.assertFalse(os.path.exists(self.log_file + '.1'))
+        self.assertLess(dm._journal.size(), 1024)
+        self.assertEqual(self.open_manager().media, dm.media)
+
+    # --- Test 1.5: Batches are all-or-nothing with one log write ---
+    def test_5_apply_batch(self):
+        """A valid batch is written at once; an invalid one changes nothing."""
+        dm = self.open_manager()
+        dm.create_media(make_item("A"))
+
+        results = dm.apply_batch([
+            {"op": "create", "data": make_item("B")},
+            {"op": "delete", "id": "1"},
+            {"op": "create", "data": make_item("C", "Film")},
+        ])
+        self.assertEqual([r["status"] for r in results], [201, 200, 201])
+        self.assertEqual(sorted(dm.media), ["2", "3"])
+
+        with self.assertRaises(BatchError) as ctx:
+            dm.apply_batch([
+                {"op": "create", "data": make_item("D")},
+                {"op": "create", "data": make_item("E", "Poster")},
+                {"op": "delete", "id": "1"},
+            ])
+        self.assertEqual([r["status"] for r in ctx.exception.results], [424, 400, 404])
+        self.assertEqual(sorted(self.open_manager().media), ["2", "3"])
+        self.assertEqual(dm.get_media_by_category("Film"), [dm.media["3"]])
+
+    # --- Test 1.6: Concurrent appends are group-committed intact ---
+    def test_6_group_commit_under_concurrency(self):
+        """Records from many threads all land as whole lines, in every mode."""
+        for mode in ("fsync", "interval", "os"):
+            path = os.path.join(self.tmp.name, f'{mode}.log')
+            journal = Journal(path, mode, sync_interval_ms=5)
+
+            def writer(n):
+                for i in range(50):
+                    journal.append({"op": "delete", "id": f"{n}-{i}"})
+
+            threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            journal.close()
+
+            ids = [record["id"] for record in Journal.replay(path)]
+            self.assertEqual(len(ids), 400)
+            self.assertEqual(len(set(ids)), 400)
+
+
+    # --- Test 1.7: Binary and JSON snapshots ---
+    def test_7_snapshot_formats(self):
+        """A binary snapshot wins over the JSON file until a JSON snapshot replaces it."""
+        with open(self.data_file, 'w', encoding='utf-8') as f:
+            json.dump({"7": dict(make_item("Old"), id="7")}, f)
+        dm = self.open_manager()
+        self.assertEqual(dm.create_media(make_item("New"))["id"], "8")
+        dm.delete_media("8")
+        dm.compact()
+
+        self.assertTrue(os.path.exists(dm.snapshot_file))
+        reloaded = self.open_manager()
+        self.assertEqual(reloaded.media, dm.media)
+        # next_id is stored, so the deleted id is not handed out again
+        self.assertEqual(reloaded.create_media(make_item("Newer"))["id"], "9")
+
+        as_json = self.open_manager(snapshot_format="json")
+        as_json.compact()
+        self.assertFalse(os.path.exists(dm.snapshot_file))
+        self.assertEqual(sorted(self.open_manager().media), ["7", "9"])
+
+    # --- Test 1.8: Snapshots only hold plain data ---
+    def test_8_snapshot_rejects_objects(self):
+        """A snapshot that would construct objects is refused, not executed."""
+        with open(os.path.splitext(self.data_file)[0] + '.snapshot', 'wb') as f:
+            f.write(MAGIC + pickle.dumps({"next_id": 1, "media": {"1": os.getcwd}}))
+        with self.assertRaises(ValueError):
+            read_snapshot(f.name)
+        self.assertEqual(self.open_manager().media, {})
+
+    # --- Test 1.9: A failed log write is reported and undone ---
+    def test_9_failed_log_write(self):
+        """Writes whose log write fails raise IOError and leave memory matching the disk."""
+        def fail(group):
+            group.error = IOError("disk full")
+
+        for shared in (False, True):
+            with self.subTest(shared=shared):
+                self.data_file = os.path.join(self.tmp.name, f'shared-{shared}.json')
+                self.log_file = os.path.join(self.tmp.name, f'shared-{shared}.log')
+                dm = self.open_manager(shared=shared)
+                dm.create_media(make_item("A"))
+                with mock.patch.object(dm._journal, "_commit", fail):
+                    with self.assertRaises(IOError):
+                        dm.create_media(make_item("B"))
+                    with self.assertRaises(IOError):
+                        dm.delete_media("1")
+                    with self.assertRaises(IOError):
+                        dm.apply_batch([{"op": "create", "data": make_item("C")}, {"op": "delete", "id": "1"}])
+
+                self.assertEqual(list(dm.media), ["1"])
+                assert_indexes_consistent(self, dm)
+                created = dm.create_media(make_item("D"))
+                self.assertEqual(self.open_manager(shared=shared).media, dm.media)
+                self.assertEqual(sorted(dm.media), sorted(["1", created["id"]]))
+
+
+class TestDataManagerIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tmp.name, 'media.json')
+        self.log_file = os.path.join(self.tmp.name, 'media.log')
+        self.dm = DataManager(data_file=self.data_file, log_file=self.log_file)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertIndexesConsistent(self, dm):
+        assert_indexes_consistent(self, dm)
+
+    # --- Test 2.1: Mixed create/delete sequence ---
+    def test_1_indexes_follow_creates_and_deletes(self):
+        """Indexes stay in step with the data through interleaved writes."""
+        categories = ["Book", "Film", "Magazine"]
+        for i in range(30):
+            self.dm.create_media(make_item(f"Title {i % 7}", categories[i % 3]))
+            if i % 4 == 3:
+                self.dm.delete_media(str(i - 1))
+        self.dm.delete_media("1")
+        self.assertIndexesConsistent(self.dm)
+
+    # --- Test 2.2: Indexes are rebuilt on reload ---
+    def test_2_indexes_after_reload(self):
+        """A reloaded manager answers lookups from its rebuilt indexes."""
+        for i in range(10):
+            self.dm.create_media(make_item(f"Title {i % 3}", "Film" if i % 2 else "Book"))
+        self.dm.delete_media("4")
+        self.dm.compact()
+        self.dm.delete_media("5")
+
+        reloaded = DataManager(data_file=self.data_file, log_file=self.log_file)
+        self.assertIndexesConsistent(reloaded)
+        self.assertEqual(len(reloaded.search_media_by_name("title 1")), 2)
+
+    # --- Test 2.3: Streaming in chunks ---
+    def test_3_iter_media_in_chunks(self):
+        """iter_media resumes after the last id of each chunk, seeing writes it has not passed yet."""
+        for i in range(10):
+            self.dm.create_media(make_item(f"Title {i}", "Film" if i % 2 else "Book"))
+        with mock.patch.object(data_manager, "ITER_CHUNK_SIZE", 3):
+            self.assertEqual([item["id"] for item in self.dm.iter_media("Film")], ["2", "4", "6", "8", "10"])
+            stream = self.dm.iter_media()
+            seen = [next(stream)["id"] for _ in range(4)]
+            self.dm.delete_media("2")
+            self.dm.delete_media("7")
+            self.dm.create_media(make_item("Title 10"))
+            seen += [item["id"] for item in stream]
+        self.assertEqual(seen, ["1", "2", "3", "4", "5", "6", "8", "9", "10", "11"])
+
+
+class TestDataManagerLazyLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tmp.name, 'media.json')
+        self.log_file = os.path.join(self.tmp.name, 'media.log')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # --- Test 3.1: The manager is opened once, on first use ---
+    def test_1_lazy_manager(self):
+        """Nothing is read until an attribute is used, and concurrent first uses share one manager."""
+        opened = []
+
+        def factory():
+            opened.append(1)
+            return DataManager(data_file=self.data_file, log_file=self.log_file)
+
+        lazy = LazyDataManager(factory)
+        self.assertFalse(lazy.loaded)
+        threads = [threading.Thread(target=lazy.get_all_media) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(lazy.loaded)
+        self.assertEqual(len(opened), 1)
+
+    # --- Test 3.2: The search index is built on the first search ---
+    def test_2_lazy_search_index(self):
+        """Writes before and after the first search are all searchable."""
+        dm = DataManager(data_file=self.data_file, log_file=self.log_file)
+        dm.create_media(make_item("Dune"))
+        self.assertFalse(dm._search_ready)
+        self.assertEqual([item["Name"] for item in dm.search_media("dune")], ["Dune"])
+        self.assertTrue(dm._search_ready)
+
+        dm.create_media(make_item("Dune Messiah"))
+        dm.delete_media("1")
+        self.assertEqual([item["Name"] for item in dm.search_media("dune")], ["Dune Messiah"])
+        self.assertEqual(dm.suggest_media("du"), [("Dune Messiah", 1)])
+
+
+class TestDataManagerConcurrency(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tmp.name, 'media.json')
+        self.log_file = os.path.join(self.tmp.name, 'media.log')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # --- Test 4.1: Mixed operations from many threads ---
+    def test_1_stress_mixed_operations(self):
+        """Ids stay unique, readers never crash and the log replays to the same state."""
+        dm = DataManager(data_file=self.data_file, log_file=self.log_file,
+                         compact_bytes=16 * 1024, durability="os")
+        created, errors = [], []
+        created_lock = threading.Lock()
+        categories = ["Book", "Film", "Magazine"]
+
+        def worker(n):
+            try:
+                mine = []
+                for i in range(60):
+                    item = dm.create_media(make_item(f"T{n} {i % 4}", categories[i % 3]))
+                    mine.append(item["id"])
+                    if i % 3 == 2:
+                        dm.delete_media(mine.pop(0))
+                    if i % 10 == 9:
+                        results = dm.apply_batch([{"op": "create", "data": make_item(f"B{n}")},
+                                                  {"op": "delete", "id": mine.pop(0)}])
+                        mine.append(results[0]["item"]["id"])
+                    dm.get_all_media()
+                    dm.get_media_by_category(categories[i % 3])
+                    dm.search_media_by_name(f"T{n} 1")
+                    dm.search_media(f"T{n}")
+                    dm.get_media_page(sort="name", limit=5)
+                    list(dm.iter_media("Film"))
+                with created_lock:
+                    created.extend(mine)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(12)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        dm.wait_for_compaction()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(created, key=int), sorted(dm.media, key=int))
+        self.assertEqual(dm.next_id, 12 * 66 + 1)
+        assert_indexes_consistent(self, dm)
+        dm._journal.close()
+        reloaded = DataManager(data_file=self.data_file, log_file=self.log_file)
+        self.assertEqual(reloaded.media, dm.media)
+        assert_indexes_consistent(self, reloaded)
+
+    # --- Test 4.2: Two workers sharing the same files ---
+    def test_2_shared_mode_across_managers(self):
+        """Managers in shared mode see each other's writes and never reuse ids."""
+        first = DataManager(data_file=self.data_file, log_file=self.log_file, shared=True)
+        second = DataManager(data_file=self.data_file, log_file=self.log_file, shared=True)
+
+        a = first.create_media(make_item("A"))
+        b = second.create_media(make_item("B", "Film"))
+        self.assertNotEqual(a["id"], b["id"])
+        self.assertEqual(first.get_media_by_category("Film"), [b])
+        second.delete_media(a["id"])
+        self.assertEqual(first.search_media_by_name("a"), [])
+
+        # Compaction by one worker must not lose the other's later writes
+        first.compact()
+        c = second.create_media(make_item("C"))
+        self.assertEqual([item["id"] for item in first.get_all_media()], [b["id"], c["id"]])
+        assert_indexes_consistent(self, first)
+        self.assertEqual(DataManager(data_file=self.data_file, log_file=self.log_file).media, first.media)
+
+    # --- Test 4.3: Workers starting together seed once ---
+    def test_3_seed_once(self):
+        """Concurrent seeding of an empty store, JSON or SQLite, creates the items only once."""
+        items = [make_item("A"), make_item("B", "Film")]
+        db_file = os.path.join(self.tmp.name, 'media.db')
+        for open_manager in (lambda: DataManager(data_file=self.data_file, log_file=self.log_file, shared=True),
+                             lambda: SQLiteDataManager(db_file)):
+            managers = [open_manager() for _ in range(4)]
+            start = threading.Barrier(len(managers))
+            created = []
+
+            def seed(manager):
+                start.wait()
+                created.append(manager.seed(items))
+
+            threads = [threading.Thread(target=seed, args=(manager,)) for manager in managers]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(sorted(created), [0, 0, 0, 2])
+            self.assertEqual([item["Name"] for item in managers[0].get_all_media()], ["A", "B"])
+            for manager in managers:
+                getattr(manager, "close", lambda: None)()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,13 +3,15 @@ import requests_mock
 import os
 import sys
 import requests # <--- ADD THIS LINE
+import threading
 
 # --- Path Fix ---
 # This line adds the project root to the Python path so imports like 'from frontend.api_client import ...' work.
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # ----------------
 
-from frontend.api_client import ApiClient
+from frontend.api_client import ApiClient, CONNECT_TIMEOUT, READ_TIMEOUT
+from frontend.client_cache import ClientCache
 
 class TestFrontendApiClient(unittest.TestCase):
     
@@ -63,4 +65,142 @@ class TestFrontendApiClient(unittest.TestCase):
             # The client is designed to return a dictionary with an 'error' key on failure
             self.assertIsInstance(result, dict)
             self.assertIn('error', result)
-            self.assertIn("Connection Failed", result['error'])
\ No newline at end of file
+            self.assertIn("Connection Failed", result['error'])
+
+    # --- Test 2.4: Paged iteration (Endpoint 1) ---
+    def test_4_iter_all_media_follows_cursors(self):
+        """The iterator requests pages lazily until next_cursor is empty."""
+        with requests_mock.Mocker() as m:
+            m.get(self.base_url, [
+                {'json': {"items": self.mock_media_list, "next_cursor": "abc"}, 'status_code': 200},
+                {'json': {"items": [self.mock_created_response], "next_cursor": None}, 'status_code': 200},
+            ])
+
+            items = self.client.iter_all_media(page_size=1)
+            self.assertEqual(next(items)['Name'], "Moby Dick")
+            self.assertEqual(m.call_count, 1)
+            self.assertEqual([item['id'] for item in items], ["2"])
+            self.assertEqual(m.request_history[1].qs['cursor'], ['abc'])
+
+    # --- Test 2.5: Streamed listing (Endpoint 1) ---
+    def test_5_stream_all_media(self):
+        """NDJSON lines are decoded into items and the Accept header is sent."""
+        body = '{"id": "1", "Name": "Moby Dick"}\n{"id": "2", "Name": "New Film"}\n'
+        with requests_mock.Mocker() as m:
+            m.get(self.base_url, text=body, headers={'Content-Type': 'application/x-ndjson'})
+
+            names = [item['Name'] for item in self.client.stream_all_media()]
+
+            self.assertEqual(names, ["Moby Dick", "New Film"])
+            self.assertEqual(m.last_request.headers['Accept'], 'application/x-ndjson')
+
+    # --- Test 2.6: Chunked batch upload (Endpoint 7) ---
+    def test_6_bulk_create_in_chunks(self):
+        """Items are sent in chunks and result indexes refer to the full list."""
+        def respond(request, context):
+            ops = request.json()["operations"]
+            return {"results": [{"index": i, "op": "create", "status": 201} for i in range(len(ops))]}
+
+        with requests_mock.Mocker() as m:
+            m.post(f"{self.base_url}/batch", json=respond)
+
+            result = self.client.bulk_create([self.mock_create_data] * 5, chunk_size=2)
+
+            self.assertEqual(m.call_count, 3)
+            self.assertEqual(result["applied"], 5)
+            self.assertEqual([r["index"] for r in result["results"]], [0, 1, 2, 3, 4])
+
+    # --- Test 2.7: Conditional revalidation (Endpoint 1) ---
+    def test_7_revalidates_with_etag(self):
+        """A repeated GET sends If-None-Match and reuses the body on 304."""
+        with requests_mock.Mocker() as m:
+            m.get(self.base_url, [
+                {'json': self.mock_media_list, 'status_code': 200, 'headers': {'ETag': '"v1"'}},
+                {'status_code': 304},
+                {'json': [], 'status_code': 200, 'headers': {'ETag': '"v2"'}},
+            ])
+
+            first = self.client.get_all_media()
+            self.assertNotIn('If-None-Match', m.last_request.headers)
+            self.assertEqual(self.client.get_all_media(), first)
+            self.assertEqual(m.last_request.headers['If-None-Match'], '"v1"')
+            self.assertEqual(self.client.get_all_media(), [])
+            self.assertEqual(self.client.get_all_media(), [])
+            self.assertEqual(m.last_request.headers['If-None-Match'], '"v2"')
+
+    # --- Test 2.8: Retries with backoff ---
+    def test_8_retries_idempotent_requests(self):
+        """GETs are retried after 503s and timeouts on the same session; POSTs are not."""
+        client = ApiClient(max_retries=2, backoff=0)
+        with requests_mock.Mocker() as m:
+            m.get(self.base_url, [
+                {'status_code': 503},
+                {'exc': requests.exceptions.ConnectTimeout},
+                {'json': self.mock_media_list, 'status_code': 200},
+            ])
+            m.post(self.base_url, status_code=503, json={"error": "Busy"})
+
+            self.assertEqual(client.get_all_media(), self.mock_media_list)
+            self.assertEqual(m.call_count, 3)
+            self.assertEqual(m.last_request.timeout, (CONNECT_TIMEOUT, READ_TIMEOUT))
+
+            self.assertEqual(client.create_media(self.mock_create_data), {"error": "Busy"})
+            self.assertEqual(m.call_count, 4)
+
+            m.get(self.base_url, exc=requests.exceptions.ReadTimeout)
+            self.assertEqual(client.get_all_media(), {"error": "Request timed out."})
+            self.assertEqual(m.call_count, 7)
+        client.close()
+
+    # --- Test 2.9: Response cache ---
+    def test_9_response_cache(self):
+        """Fresh entries skip the network, writes drop affected entries, stale ones refresh in the background."""
+        now = [0.0]
+        client = ApiClient(cache=ClientCache(clock=lambda: now[0]))
+        with requests_mock.Mocker() as m:
+            m.get(self.base_url, [{'json': self.mock_media_list}, {'json': []}, {'json': [self.mock_created_response]}])
+            m.get(f"{self.base_url}/category/Book", json=self.mock_media_list)
+            m.post(self.base_url, json=self.mock_created_response, status_code=201)
+
+            self.assertEqual(client.get_all_media(), self.mock_media_list)
+            self.assertEqual(client.get_all_media(), self.mock_media_list)
+            client.get_media_by_category("Book")
+            self.assertEqual(m.call_count, 2)
+
+            # A new Film changes the full list but not the Book listing
+            client.create_media(self.mock_create_data)
+            client.get_media_by_category("Book")
+            self.assertEqual(client.get_all_media(), [])
+            self.assertEqual(m.call_count, 4)
+
+            # Expired: the old list is returned at once and refreshed behind the scenes
+            now[0] += 31
+            self.assertEqual(client.get_all_media(), [])
+            for thread in threading.enumerate():
+                if thread.name == 'api-cache-refresh':
+                    thread.join()
+            self.assertEqual(client.get_all_media(), [self.mock_created_response])
+            self.assertEqual(m.call_count, 5)
+
+        stats = client.cache.stats()
+        self.assertEqual((stats["hits"], stats["stale_hits"], stats["misses"], stats["refreshes"]), (3, 1, 3, 1))
+
+    # --- Test 2.10: Rejected batch chunk (Endpoint 7) ---
+    def test_10_rejected_batch_chunk(self):
+        """A rejected chunk stops the upload and its per-operation results are kept."""
+        operations = [{"op": "delete", "id": "1"}, {"op": "delete", "id": "2"}, {"op": "delete", "id": "3"}]
+        with requests_mock.Mocker() as m:
+            m.post(f"{self.base_url}/batch", [
+                {'json': {"results": [{"index": 0, "op": "delete", "status": 200, "id": "1"},
+                                      {"index": 1, "op": "delete", "status": 200, "id": "2"}]},
+                 'status_code': 200},
+                {'json': {"error": "Batch rejected.",
+                          "results": [{"index": 0, "op": "delete", "status": 404, "error": "Not found"}]},
+                 'status_code': 400},
+            ])
+
+            result = self.client.apply_batch(operations, chunk_size=2)
+
+            self.assertEqual(result["error"], "Batch rejected.")
+            self.assertEqual(result["applied"], 2)
+            self.assertEqual(result["results"], [{"index": 2, "op": "delete", "status": 404, "error": "Not found"}])
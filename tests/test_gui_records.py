@@ -0,0 +1,110 @@
+import unittest
+import os
+import sys
+import time
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtWidgets import QApplication
+    from frontend import gui
+    from frontend.record_store import RecordStore
+except ImportError:
+    QApplication = None
+
+
+class FakeApiClient:
+    """Serves one page of items and counts the detail requests."""
+
+    def __init__(self, count):
+        self.items = [{"id": str(i), "Name": f"Title {i}", "Author": "A", "Publication date": "2000",
+                       "Category": "Book"} for i in range(1, count + 1)]
+        self.detail_requests = []
+
+    def get_media_page(self, category=None, cursor=None):
+        return {"items": self.items, "next_cursor": None}
+
+    def get_media_details(self, media_id):
+        self.detail_requests.append(media_id)
+        return dict(self.items[int(media_id) - 1], Name="Renamed")
+
+    def get_changes(self, cursor=None, wait=0):
+        return {"error": "No change feed."}
+
+    def close(self):
+        pass
+
+
+class TestRecordStore(unittest.TestCase):
+
+    # --- Test 1.1: Records by id with their age ---
+    def test_1_ages(self):
+        """Records are found by id and age from the moment they were received."""
+        now = [100.0]
+        store = RecordStore(clock=lambda: now[0])
+        store.add_many([{"id": "1", "Name": "A"}, {"id": 2, "Name": "B"}])
+        now[0] += 5
+        store.add({"id": "1", "Name": "A2"})
+        self.assertEqual(store.get("1")["Name"], "A2")
+        self.assertEqual((store.age("1"), store.age("2"), store.age("3")), (0, 5, None))
+        store.remove("2")
+        self.assertEqual(len(store), 1)
+
+
+@unittest.skipIf(QApplication is None, "PyQt6 is not installed")
+class TestDetailsFromRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.client = FakeApiClient(1000)
+        self.window = gui.LibraryApp(self.client)
+        self.process_until(lambda: self.window.media_proxy.rowCount() == 1000)
+
+    def tearDown(self):
+        self.window.close()
+
+    def process_until(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def settle(self):
+        """Lets the details refresh delay pass."""
+        deadline = time.monotonic() + gui.DETAILS_REFRESH_DELAY_MS / 1000 + 0.2
+        self.process_until(lambda: time.monotonic() > deadline)
+        self.window.dispatcher.wait()
+        self.app.processEvents()
+
+    # --- Test 2.1: Browsing loaded rows sends no requests ---
+    def test_1_browsing_is_local(self):
+        """Selecting each of 1000 loaded rows renders its details without a request."""
+        for row in range(1000):
+            self.window.media_table.selectRow(row)
+            self.assertEqual(self.window.detail_labels["id"].text(), str(row + 1))
+        self.settle()
+        self.assertEqual(self.client.detail_requests, [])
+        self.assertTrue(self.window.delete_button.isEnabled())
+
+    # --- Test 2.2: Stale records are refetched once the selection settles ---
+    def test_2_stale_record_refreshed(self):
+        """Only the row the user stops on is refetched, and the newer copy is shown."""
+        original = gui.RECORD_STALE_AFTER
+        gui.RECORD_STALE_AFTER = 0
+        try:
+            for row in range(5):
+                self.window.media_table.selectRow(row)
+            self.settle()
+        finally:
+            gui.RECORD_STALE_AFTER = original
+        self.assertEqual(self.client.detail_requests, ["5"])
+        self.assertEqual(self.window.detail_labels["Name"].text(), "Renamed")
+        self.assertEqual(self.window.media_proxy.index(4, 1).data(), "Renamed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtWidgets import QApplication
+    from frontend.workers import ApiDispatcher
+except ImportError:
+    QApplication = None
+
+
+@unittest.skipIf(QApplication is None, "PyQt6 is not installed")
+class TestApiDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.dispatcher = ApiDispatcher(max_threads=1)
+        self.delivered = []
+        self.busy = []
+        self.dispatcher.busy_changed.connect(self.busy.append)
+
+    def tearDown(self):
+        self.dispatcher.wait()
+
+    def process_until(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    # --- Test 1.1: Only the latest call on a channel is delivered ---
+    def test_1_superseded_calls(self):
+        """A running call's result is ignored and a queued one never runs once a newer call starts."""
+        release = threading.Event()
+        ran = []
+
+        def call(value):
+            ran.append(value)
+            if value == "running":
+                release.wait(5)
+            return value
+
+        self.dispatcher.run("list", call, "running", callback=self.delivered.append)
+        self.process_until(lambda: ran)
+        self.dispatcher.run("list", call, "queued", callback=self.delivered.append)
+        self.dispatcher.run("list", call, "latest", callback=self.delivered.append)
+        self.dispatcher.run(None, call, "write", callback=self.delivered.append)
+        release.set()
+        self.process_until(lambda: not self.dispatcher.busy)
+
+        self.assertEqual(ran, ["running", "latest", "write"])
+        self.assertEqual(self.delivered, ["latest", "write"])
+        self.assertEqual(self.busy, [True, False])
+
+    # --- Test 1.2: Failures come back as error dictionaries ---
+    def test_2_exceptions_and_cancel(self):
+        """An exception is delivered as an error, and cancelling the only call ends the busy state."""
+        release = threading.Event()
+
+        def fail():
+            raise ValueError("boom")
+
+        self.dispatcher.run("details", fail, callback=self.delivered.append)
+        self.process_until(lambda: self.delivered)
+        self.assertEqual(self.delivered, [{"error": "An unexpected error occurred: boom"}])
+
+        self.dispatcher.run("details", release.wait, 5, callback=self.delivered.append)
+        self.dispatcher.cancel("details")
+        self.assertFalse(self.dispatcher.busy)
+        release.set()
+        self.dispatcher.wait()
+        self.app.processEvents()
+        self.assertEqual(len(self.delivered), 1)
+        self.assertEqual(self.busy, [True, False, True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
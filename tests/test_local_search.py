@@ -0,0 +1,141 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from frontend.local_search import LocalSearchIndex
+
+try:
+    from PyQt6.QtWidgets import QApplication
+    from frontend import gui
+except ImportError:
+    QApplication = None
+
+ITEMS = [
+    {"id": "1", "Name": "Dune", "Author": "Frank Herbert", "Category": "Book"},
+    {"id": "2", "Name": "Dune Messiah", "Author": "Frank Herbert", "Category": "Book"},
+    {"id": "3", "Name": "Starship Troopers", "Author": "Robert A. Heinlein", "Category": "Book"},
+    {"id": "4", "Name": "Star Wars", "Author": "George Lucas", "Category": "Film"},
+    {"id": "5", "Name": "Stardust", "Author": "Neil Gaiman", "Category": "Book"},
+]
+
+
+class FakeApiClient:
+    """Serves the first two items, holds back the next page until released, and answers text searches."""
+
+    def __init__(self):
+        self.text_queries = []
+        self.release = threading.Event()
+
+    def get_media_page(self, category=None, cursor=None):
+        if cursor is None:
+            return {"items": ITEMS[:2], "next_cursor": "more"}
+        self.release.wait(10)
+        return {"items": [], "next_cursor": None}
+
+    def search_media_text(self, query, limit=10):
+        self.text_queries.append(query)
+        return [item for item in ITEMS if query.casefold() in item["Name"].casefold()]
+
+    def get_changes(self, cursor=None, wait=0):
+        return {"error": "No change feed."}
+
+    def close(self):
+        pass
+
+
+class TestLocalSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = LocalSearchIndex()
+        self.index.extend(ITEMS)
+
+    # --- Test 1.1: Every query word starts a word of the name or author ---
+    def test_1_word_prefixes(self):
+        """Short and long words, several words and case are matched the same way as a scan."""
+        self.assertEqual(list(self.index.search("st")), [2, 3, 4])
+        self.assertEqual(list(self.index.search("STARD")), [4])
+        self.assertEqual(list(self.index.search("her dun")), [0, 1])
+        self.assertEqual(list(self.index.search("tar")), [])
+        self.assertEqual(list(self.index.search("dune zzz")), [])
+        self.assertIsNone(self.index.search("  "))
+        self.assertIn("3", self.index)
+
+    # --- Test 1.2: Typing narrows the previous result ---
+    def test_2_incremental_typing(self):
+        """Results stay correct as a query grows, shrinks, and rows are added in between."""
+        expected = [("s", [2, 3, 4]), ("sta", [2, 3, 4]), ("star", [2, 3, 4]), ("star w", [3]),
+                    ("star", [2, 3, 4]), ("starship", [2]), ("starship t", [2]), ("g", [3, 4])]
+        for query, rows in expected:
+            self.assertEqual(list(self.index.search(query)), rows, query)
+
+        self.index.extend([{"id": "6", "Name": "Stargate", "Author": "Roland Emmerich"}])
+        self.assertEqual(list(self.index.search("starg")), [5])
+        self.assertEqual(list(self.index.search("starga")), [5])
+
+    # --- Test 1.3: Removed rows ---
+    def test_3_remove(self):
+        """Removing a row drops it from results and moves the rows after it up, like the table."""
+        self.assertEqual(list(self.index.search("st")), [2, 3, 4])
+        self.assertEqual(self.index.remove("4"), 3)
+        self.assertIsNone(self.index.remove("4"))
+        self.assertEqual(list(self.index.search("st")), [2, 3])
+        self.assertEqual(self.index.remove("1"), 0)
+        self.assertEqual(list(self.index.search("star")), [1, 2])
+        self.assertEqual(list(self.index.search("dune")), [0])
+        self.assertEqual((len(self.index), self.index.position("5")), (3, 2))
+
+        self.index.extend([{"id": "6", "Name": "Stargate", "Author": "Roland Emmerich"}])
+        self.assertEqual(list(self.index.search("starg")), [3])
+        self.assertNotIn("4", self.index)
+
+
+@unittest.skipIf(QApplication is None, "PyQt6 is not installed")
+class TestSearchAsYouType(unittest.TestCase):
+
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.client = FakeApiClient()
+        self.window = gui.LibraryApp(self.client)
+        self.process_until(lambda: self.window.media_proxy.rowCount() == 2)
+
+    def tearDown(self):
+        self.client.release.set()
+        self.window.close()
+
+    def process_until(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def names(self):
+        return [self.window.media_proxy.index(row, 1).data() for row in range(self.window.media_proxy.rowCount())]
+
+    # --- Test 2.1: Loaded rows filter locally, the rest come from one server search ---
+    def test_1_filters_and_falls_back(self):
+        """Keystrokes filter the loaded rows; once typing pauses, unloaded matches are appended."""
+        for text in ("d", "du", "dun", "dune m"):
+            self.window.search_input.setText(text)
+        self.process_until(lambda: self.names() == ["Dune Messiah"])
+        self.assertEqual(self.names(), ["Dune Messiah"])
+
+        self.window.search_input.setText("star")
+        self.process_until(lambda: self.window.media_proxy.rowCount() == 3)
+        self.assertEqual(self.client.text_queries[-1:], ["star"])
+        self.assertEqual(self.names(), ["Starship Troopers", "Star Wars", "Stardust"])
+
+        self.window.search_input.setText("")
+        self.process_until(lambda: self.window.media_proxy.rowCount() == 2)
+        self.assertEqual(self.names(), ["Dune", "Dune Messiah"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import sys
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    from PyQt6.QtCore import QModelIndex, Qt
+    from PyQt6.QtWidgets import QApplication
+    from frontend.media_model import MediaTableModel, make_proxy
+except ImportError:
+    QApplication = None
+
+FIELDS = ["id", "Name", "Category"]
+
+
+def make_items(count):
+    return [{"id": str(i), "Name": f"Title {i}", "Category": "Book" if i % 2 else "Film"} for i in range(1, count + 1)]
+
+
+@unittest.skipIf(QApplication is None, "PyQt6 is not installed")
+class TestMediaTableModel(unittest.TestCase):
+
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.model = MediaTableModel(FIELDS, ["ID", "Name", "Category"])
+
+    # --- Test 1.1: Pages are requested only when more rows are wanted ---
+    def test_1_fetches_pages_on_demand(self):
+        """Each fetchMore asks for the next cursor; responses for an older listing are dropped."""
+        items = make_items(5)
+        requests = []
+        self.model.start_paging(lambda cursor, callback: requests.append((cursor, callback)))
+        self.assertEqual(len(requests), 1)
+        self.assertFalse(self.model.canFetchMore(QModelIndex()))
+
+        requests[0][1]({"items": items[:2], "next_cursor": "c2"})
+        self.assertEqual(self.model.rowCount(), 2)
+        self.assertTrue(self.model.canFetchMore(QModelIndex()))
+        self.model.fetchMore(QModelIndex())
+        self.assertEqual(requests[1][0], "c2")
+        requests[1][1]({"items": items[2:], "next_cursor": None})
+        self.assertEqual(self.model.rowCount(), 5)
+        self.assertFalse(self.model.canFetchMore(QModelIndex()))
+        self.assertEqual(self.model.data(self.model.index(4, 1)), "Title 5")
+
+        self.model.start_paging(lambda cursor, callback: requests.append((cursor, callback)))
+        requests[1][1]({"items": items, "next_cursor": None})
+        self.assertEqual(self.model.rowCount(), 0)
+
+    # --- Test 1.2: Sorting and filtering through the proxy ---
+    def test_2_proxy_sort_and_filter(self):
+        """Ids sort numerically, the filter matches any column, and rows map back to their items."""
+        self.model.set_items(make_items(12))
+        proxy = make_proxy(self.model)
+
+        proxy.sort(0, Qt.SortOrder.DescendingOrder)
+        self.assertEqual([proxy.index(row, 0).data() for row in range(3)], ["12", "11", "10"])
+
+        proxy.setFilterFixedString("film")
+        self.assertEqual(proxy.rowCount(), 6)
+        source = proxy.mapToSource(proxy.index(0, 0))
+        self.assertEqual(self.model.item(source.row())["id"], "12")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import os
+import sys
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+from backend.pagination import PageIndex, paginate, parse_limit
+
+FIELDS = {"name": "Name"}
+
+
+def make_items(count):
+    return {str(i): {"id": str(i), "Name": f"Title {i % 5}"} for i in range(1, count + 1)}
+
+
+class TestPagination(unittest.TestCase):
+
+    def walk(self, media, sort, limit, mutate=None):
+        """Collects ids page by page, optionally mutating the data between pages."""
+        seen, cursor = [], None
+        while True:
+            page, cursor = paginate(media.values(), FIELDS, sort, limit, cursor, id_key=int)
+            seen.extend(item["id"] for item in page)
+            if cursor is None:
+                return seen
+            if mutate:
+                mutate(media)
+
+    # --- Test 1.1: Full walk in each order ---
+    def test_1_walk_covers_everything_once(self):
+        """Every item appears exactly once, in the requested order."""
+        media = make_items(23)
+        self.assertEqual(self.walk(media, "id", 5), [str(i) for i in range(1, 24)])
+        self.assertEqual(self.walk(media, "-id", 7), [str(i) for i in range(23, 0, -1)])
+        by_name = self.walk(media, "name", 4)
+        self.assertEqual(sorted(by_name), sorted(media))
+        self.assertEqual(by_name, sorted(media, key=lambda k: (media[k]["Name"], int(k))))
+
+    # --- Test 1.2: Stable under concurrent writes ---
+    def test_2_stable_under_inserts_and_deletes(self):
+        """Items present for the whole walk are returned once; nothing repeats."""
+        media = make_items(20)
+        next_id = [21]
+
+        def mutate(data):
+            data[str(next_id[0])] = {"id": str(next_id[0]), "Name": "Title 0"}
+            next_id[0] += 1
+            data.pop(min(data, key=int))
+
+        seen = self.walk(media, "name", 3, mutate)
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertTrue(set(media) - {str(i) for i in range(21, next_id[0])} <= set(seen))
+
+    # --- Test 1.3: Bad input ---
+    def test_3_invalid_parameters(self):
+        """Unknown sorts, foreign cursors and bad limits raise ValueError."""
+        media = make_items(5)
+        _, cursor = paginate(media.values(), FIELDS, "name", 2, id_key=int)
+        with self.assertRaises(ValueError):
+            paginate(media.values(), FIELDS, "colour", 2)
+        with self.assertRaises(ValueError):
+            paginate(media.values(), FIELDS, "id", 2, cursor, id_key=int)
+        with self.assertRaises(ValueError):
+            paginate(media.values(), FIELDS, "id", 2, "not-a-cursor")
+        with self.assertRaises(ValueError):
+            parse_limit("0")
+
+    # --- Test 1.4: Sorted index ---
+    def test_4_page_index_matches_paginate(self):
+        """PageIndex returns the same pages and cursors as paginate, also after adds and removes."""
+        media = make_items(30)
+        for item in media.values():
+            item["Category"] = "Book" if int(item["id"]) % 3 else "Film"
+
+        def source(category):
+            return [it for it in media.values() if category in (None, it["Category"])]
+
+        index = PageIndex(FIELDS, source, lambda item: item["Category"], id_key=int)
+
+        def check(category, sort, limit):
+            cursor = None
+            while True:
+                expected = paginate(source(category), FIELDS, sort, limit, cursor, id_key=int)
+                self.assertEqual(index.page(category, sort, limit, cursor), expected)
+                cursor = expected[1]
+                if cursor is None:
+                    return
+
+        for sort in ("id", "-id", "name", "-name"):
+            check(None, sort, 4)
+            check("Film", sort, 3)
+        for i in range(31, 36):
+            media[str(i)] = {"id": str(i), "Name": "Title 0", "Category": "Film"}
+            index.add(media[str(i)])
+        for item_id in ("2", "3", "33"):
+            index.remove(media.pop(item_id))
+        for sort in ("id", "-id", "name", "-name"):
+            check(None, sort, 4)
+            check("Film", sort, 3)
+
+        _, cursor = index.page(None, "name", 2)
+        with self.assertRaises(ValueError):
+            index.page(None, "id", 2, cursor)
+        with self.assertRaises(ValueError):
+            index.page(None, "colour", 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+import storage
+import storage_records
+from backend.record_file import RecordFile
+
+
+def make_item(item_id, name, category="Book"):
+    return {"id": item_id, "name": name, "publication_date": "2020", "author": "Someone", "category": category}
+
+
+class TestRecordFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'media.records')
+        self.store = RecordFile(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def insert(self, store, *items):
+        with store.transaction() as tx:
+            for item in items:
+                tx.insert(item)
+
+    # --- Test 1.1: Lookups from the index and from the tail ---
+    def test_1_lookups_survive_reopen(self):
+        """Items are found before and after a checkpoint, and after reopening."""
+        self.insert(self.store, *(make_item(str(i), f"Title {i}") for i in range(50)))
+        self.assertEqual(self.store.stats()["unindexed"], 50)
+        self.store.checkpoint()
+        self.insert(self.store, make_item("new", "Newest"))
+        with self.store.transaction() as tx:
+            self.assertEqual(tx.delete("7")["name"], "Title 7")
+            self.assertIsNone(tx.delete("missing"))
+
+        stats = self.store.stats()
+        self.assertEqual((stats["live"], stats["indexed"], stats["unindexed"]), (50, 50, 1))
+        reopened = RecordFile(self.path)
+        for store in (self.store, reopened):
+            self.assertEqual(store.get("3"), make_item("3", "Title 3"))
+            self.assertEqual(store.get("new")["name"], "Newest")
+            self.assertIsNone(store.get("7"))
+            self.assertEqual(len(list(store.iter_items())), 50)
+        reopened.close()
+
+    # --- Test 1.2: Writes from another process are picked up ---
+    def test_2_other_writers(self):
+        """A second handle on the file (as in another worker) sees writes, checkpoints and compaction."""
+        other = RecordFile(self.path)
+        self.insert(other, *(make_item(str(i), f"Title {i}") for i in range(10)))
+        self.assertEqual(self.store.get("4")["name"], "Title 4")
+        version = self.store.version()
+
+        other.checkpoint()
+        with other.transaction() as tx:
+            for i in range(5):
+                tx.delete(str(i))
+        self.assertNotEqual(self.store.version(), version)
+        self.assertIsNone(self.store.get("4"))
+
+        other.compact()
+        self.assertEqual(other.stats()["dead_bytes"], 0)
+        self.assertEqual([item["id"] for item in self.store.iter_items()], ["5", "6", "7", "8", "9"])
+        self.insert(self.store, make_item("10", "Title 10"))
+        self.assertEqual(other.get("10")["name"], "Title 10")
+        other.close()
+
+    # --- Test 1.3: Nothing uncommitted becomes visible ---
+    def test_3_failed_and_torn_writes(self):
+        """A transaction that raises, or a write cut off by a crash, leaves the data as it was."""
+        self.insert(self.store, make_item("1", "Kept"))
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction() as tx:
+                tx.insert(make_item("2", "Lost"))
+                tx.delete("1")
+                raise RuntimeError
+        self.assertIsNone(self.store.get("2"))
+        self.assertEqual(self.store.get("1")["name"], "Kept")
+
+        size = self.store.stats()["file_bytes"]
+        self.store.close()
+        with open(self.path, 'ab') as f:
+            f.write(b"\x01\x00\x05partial")
+        self.store = RecordFile(self.path)
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertEqual([item["name"] for item in self.store.iter_items()], ["Kept"])
+
+    # --- Test 1.4: Tombstones are reclaimed ---
+    def test_4_compaction(self):
+        """Compaction drops deleted records, keeps the order, and lookups still work."""
+        self.insert(self.store, *(make_item(str(i), "x" * 100) for i in range(100)))
+        with self.store.transaction() as tx:
+            for i in range(0, 100, 2):
+                tx.delete(str(i))
+        before = self.store.stats()
+        self.store.compact()
+        after = self.store.stats()
+
+        self.assertEqual(after["live"], 50)
+        self.assertLess(after["file_bytes"], before["file_bytes"] - before["dead_bytes"] + 100)
+        self.assertEqual(after["indexed"], 50)
+        self.assertEqual([item["id"] for item in self.store.iter_items()], [str(i) for i in range(1, 100, 2)])
+        self.assertEqual(self.store.get("51")["id"], "51")
+        self.assertIsNone(self.store.get("50"))
+
+
+class TestRecordStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_files = storage.DATA_FILE, storage_records.DATA_FILE
+        storage.DATA_FILE = Path(self.tmp.name) / "media_store.json"
+        storage_records.DATA_FILE = Path(self.tmp.name) / "media_store.records"
+        storage.clear_cache()
+
+    def tearDown(self):
+        storage_records.close()
+        storage.DATA_FILE, storage_records.DATA_FILE = self.original_files
+        storage.clear_cache()
+        self.tmp.cleanup()
+
+    # --- Test 2.1: Same answers as storage.py ---
+    def test_1_matches_json_storage(self):
+        """Imported items answer the same lookups; batches, search and versions behave alike."""
+        for i in range(6):
+            storage.add_media({"name": f"N{i}", "publication_date": "2020",
+                               "author": "X", "category": "Film" if i % 2 else "book"})
+        self.assertEqual(storage_records.import_items(storage.load_all()), 6)
+
+        self.assertEqual(storage_records.load_all(), storage.load_all())
+        self.assertEqual(storage_records.find_by_category("BOOK"), storage.find_by_category("BOOK"))
+        self.assertEqual(storage_records.find_by_name_exact("N3"), storage.find_by_name_exact("N3"))
+        self.assertEqual(storage_records.page_media("film", sort="name", limit=2),
+                         storage.page_media("film", sort="name", limit=2))
+
+        first = storage.load_all()[0]["id"]
+        applied, results = storage_records.apply_batch([{"op": "delete", "id": first},
+                                                        {"op": "delete", "id": first}])
+        self.assertFalse(applied)
+        self.assertEqual([r["status"] for r in results], [424, 404])
+
+        self.assertEqual([it["name"] for it in storage_records.search_text("n4")], ["N4"])
+        film = storage_records.category_version("Film")
+        book = storage_records.category_version("book")
+        self.assertTrue(storage_records.delete_media(first))
+        self.assertFalse(storage_records.delete_media(first))
+        self.assertIsNone(storage_records.find_by_id(first))
+        self.assertEqual(storage_records.category_version("Film"), film)
+        self.assertNotEqual(storage_records.category_version("book"), book)
+        self.assertEqual([it["name"] for it in storage_records.search_text("n0")], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
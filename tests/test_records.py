@@ -0,0 +1,57 @@
+import unittest
+import json
+import operator
+import os
+import sys
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+from backend.pagination import paginate
+from backend.records import CATEGORY, DATE, ID, NAME, MediaRecords, make_record
+
+
+def make_item(media_id, name, category="Book"):
+    return {"id": media_id, "Name": name, "Publication date": "2020", "Author": "Someone", "Category": category}
+
+
+class TestMediaRecords(unittest.TestCase):
+
+    # --- Test 1.1: Items go in as dicts and come out as equal dicts ---
+    def test_1_round_trip(self):
+        """Reads return fresh dicts; rows() rebuilds the same mapping."""
+        media = MediaRecords()
+        media["1"] = make_item("1", "Dune")
+        media["2"] = make_item("2", "Alien", "Film")
+        self.assertEqual(media["1"], make_item("1", "Dune"))
+        self.assertIsNot(media["1"], media["1"])
+        self.assertEqual(MediaRecords.from_rows(media.rows()), media)
+        self.assertEqual(media.to_dict(), {"1": make_item("1", "Dune"), "2": make_item("2", "Alien", "Film")})
+
+        self.assertEqual(media.pop_record("2")[NAME], "Alien")
+        self.assertIsNone(media.pop_record("2"))
+        self.assertEqual(list(media), ["1"])
+
+    # --- Test 1.2: Repeated values are stored once ---
+    def test_2_repeated_values_shared(self):
+        """Equal categories and dates parsed separately end up as one string object."""
+        items = json.loads(json.dumps([make_item("1", "A"), make_item("2", "B")]))
+        self.assertIsNot(items[0]["Category"], items[1]["Category"])
+        first, second = map(make_record, items)
+        self.assertIs(first[CATEGORY], second[CATEGORY])
+        self.assertIs(first[DATE], second[DATE])
+
+    # --- Test 1.3: Records can be paged like dicts ---
+    def test_3_paginate_records(self):
+        """Paging records by position gives the same ids as paging the dicts."""
+        media = MediaRecords.from_items({str(i): make_item(str(i), f"Title {i % 3}") for i in range(1, 11)})
+        as_dicts, _ = paginate(media.values(), {"name": "Name"}, "name", 4, id_key=int)
+        as_records, cursor = paginate(media.records(), {"name": NAME}, "name", 4,
+                                      id_key=int, id_field=ID, get=operator.getitem)
+        self.assertEqual([record[ID] for record in as_records], [item["id"] for item in as_dicts])
+        self.assertIsNotNone(cursor)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+import storage
+from app import app, response_cache
+from backend.data_manager import DataManager
+from backend.response_cache import ResponseCache
+
+
+def make_item(name, category):
+    return {"name": name, "publication_date": "2020", "author": "Someone", "category": category}
+
+
+class TestResponseCache(unittest.TestCase):
+
+    # --- Test 1.1: LRU eviction within the byte budget ---
+    def test_1_lru_and_versions(self):
+        """Old versions miss and the least recently used entry is evicted first."""
+        cache = ResponseCache(max_bytes=10)
+        cache.put("a", 1, b"aaaa")
+        cache.put("b", 1, b"bbbb")
+        self.assertEqual(cache.get("a", 1), b"aaaa")
+        self.assertIsNone(cache.get("a", 2))
+
+        cache.put("c", 1, b"cccc")
+        self.assertIsNone(cache.get("b", 1))
+        self.assertEqual(cache.get("c", 1), b"cccc")
+        cache.put("huge", 1, b"x" * 11)
+        self.assertIsNone(cache.get("huge", 1))
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 3, "evictions": 1, "entries": 2, "bytes": 8})
+
+    # --- Test 1.2: Category versions only move for the affected category ---
+    def test_2_data_manager_category_versions(self):
+        """Creating or deleting a Film leaves the Book version alone."""
+        with tempfile.TemporaryDirectory() as tmp:
+            dm = DataManager(data_file=os.path.join(tmp, 'media.json'), log_file=os.path.join(tmp, 'media.log'))
+            dm.create_media({"Name": "A", "Publication date": "2020", "Author": "X", "Category": "Book"})
+            book, film, everything = dm.category_version("Book"), dm.category_version("Film"), dm.category_version()
+
+            created = dm.create_media({"Name": "B", "Publication date": "2020", "Author": "X", "Category": "Film"})
+            self.assertEqual(dm.category_version("Book"), book)
+            self.assertNotEqual(dm.category_version("Film"), film)
+            self.assertNotEqual(dm.category_version(), everything)
+
+            film = dm.category_version("Film")
+            dm.delete_media(created["id"])
+            self.assertEqual(dm.category_version("Book"), book)
+            self.assertNotEqual(dm.category_version("Film"), film)
+
+
+class TestCachedEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_file = storage.DATA_FILE
+        storage.DATA_FILE = Path(self.tmp.name) / "media_store.json"
+        storage.clear_cache()
+        response_cache.clear()
+        self.client = app.test_client()
+        storage.add_media(make_item("Dune", "Book"))
+        storage.add_media(make_item("Alien", "Film"))
+
+    def tearDown(self):
+        storage.DATA_FILE = self.original_file
+        storage.clear_cache()
+        response_cache.clear()
+        self.tmp.cleanup()
+
+    def fetch(self, url):
+        response = self.client.get(url)
+        return response.headers["X-Cache"], [item["name"] for item in response.get_json()]
+
+    # --- Test 2.1: Writes invalidate only the affected listings ---
+    def test_1_invalidation_per_category(self):
+        """A new Film refreshes /media and the Film listing but keeps the Book one."""
+        for url in ("/media", "/media/category/book", "/media/category/film"):
+            self.assertEqual(self.fetch(url)[0], "MISS")
+            self.assertEqual(self.fetch(url)[0], "HIT")
+
+        self.client.post("/media", json=make_item("Heat", "Film"))
+        self.assertEqual(self.fetch("/media"), ("MISS", ["Dune", "Alien", "Heat"]))
+        self.assertEqual(self.fetch("/media/category/film"), ("MISS", ["Alien", "Heat"]))
+        self.assertEqual(self.fetch("/media/category/book"), ("HIT", ["Dune"]))
+
+        dune = storage.find_by_name_exact("Dune")["id"]
+        self.client.delete(f"/media/{dune}")
+        self.assertEqual(self.fetch("/media/category/book"), ("MISS", []))
+        self.assertEqual(self.fetch("/media/category/film"), ("HIT", ["Alien", "Heat"]))
+
+    # --- Test 2.2: Query parameters are part of the key ---
+    def test_2_pages_cached_separately(self):
+        """Different pages are separate entries, and error responses are not cached."""
+        first = self.client.get("/media?limit=1").get_json()
+        second = self.client.get("/media?limit=1&cursor=" + first["next_cursor"]).get_json()
+        self.assertNotEqual(first["items"], second["items"])
+        self.assertEqual(self.client.get("/media?limit=1").headers["X-Cache"], "HIT")
+
+        self.client.get("/media?limit=0")
+        self.assertEqual(self.client.get("/media?limit=0").status_code, 400)
+        self.assertEqual(response_cache.stats()["entries"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+from backend.search_index import SearchIndex
+
+
+def fields(name, author):
+    return [(name, 2.0), (author, 1.0)]
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add("1", fields("The Martian", "Andy Weir"))
+        self.index.add("2", fields("Dune", "Denis Villeneuve"))
+        self.index.add("3", fields("Dune Messiah", "Frank Herbert"))
+        self.index.add("4", fields("Project Hail Mary", "Andy Weir"))
+
+    def ids(self, query, limit=10):
+        return [doc_id for doc_id, _ in self.index.search(query, limit)]
+
+    # --- Test 1.1: Ranking across fields ---
+    def test_1_ranked_results(self):
+        """Name matches outrank author matches; more matched terms rank higher."""
+        self.assertEqual(self.ids("dune messiah")[0], "3")
+        self.assertEqual(set(self.ids("andy weir")), {"1", "4"})
+        self.assertEqual(self.ids("dune", limit=1), ["2"])
+
+    # --- Test 1.2: Partial words and typos ---
+    def test_2_prefix_and_typo_tolerance(self):
+        """Partial titles and small spelling mistakes still find the item."""
+        self.assertEqual(self.ids("marti"), ["1"])
+        self.assertEqual(self.ids("martain"), ["1"])
+        self.assertEqual(self.ids("villenueve"), ["2"])
+        self.assertEqual(self.ids("zzzz"), [])
+
+    # --- Test 1.3: Incremental updates ---
+    def test_3_remove_and_rebuild(self):
+        """Removed documents disappear and rebuild matches incremental adds."""
+        self.index.remove("1")
+        self.assertEqual(self.ids("martian"), [])
+        self.assertEqual(self.ids("weir"), ["4"])
+
+        rebuilt = SearchIndex()
+        rebuilt.rebuild([("2", fields("Dune", "Denis Villeneuve")),
+                         ("3", fields("Dune Messiah", "Frank Herbert")),
+                         ("4", fields("Project Hail Mary", "Andy Weir"))])
+        for query in ("dune", "hail mery", "frank", "proj"):
+            self.assertEqual(rebuilt.search(query), self.index.search(query))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+import storage
+import storage_sqlite
+from backend.data_manager import DataManager, SQLiteDataManager, BatchError
+
+
+def make_item(name, category="Book", author="Someone"):
+    return {"Name": name, "Publication date": "2020", "Author": author, "Category": category}
+
+
+class TestSQLiteDataManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp.name, 'media.db')
+        self.dm = SQLiteDataManager(self.db_file)
+
+    def tearDown(self):
+        self.dm.close()
+        self.tmp.cleanup()
+
+    # --- Test 1.1: Same answers as the JSON DataManager ---
+    def test_1_matches_json_engine(self):
+        """The same writes give the same items, ids and lookups as DataManager."""
+        json_dm = DataManager(data_file=os.path.join(self.tmp.name, 'media.json'),
+                              log_file=os.path.join(self.tmp.name, 'media.log'))
+        categories = ["Book", "Film", "Magazine"]
+        for dm in (json_dm, self.dm):
+            for i in range(20):
+                dm.create_media(make_item(f"Title {i % 6}", categories[i % 3]))
+            dm.delete_media("4")
+            dm.apply_batch([{"op": "delete", "id": "7"}, {"op": "create", "data": make_item("Dune", "Film")}])
+
+        self.assertEqual(self.dm.get_all_media(), json_dm.get_all_media())
+        self.assertEqual(list(self.dm.iter_media("Film")), list(json_dm.iter_media("Film")))
+        self.assertEqual(self.dm.get_media_by_category("Magazine"), json_dm.get_media_by_category("Magazine"))
+        self.assertEqual(self.dm.search_media_by_name("TITLE 2"), json_dm.search_media_by_name("TITLE 2"))
+        self.assertEqual(self.dm.get_media_by_id("21"), json_dm.get_media_by_id("21"))
+        self.assertEqual(self.dm.count(), json_dm.count())
+        with self.assertRaises(KeyError):
+            self.dm.get_media_by_id("4")
+        with self.assertRaises(KeyError):
+            self.dm.delete_media("4")
+        with self.assertRaises(ValueError):
+            self.dm.create_media(make_item("X", "Poster"))
+
+    # --- Test 1.2: Batches are all-or-nothing ---
+    def test_2_rejected_batch_changes_nothing(self):
+        """A failing operation rolls back the whole batch."""
+        self.dm.create_media(make_item("A"))
+        with self.assertRaises(BatchError) as ctx:
+            self.dm.apply_batch([
+                {"op": "create", "data": make_item("B")},
+                {"op": "delete", "id": "1"},
+                {"op": "delete", "id": "1"},
+            ])
+        self.assertEqual([r["status"] for r in ctx.exception.results], [424, 424, 404])
+        self.assertEqual([item["Name"] for item in self.dm.get_all_media()], ["A"])
+        self.assertEqual(self.dm.create_media(make_item("C"))["id"], "2")
+
+    # --- Test 1.3: Keyset pages in SQL ---
+    def test_3_pages_cover_everything_once(self):
+        """Walking the pages in any order visits every item exactly once."""
+        for i in range(23):
+            self.dm.create_media(make_item(f"title {i % 5}" if i % 2 else f"Title {i % 5}"))
+        for sort, limit in (("id", 5), ("-id", 7), ("name", 4), ("-author", 6)):
+            seen, cursor = [], None
+            while True:
+                page, cursor = self.dm.get_media_page(sort=sort, limit=limit, cursor=cursor)
+                seen.extend(item["id"] for item in page)
+                if cursor is None:
+                    break
+            self.assertEqual(sorted(seen, key=int), [str(i) for i in range(1, 24)], sort)
+            if sort == "name":
+                names = [self.dm.get_media_by_id(i)["Name"].lower() for i in seen]
+                self.assertEqual(names, sorted(names))
+        with self.assertRaises(ValueError):
+            self.dm.get_media_page(sort="colour")
+        with self.assertRaises(ValueError):
+            self.dm.get_media_page(sort="name", cursor=cursor or "bm9wZQ")
+
+    # --- Test 1.4: Search sees writes from other connections ---
+    def test_4_search_follows_other_writers(self):
+        """Another manager on the same file (e.g. another worker) invalidates the index."""
+        self.dm.create_media(make_item("The Martian", author="Andy Weir"))
+        self.assertEqual([m["id"] for m in self.dm.search_media("martain")], ["1"])
+
+        other = SQLiteDataManager(self.db_file)
+        other.create_media(make_item("Project Hail Mary", author="Andy Weir"))
+        other.delete_media("1")
+        other.close()
+
+        self.assertEqual([m["Name"] for m in self.dm.search_media("weir")], ["Project Hail Mary"])
+
+    # --- Test 1.5: Threads do not leave connections behind ---
+    def test_5_connections_closed_with_their_threads(self):
+        """Each thread's connection is closed when the thread ends, not kept until close()."""
+        self.dm.create_media(make_item("Dune"))
+        store = self.dm._store
+        opened = len(store._connections)
+
+        def read():
+            self.assertEqual(self.dm.get_media_by_id("1")["Name"], "Dune")
+
+        for _ in range(10):
+            threads = [threading.Thread(target=read) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(store._connections), opened)
+        self.assertEqual(self.dm.count(), 1)
+
+
+class TestSQLiteStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_files = storage.DATA_FILE, storage_sqlite.DB_FILE
+        storage.DATA_FILE = Path(self.tmp.name) / "media_store.json"
+        storage_sqlite.DB_FILE = Path(self.tmp.name) / "media_store.db"
+        storage.clear_cache()
+
+    def tearDown(self):
+        storage_sqlite.close()
+        storage.DATA_FILE, storage_sqlite.DB_FILE = self.original_files
+        storage.clear_cache()
+        self.tmp.cleanup()
+
+    # --- Test 2.1: Migration keeps every item and id ---
+    def test_1_import_from_json(self):
+        """Items copied from storage.py are found by the same lookups."""
+        for i in range(6):
+            storage.add_media({"name": f"N{i}", "publication_date": "2020",
+                               "author": "X", "category": "Film" if i % 2 else "book"})
+        self.assertEqual(storage_sqlite.import_items(storage.load_all()), 6)
+
+        self.assertEqual(storage_sqlite.load_all(), storage.load_all())
+        self.assertEqual(storage_sqlite.find_by_category("BOOK"), storage.find_by_category("BOOK"))
+        self.assertEqual(storage_sqlite.find_by_name_exact("N3"), storage.find_by_name_exact("N3"))
+        self.assertIsNone(storage_sqlite.find_by_name_exact("n3"))
+
+        first = storage.load_all()[0]["id"]
+        applied, results = storage_sqlite.apply_batch([{"op": "delete", "id": first},
+                                                       {"op": "delete", "id": first}])
+        self.assertFalse(applied)
+        self.assertEqual([r["status"] for r in results], [424, 404])
+        self.assertTrue(storage_sqlite.delete_media(first))
+        self.assertIsNone(storage_sqlite.find_by_id(first))
+
+
+if __name__ == '__main__':
+    unittest.main()
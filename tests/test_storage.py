@@ -0,0 +1,121 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+import storage
+
+
+class TestStorageCache(unittest.TestCase):
+
+    def setUp(self):
+        """Point storage at a private file and start with a cold cache."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_file = storage.DATA_FILE
+        storage.DATA_FILE = Path(self.tmp.name) / "media_store.json"
+        storage.clear_cache()
+
+    def tearDown(self):
+        storage.DATA_FILE = self.original_file
+        storage.clear_cache()
+        self.tmp.cleanup()
+
+    # --- Test 1.1: Repeated reads parse the file once ---
+    def test_1_reads_hit_cache(self):
+        """Steady-state reads are served without parsing JSON."""
+        storage.add_media({"name": "A", "publication_date": "2020", "author": "X", "category": "Book"})
+        stats_after_write = storage.cache_stats()
+
+        for _ in range(10):
+            self.assertEqual(storage.find_by_name_exact("A")["author"], "X")
+
+        stats = storage.cache_stats()
+        self.assertEqual(stats["misses"], stats_after_write["misses"])
+        self.assertEqual(stats["reloads"], 0)
+        self.assertEqual(stats["hits"] - stats_after_write["hits"], 10)
+
+    # --- Test 1.2: Changes made by another writer are picked up ---
+    def test_2_external_change_reloads(self):
+        """Rewriting the file outside this process triggers a reload."""
+        storage.load_all()
+        storage.DATA_FILE.write_text(json.dumps([{"id": "x", "name": "B", "category": "Film"}]), encoding="utf-8")
+
+        self.assertEqual(storage.find_by_id("x")["name"], "B")
+        self.assertEqual(storage.cache_stats()["reloads"], 1)
+
+    # --- Test 1.3: Indexes survive concurrent readers and writers ---
+    def test_3_concurrent_search_and_paging(self):
+        """Threads searching and paging while others write see no errors, and the indexes end up exact."""
+        def item(name):
+            return {"name": name, "publication_date": "2020", "author": "Writer", "category": "Book"}
+
+        # Enough items that rebuilding the indexes takes a while
+        storage.save_all([dict(item(f"Seed {n}"), id=f"seed-{n}") for n in range(2000)])
+        errors = []
+
+        def write(worker):
+            try:
+                for n in range(20):
+                    created = storage.add_media(item(f"Title {worker} {n}"))
+                    if n % 2:
+                        storage.delete_media(created["id"])
+            except Exception as e:
+                errors.append(e)
+
+        def read():
+            try:
+                for _ in range(40):
+                    storage.search_text("title", limit=50)
+                    storage.suggest("t")
+                    storage.page_media(sort="name", limit=50)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        # Switch threads often, so they interleave inside the index updates
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(errors, [])
+        names = sorted(it["name"] for it in storage.load_all() if it["name"].startswith("Title"))
+        self.assertEqual(len(names), 40)
+        page, _ = storage.page_media(sort="-name", limit=40)
+        self.assertEqual([it["name"] for it in page], names[::-1])
+        self.assertEqual(sorted(it["name"] for it in storage.search_text("title", limit=100)), names)
+        self.assertEqual(storage.suggest("writer"), [("Writer", 2040)])
+
+    # --- Test 1.4: Batches are checked before anything is saved ---
+    def test_4_apply_batch(self):
+        """A batch deleting one id twice is rejected whole; a valid one is applied."""
+        kept = storage.add_media({"name": "A", "publication_date": "2020", "author": "X", "category": "Book"})
+        create = {"op": "create", "data": {"name": "B", "publication_date": "2021", "author": "Y", "category": "Film"}}
+        delete = {"op": "delete", "id": kept["id"]}
+
+        applied, results = storage.apply_batch([create, delete, delete])
+        self.assertFalse(applied)
+        self.assertEqual([r["status"] for r in results], [424, 424, 404])
+        self.assertEqual(storage.load_all(), [kept])
+
+        applied, results = storage.apply_batch([create, delete])
+        self.assertTrue(applied)
+        self.assertEqual([r["status"] for r in results], [201, 200])
+        self.assertEqual(storage.load_all(), [results[0]["item"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# --- Path Fix ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# ----------------
+
+import storage
+from app import app
+from backend import suggest_index
+from backend.suggest_index import SuggestIndex
+
+
+def brute_force(counts, prefix, limit):
+    """Ranks the completions of prefix by scanning every key."""
+    keys = [key for key, count in counts.items() if count and key.startswith(prefix)]
+    return sorted(keys, key=lambda key: (-counts[key], key))[:limit]
+
+
+class TestSuggestIndex(unittest.TestCase):
+
+    # --- Test 1.1: Most frequent completions first ---
+    def test_1_ranked_completions(self):
+        """Completions rank by count, then alphabetically; case and spacing are ignored."""
+        index = SuggestIndex()
+        for text in ["Dune", "Dune Messiah", "Dunes", "Frank Herbert", "Frank  herbert", "Frankenstein"]:
+            index.add(text)
+        self.assertEqual(index.suggest("fra"), [("Frank Herbert", 2), ("Frankenstein", 1)])
+        self.assertEqual(index.suggest("DUNE", limit=2), [("Dune", 1), ("Dune Messiah", 1)])
+        self.assertEqual(index.suggest("dune "), [("Dune Messiah", 1)])
+        self.assertEqual(index.suggest("x"), [])
+
+        index.remove("Frank Herbert")
+        index.remove("Dune")
+        self.assertEqual(index.suggest("fra"), [("Frank Herbert", 1), ("Frankenstein", 1)])
+        self.assertEqual(index.suggest("dune"), [("Dune Messiah", 1), ("Dunes", 1)])
+        self.assertEqual(len(index), 4)
+
+    # --- Test 1.2: Memoized prefixes stay exact through updates ---
+    def test_2_memo_follows_updates(self):
+        """With every prefix memoized, random adds and removes give the same answers as a scan."""
+        rng = random.Random(7)
+        words = ["a", "ab", "abc", "abd", "b", "ba", "bab", "c"]
+        counts = {}
+        with mock.patch.object(suggest_index, "MEMO_THRESHOLD", 0), \
+                mock.patch.object(suggest_index, "MEMO_SIZE", 3):
+            index = SuggestIndex()
+            index.rebuild(rng.choice(words) for _ in range(20))
+            for key in index._keys:
+                counts[key] = index._entries[key][1]
+            for step in range(2000):
+                word = rng.choice(words)
+                if rng.random() < 0.5 and counts.get(word):
+                    index.remove(word)
+                    counts[word] -= 1
+                else:
+                    index.add(word)
+                    counts[word] = counts.get(word, 0) + 1
+                prefix = rng.choice(["", "a", "ab", "b", "ba", "c"])
+                limit = rng.randint(1, 3)
+                expected = brute_force(counts, prefix, limit)
+                self.assertEqual([text for text, _ in index.suggest(prefix, limit)], expected, step)
+
+
+class TestSuggestEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        """Serve app.py from a private data file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_file = storage.DATA_FILE
+        storage.DATA_FILE = Path(self.tmp.name) / "media_store.json"
+        storage.clear_cache()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        storage.DATA_FILE = self.original_file
+        storage.clear_cache()
+        self.tmp.cleanup()
+
+    def add(self, name, author):
+        return self.client.post("/media", json={"name": name, "publication_date": "1965",
+                                                "author": author, "category": "Book"}).get_json()
+
+    # --- Test 2.1: Completions follow creates and deletes ---
+    def test_1_names_and_authors(self):
+        """Names and authors are completed together, and deletes take effect immediately."""
+        self.add("Dune", "Frank Herbert")
+        messiah = self.add("Dune Messiah", "Frank Herbert")
+        self.assertEqual(self.client.get("/media/suggest?prefix=f").get_json(),
+                         [{"text": "Frank Herbert", "count": 2}])
+
+        self.client.delete(f"/media/{messiah['id']}")
+        self.add("Frankenstein", "Mary Shelley")
+        response = self.client.get("/media/suggest?prefix=FR&limit=1")
+        self.assertEqual(response.get_json(), [{"text": "Frank Herbert", "count": 1}])
+        self.assertEqual(response.headers["Access-Control-Allow-Origin"], "*")
+        self.assertEqual(self.client.get("/media/suggest?prefix=du").get_json(),
+                         [{"text": "Dune", "count": 1}])
+
+        self.assertEqual(self.client.get("/media/suggest?prefix=%20").status_code, 400)
+        self.assertEqual(self.client.get("/media/suggest?prefix=d&limit=x").status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()